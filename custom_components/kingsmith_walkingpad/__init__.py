@@ -1,9 +1,11 @@
 import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.helpers.start import async_at_started
 from .const import DOMAIN
 from .coordinator import WalkingPadCoordinator
+from .services import async_register_services
+from .websocket import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -12,18 +14,28 @@ PLATFORMS = ["sensor", "media_player", "button", "binary_sensor", "switch", "num
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     _LOGGER.info("WalkingPad: async_setup_entry called for %s", entry.data)
     coordinator = WalkingPadCoordinator(hass, entry.data)
+    if DOMAIN not in hass.data:
+        # First pad — the websocket commands and services serve every entry
+        async_register_websocket_commands(hass)
+        async_register_services(hass)
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Load watch entity config from options immediately
-    coordinator.load_watch_entities(entry.options)
+    # Load watch entities and telemetry export config from options immediately
+    coordinator.load_options(entry.options)
+    # Speed range / features cached from a previous connect (2AD4 / 2ACC)
+    # and the last session counters seen before shutdown
+    await coordinator.async_load_stored_state()
+    # Continue the hourly long-term statistics from the last imported sums
+    await coordinator.statistics.async_setup()
 
     async def _start_callback(_):
         _LOGGER.info("WalkingPad: starting BLE connection")
         await coordinator.async_start()
 
-    # Wait until HA fully started to start connection attempts
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _start_callback)
+    # Wait until HA fully started to start connection attempts (runs right away
+    # when the entry is added or reloaded later); dropped again if we unload first
+    entry.async_on_unload(async_at_started(hass, _start_callback))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
@@ -4,14 +4,13 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.core import callback
-from homeassistant.helpers.entity import DeviceInfo
 
 from .const import DOMAIN
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([WalkingPadConnectedSensor(coordinator)])
+    async_add_entities([WalkingPadConnectedSensor(coordinator), WalkingPadPresenceSensor(coordinator)])
 
 
 class WalkingPadConnectedSensor(BinarySensorEntity):
@@ -24,12 +23,7 @@ class WalkingPadConnectedSensor(BinarySensorEntity):
     def __init__(self, coordinator):
         self.coordinator = coordinator
         self._attr_unique_id = f"{coordinator.mac}_connected"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     @property
     def is_on(self) -> bool:
@@ -37,8 +31,31 @@ class WalkingPadConnectedSensor(BinarySensorEntity):
         return self.coordinator.is_connected
 
     async def async_added_to_hass(self):
-        self.coordinator.async_add_listener(self._handle_update)
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_update))
 
     @callback
     def _handle_update(self):
-        self.async_write_ha_state()
\ No newline at end of file
+        self.async_write_ha_state()
+
+
+class WalkingPadPresenceSensor(WalkingPadConnectedSensor):
+    """Shows whether the WalkingPad is advertising — works without a connection."""
+
+    _attr_device_class = BinarySensorDeviceClass.PRESENCE
+    _attr_name = "WalkingPad Present"
+    _attr_icon = "mdi:bluetooth"
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac}_present"
+
+    @property
+    def is_on(self) -> bool:
+        return self.coordinator.data.present
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "rssi": self.coordinator.data.rssi,
+            "machine_available": self.coordinator.data.machine_available,
+        }
\ No newline at end of file
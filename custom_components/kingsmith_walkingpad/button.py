@@ -1,6 +1,5 @@
 from homeassistant.components.button import ButtonEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
 from .const import DOMAIN
 import logging
 
@@ -17,12 +16,7 @@ class WalkingPadConnectButton(CoordinatorEntity, ButtonEntity):
         super().__init__(coordinator)
         self._attr_name = "WalkingPad Connect"
         self._attr_unique_id = f"{coordinator.mac}_connect"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model
-        )
+        self._attr_device_info = coordinator.device_info
 
     async def async_press(self):
         """Handle the button press: attempt to connect to the device."""
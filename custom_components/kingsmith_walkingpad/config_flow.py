@@ -5,37 +5,21 @@ from homeassistant.helpers import selector
 from .const import DOMAIN, CONF_DEVICE_NAME, CONF_MAC, CONF_HEIGHT, CONF_WEIGHT_ENTITY
 from bleak import BleakScanner
 from .options_flow import WalkingPadOptionsFlowHandler
+from .walkingpad_protocol import profile_for_ble_name, supported_name_prefixes
 
 _LOGGER = logging.getLogger(__name__)
 
 # import inspect
 # _LOGGER.debug(f"EntitySelector __init__ signature: {inspect.signature(selector.EntitySelector.__init__)}")
 
-SUPPORTED_NAME_PREFIXES = (
-    "KS-AP",     # MC11
-    "KS-C2",     # C2
-    "KS-MC21",   # MC21
-    "KS-",       # future KingSmith models
-    "WalkingPad"
-)
+# Name prefixes come from the registered model profiles (KS-AP, KS-C2, KS-MC21, KS-, WalkingPad)
+SUPPORTED_NAME_PREFIXES = supported_name_prefixes()
 
 def normalize_model(ble_name: str) -> str:
     """Normalize BLE name into a stable WalkingPad model string.
-    Order matters — more specific prefixes must come before generic ones.
+    The most specific matching profile prefix wins.
     """
-    if not ble_name:
-        return "WalkingPad"
-
-    if ble_name.startswith("KS-C2"):
-        return "WalkingPad C2"
-    if ble_name.startswith("KS-AP"):
-        return "WalkingPad MC11"
-    if ble_name.startswith("KS-MC21"):
-        return "WalkingPad MC21"
-    if ble_name.startswith("KS-"):
-        return "WalkingPad"
-
-    return "WalkingPad"
+    return profile_for_ble_name(ble_name).model
 
 
 class WalkingPadConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -3,45 +3,29 @@ DOMAIN = "kingsmith_walkingpad"
 CONF_DEVICE_NAME = "device_name"
 CONF_MAC = "mac_address"
 
-# BLE UUIDs
-UUID_TREADMILL_DATA = "00002acd-0000-1000-8000-00805f9b34fb"
-UUID_CONTROL_POINT = "00002ad9-0000-1000-8000-00805f9b34fb"
-UUID_TREADMILL_STATUS = "00002ad3-0000-1000-8000-00805f9b34fb"  # MC11 Training Status
-UUID_FITNESS_MACHINE_STATUS = "00002ada-0000-1000-8000-00805f9b34fb"  # MC21 Fitness Machine Status
-# UUID_TREADMILL_STATUS = "00002ACC-0000-1000-8000-00805f9b34fb"
-
-MODEL_UUIDS = {
-    "WalkingPad MC11": {
-        "data": UUID_TREADMILL_DATA,
-        "control": UUID_CONTROL_POINT,
-        "status": UUID_TREADMILL_STATUS,
-        "speed_min": 1.0,
-        "speed_max": 12.0,
-    },
-    "WalkingPad C2": {
-        "data": UUID_TREADMILL_DATA,
-        "control": UUID_CONTROL_POINT,
-        "status": UUID_TREADMILL_STATUS,
-        "speed_min": 1.0,
-        "speed_max": 6.0,
-    },
-    "WalkingPad MC21": {
-        "data": UUID_TREADMILL_DATA,
-        "control": UUID_CONTROL_POINT,
-        "status": UUID_FITNESS_MACHINE_STATUS,  # MC21 uses 2ADA not 2AD3
-        "speed_min": 0.5,   # confirmed from 2AD4 Supported Speed Range
-        "speed_max": 10.0,  # confirmed from 2AD4 Supported Speed Range
-    },
-    # Fallback for unknown / future models
-    "WalkingPad": {
-        "data": UUID_TREADMILL_DATA,
-        "control": UUID_CONTROL_POINT,
-        "status": UUID_TREADMILL_STATUS,
-        "speed_min": 1.0,
-        "speed_max": 10.0,
-    },
-}
+# Protocol constants live in walkingpad_protocol (no HA imports) — re-exported here
+from .walkingpad_protocol.constants import (  # noqa: F401
+    UUID_TREADMILL_DATA,
+    UUID_CONTROL_POINT,
+    UUID_TREADMILL_STATUS,
+    UUID_FITNESS_MACHINE_STATUS,
+    UUID_SUPPORTED_SPEED_RANGE,
+    UUID_FITNESS_MACHINE_FEATURE,
+    UUID_MC21_AUTH,
+    CMD_CONTROL_REQUEST,
+    CMD_START,
+    CMD_STOP,
+    CMD_FINISH,
+    CMD_MC21_START,
+    CMD_MC21_STOP,
+    CMD_MC21_AUTH,
+    SPEED_MIN,
+    SPEED_MAX,
+    SPEED_STEP,
+    cmd_set_speed,
+)
 
+# Per-model UUIDs, commands and speed limits live in walkingpad_protocol/profiles.py
 
 # Components
 CONF_HEIGHT = "height"
@@ -52,31 +36,48 @@ CONF_WATCH_HR_ENTITY = "watch_hr_entity"
 CONF_WATCH_STEPS_ENTITY = "watch_steps_entity"
 CONF_WATCH_CALORIES_ENTITY = "watch_calories_entity"
 
-# Commands — MC11 uses Request Control (0x00) before every command
-CMD_CONTROL_REQUEST = bytes([0x00])
-CMD_START  = bytes([0x07, 0x01])   # MC11: Start with parameter
-CMD_STOP   = bytes([0x08, 0x02])   # MC11: Stop with Pause parameter
-CMD_FINISH = bytes([0x08, 0x01])   # MC11: Stop with Stop parameter
+# Passive mode (option) — presence from advertisements, GATT only for control / live data
+CONF_PASSIVE_MODE = "passive_mode"
+PASSIVE_RELEASE_DELAY = 120  # s idle before an on-demand connection is dropped again
+
+# Status debounce (option) — playing <-> paused must hold this long (s) to count
+CONF_STATUS_DEBOUNCE = "status_debounce"
+
+# Fast speed writes (option) — write-without-response, acks tracked from the 2AD9 indication
+CONF_FAST_SPEED_WRITES = "fast_speed_writes"
+SPEED_ACK_TIMEOUT = 2.0  # s without an indication before a write counts as lost
+
+# Liveness watchdog (option) — minimum notification silence (s) before a link is stale
+CONF_STALE_TIMEOUT = "stale_timeout"
+WATCHDOG_INTERVAL = 2  # s between liveness checks
+
+# Notification coalescing (option) — entity dispatch at most once per window (ms);
+# unset = per packet, 0 = once per event-loop iteration
+CONF_COALESCE_WINDOW = "coalesce_window"
 
-# MC21 commands — NO Request Control needed, bare opcodes only
-CMD_MC21_START  = bytes([0x07])    # Confirmed from nRF log 18:36:23
-CMD_MC21_STOP   = bytes([0x08])    # Confirmed from nRF log 18:37:22
+# Telemetry export (options) — batched frames to MQTT or a UDP endpoint
+CONF_EXPORT_TARGET = "export_target"
+CONF_EXPORT_HOST = "export_host"
+CONF_EXPORT_PORT = "export_port"
+CONF_EXPORT_TOPIC = "export_topic"
+CONF_EXPORT_FORMAT = "export_format"
+CONF_EXPORT_INTERVAL = "export_interval"
+CONF_EXPORT_BATCH_SIZE = "export_batch_size"
+EXPORT_TARGET_MQTT = "mqtt"
+EXPORT_TARGET_UDP = "udp"
+EXPORT_DEFAULT_PORT = 5005          # UDP
+EXPORT_DEFAULT_MQTT_PORT = 1883     # MQTT broker given by host
+EXPORT_DEFAULT_INTERVAL = 1.0     # s
+EXPORT_DEFAULT_BATCH_SIZE = 20    # samples
+EXPORT_QUEUE_SIZE = 600           # samples kept while the target is slow/down
 
-# MC21 proprietary authorization UUID and token
-# The KS Fit app writes this static token to unlock 2AD9 control after connecting
-# Confirmed from HCI snoop log — identical across 41 sessions
-UUID_MC21_AUTH = "d18d2c10-c44c-11e8-a355-529269fb1459"
-CMD_MC21_AUTH  = bytes([0x01, 0x00, 0x0D, 0x00, 0x06, 0x0B, 0x0F, 0x0D])
+# Fleet services — concurrent commands per Bluetooth adapter / proxy
+FLEET_MAX_PER_ADAPTER = 3
 
-# Speed control
-SPEED_MIN = 1.0   # km/h
-SPEED_MAX = 12.0  # km/h
-SPEED_STEP = 0.1  # km/h resolution the treadmill accepts
+# Prometheus endpoint (option) — /api/kingsmith_walkingpad/metrics, rendered from coordinator state
+CONF_METRICS = "metrics_endpoint"
 
-def cmd_set_speed(kmh: float) -> bytes:
-    """Build a Set Target Speed FTMS command.
-    Opcode 0x02, speed = km/h * 100 as little-endian uint16.
-    E.g. 6.0 km/h → [0x02, 0x58, 0x02]
-    """
-    value = int(round(kmh * 100))
-    return bytes([0x02]) + value.to_bytes(2, "little")
\ No newline at end of file
+# Storage — per-MAC cache of what the pad reported on first connect (2AD4 / 2ACC)
+CAPABILITIES_STORAGE_VERSION = 1
+# Storage — per-MAC last device session counters, used to backfill gaps after a restart
+SESSION_STORAGE_VERSION = 1
@@ -9,7 +9,6 @@ from homeassistant.components.media_player.const import (
     MediaPlayerState,
 )
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
 
 from .const import DOMAIN
 
@@ -48,19 +47,14 @@ class WalkingPadMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
         self._attr_name = "WalkingPad Control"
         self._attr_unique_id = f"{coordinator.mac}_media"
         self._attr_icon = "mdi:human-scooter"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model,
-        )
+        self._attr_device_info = coordinator.device_info
         self._state = MediaPlayerState.IDLE
 
     @property
     def state(self):
         """Return the current media player state based on training status."""
-        training_status = self.coordinator.data.get("training_status")
-        countdown_str = self.coordinator.data.get("training_status_raw")
+        training_status = self.coordinator.data.training_status
+        countdown_str = self.coordinator.data.training_status_raw
 
         if training_status == "countdown" and countdown_str:
             # Return the raw countdown string as the state
@@ -78,7 +72,8 @@ class WalkingPadMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
 
     async def async_media_play(self):
         """Start the treadmill."""
-        if not self.coordinator.is_connected:
+        # In passive mode this is where the on-demand connection comes up
+        if not await self.coordinator.async_ensure_connected():
             _LOGGER.warning("Cannot play: device not connected")
             return
         await self.coordinator.send_start()
@@ -87,7 +82,8 @@ class WalkingPadMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
 
     async def async_media_pause(self):
         """Pause the treadmill."""
-        if not self.coordinator.is_connected:
+        # In passive mode this is where the on-demand connection comes up
+        if not await self.coordinator.async_ensure_connected():
             _LOGGER.warning("Cannot pause: device not connected")
             return
         await self.coordinator.send_pause()
@@ -96,7 +92,8 @@ class WalkingPadMediaPlayer(CoordinatorEntity, MediaPlayerEntity):
 
     async def async_media_stop(self):
         """Stop the treadmill completely."""
-        if not self.coordinator.is_connected:
+        # In passive mode this is where the on-demand connection comes up
+        if not await self.coordinator.async_ensure_connected():
             _LOGGER.warning("Cannot stop: device not connected")
             return
         await self.coordinator.send_finish()
@@ -1,73 +1,205 @@
 # coordinator.py
 import asyncio
 import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import timedelta
 from bleak import BleakClient
 from bleak.backends.device import BLEDevice
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import async_ble_device_from_address
 try:
-    from bleak_retry_connector import establish_connection
+    from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
     _HAS_RETRY_CONNECTOR = True
 except ImportError:
     _HAS_RETRY_CONNECTOR = False
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from .const import (
+    DOMAIN,
+    CAPABILITIES_STORAGE_VERSION,
+    SESSION_STORAGE_VERSION,
+    CONF_HEIGHT,
+    CONF_WEIGHT_ENTITY,
+    UUID_SUPPORTED_SPEED_RANGE,
+    UUID_FITNESS_MACHINE_FEATURE,
     # UUID_TREADMILL_DATA,
     # UUID_CONTROL_POINT,
     # UUID_TREADMILL_STATUS,
-    MODEL_UUIDS,
     CMD_CONTROL_REQUEST,
-    CMD_START,
-    CMD_STOP,
-    CMD_FINISH,
     CONF_WATCH_HR_ENTITY,
     CONF_WATCH_STEPS_ENTITY,
     CONF_WATCH_CALORIES_ENTITY,
-    cmd_set_speed,
-    SPEED_MIN,
-    SPEED_MAX,
-    CMD_MC21_START,
-    CMD_MC21_STOP,
-    UUID_MC21_AUTH,
-    CMD_MC21_AUTH,
+    CONF_PASSIVE_MODE,
+    CONF_STATUS_DEBOUNCE,
+    CONF_FAST_SPEED_WRITES,
+    CONF_STALE_TIMEOUT,
+    CONF_COALESCE_WINDOW,
+    CONF_METRICS,
+    WATCHDOG_INTERVAL,
+    PASSIVE_RELEASE_DELAY,
+    SPEED_ACK_TIMEOUT,
+    SPEED_STEP,
+)
+from .estimators import EnergyEstimator, StepEstimator
+from .link import BACKOFF_DELAYS, SUBSCRIBING, LinkNotReady, WalkingPadLink
+from .metrics import async_register_metrics_view
+from .profiler import CallbackProfiler, profiled
+from .exporter import TelemetryExporter, create_exporter
+from .walkingpad_protocol.ftms import (
+    MachineCapabilities,
+    advertised_availability,
+    parse_machine_features,
+    parse_speed_range,
 )
+from .walkingpad_protocol import ModelProfile, decode_control_response, get_profile
+from .walkingpad_protocol.control_point import OP_SET_TARGET_SPEED, RESULT_SUCCESS
+from .routing import ConnectionRouter
+from .session import GapSegment, SessionCounters
+from .statistics import WalkingPadStatistics
+from .walkingpad_protocol.status import DEFAULT_STATUS_DEBOUNCE, StatusDecoder, StatusTransition
+from .telemetry import BODY_MODEL, WalkingPadTelemetry
+from .watchdog import STALE_MIN_TIMEOUT, LivenessWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds between writes of the session counters to storage
+SESSION_SAVE_INTERVAL = 30
+
+# GATT service tables keyed by MAC — survive reconnects so discovery runs once per HA start
+_SERVICES_CACHE = {}
+
+
+def _connected_source(client, requested: str | None) -> str | None:
+    """Scanner source the connection actually went through.
+    habluetooth's client wrapper only takes the address from the BLEDevice and
+    chooses the scanner on its own; it records the one it connected through on
+    the client. Clients without that record (raw bleak, older habluetooth) are
+    credited to the requested source.
+    """
+    scanner = getattr(client, "_connected_scanner", None)
+    return getattr(scanner, "source", None) or requested
+
 
 class WalkingPadCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, config):
+    def __init__(
+        self,
+        hass,
+        config,
+        watchdog_interval: float = WATCHDOG_INTERVAL,
+        backoff_delays: tuple[float, ...] = BACKOFF_DELAYS,
+    ):
         super().__init__(hass, _LOGGER, name="WalkingPadCoordinator")
+        self.watchdog_interval = watchdog_interval
         self.mac = (config.get("mac_address") or config.get("mac") or "").upper()
         self.device_name = config.get("device_name")
         # self.model = config.get("model", "unknown")
         self.model = (config.get("model") or "WalkingPad").strip()
-        model_config = MODEL_UUIDS.get(self.model, MODEL_UUIDS["WalkingPad"])
-        self.uuids = model_config
-        # Per-model speed limits — used by send_set_speed and the number entity
-        self.speed_min: float = model_config.get("speed_min", SPEED_MIN)
-        self.speed_max: float = model_config.get("speed_max", SPEED_MAX)
-        for key in ("data", "control", "status"):
-            if key not in self.uuids:
-                raise ValueError(
-                    f"Missing UUID '{key}' for model '{self.model}'"
-                )
-
-        self.client = None
-        self._retry_task = None
-        self.data = {
-            "speed": 0.0,
-            "distance": 0,
-            "energy": 0,
-            "elapsed_time": 0,
-            "training_status": "unknown",
-            "training_status_raw": None,
-            "countdown_number": None,
-            # Watch session data (populated when use_watch=True)
-            "watch_session_steps": 0,
-            "watch_session_calories": 0,
-            "watch_heart_rate": None,
-        }
+        # Protocol variant — UUIDs, command encodings and status table — picked once here
+        self.profile: ModelProfile = get_profile(self.model)
+        # Per-model speed limits — used by send_set_speed and the number entity.
+        # These are the profile fallback; apply_capabilities() replaces them
+        # with what the pad itself reports in 2AD4.
+        self.speed_min: float = self.profile.speed_min
+        self.speed_max: float = self.profile.speed_max
+        self.speed_step: float = SPEED_STEP
+        self.capabilities: MachineCapabilities | None = None
+        self._features: int | None = None  # 2ACC bitfield, None = decode everything
+        # Set Target Speed encodings for every valid step, rebuilt when the range changes
+        self._speed_commands = self.profile.speed_commands(self.speed_min, self.speed_max, self.speed_step)
+        # Opt-in write-without-response for speed; acks come from the 2AD9 indication
+        self.fast_speed_writes = False
+        self._pending_speed_acks: deque[float] = deque(maxlen=32)
+        self.speed_write_stats = {"sent": 0, "acked": 0, "rejected": 0, "lost": 0, "last_ack_latency": None}
+        # Start / pause / finish round trips, Request Control included
+        self.command_stats = {"sent": 0, "failed": 0, "latency_sum": 0.0, "last_latency": None}
+        storage_slug = self.mac.replace(":", "").lower()
+        self._capabilities_store = Store(
+            hass, CAPABILITIES_STORAGE_VERSION, f"{DOMAIN}.{storage_slug}_capabilities"
+        )
+        # Last device session counters — lets us backfill what happened while HA was down
+        self._session_store = Store(
+            hass, SESSION_STORAGE_VERSION, f"{DOMAIN}.{storage_slug}_session"
+        )
+        self.session_counters = SessionCounters(self.speed_max)
+        self._session_saved_at = 0.0
+        # Reconstructed gap intervals, newest last
+        self.gap_segments: deque[GapSegment] = deque(maxlen=20)
+        # Energy ledger — attached by the sensor platform
+        self.energy_tracker = None
+
+        # Step model — height from setup (cm), speed from 2ACD, calibrated against the watch
+        raw_height = config.get(CONF_HEIGHT)
+        self.step_estimator = StepEstimator(float(raw_height) / 100 if raw_height else None)
+
+        # Energy model — ACSM equations with the BMI weight entity; when no weight
+        # is known the pad's own energy counter feeds the ledger instead
+        self.energy_estimator = EnergyEstimator()
+        self._config_weight_entity: str | None = config.get(CONF_WEIGHT_ENTITY)
+        self.weight_entity: str | None = None
+        self._unsub_weight = None
+
+        # One DeviceInfo per pad, shared by every entity of every platform
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.mac)},
+            name=self.device_name,
+            manufacturer="KingSmith",
+            model=self.model,
+        )
+
+        # The link actor owns the BleakClient, connects, writes and reconnect backoff
+        self.link = WalkingPadLink(
+            hass, self._async_open_link, self._handle_link_state, backoff_delays
+        )
+        # Status state machine — one write per real transition
+        self.status_decoder = StatusDecoder(self.profile)
+        self._cancel_status_confirm = None
+        # Per-source (adapter / proxy) RSSI and connect history
+        self.router = ConnectionRouter()
+        # Notification silence on a "connected" link → stale → forced reconnect
+        self.watchdog = LivenessWatchdog()
+        self._unsub_watchdog = None
+
+        # Passive mode — advertisements keep presence; connect only on demand
+        self.passive: bool = False
+        self._unsub_advertisements: list = []
+        self._cancel_release = None
+
+        # Connect pipeline instrumentation
+        self.connect_timings: dict[str, float] = {}
+        self.time_to_first_data: float | None = None
+        self._connect_started: float | None = None
+        self._awaiting_first_data = False
+        self.data = WalkingPadTelemetry()
+        # Notification coalescing — None dispatches per packet, else seconds per window
+        self.coalesce_window: float | None = None
+        self._coalesce_handle: asyncio.Handle | None = None
+        self._coalesce_started = 0.0
+        self.coalesce_stats = {"frames": 0, "dispatches": 0, "max_delay_ms": 0.0}
+        # Notifications received / that didn't decode, per characteristic, and the latest bad one
+        self.notification_counts = {"treadmill_data": 0, "status": 0, "control_point": 0}
+        self.malformed_frames = {"treadmill_data": 0, "status": 0, "control_point": 0}
+        self.last_malformed_frame: dict | None = None
+        # Attached by the profile service for its sampling window only
+        self.profiler: CallbackProfiler | None = None
+        # Websocket subscribers and the exporter — called with a compact frame on every packet
+        self._frame_listeners: list = []
+        # How many of them need live data — in passive mode they hold the GATT connection
+        self._keep_alive_listeners = 0
+        # Batched MQTT / UDP export — configured from options
+        self.exporter: TelemetryExporter | None = None
+        # Served by the Prometheus metrics view — configured from options
+        self.metrics_enabled = False
+        # Hourly long-term statistics (distance, energy, active minutes, speed)
+        self.statistics = WalkingPadStatistics(hass, self.mac, self.device_name)
         self.control_state = None
         self.control_state_last = None
 
@@ -86,399 +218,844 @@ class WalkingPadCoordinator(DataUpdateCoordinator):
         _LOGGER.info("WalkingPad model detected: %s", self.model)
     
     @property
-    def is_connected(self):
-        return bool(self.client and self.client.is_connected)
+    def client(self):
+        return self.link.client
 
     @property
-    def is_mc21(self) -> bool:
-        """True for MC21 — skips Request Control before all commands."""
-        return self.model == "WalkingPad MC21"
+    def is_connected(self):
+        return self.link.is_ready
 
     async def async_start(self):
-        max_attempts = 3
-        for attempt in range(1, max_attempts + 1):
-            try:
-                await asyncio.wait_for(self.async_connect(), timeout=15)
-                _LOGGER.info("Connected to WalkingPad on attempt %d", attempt)
-                return True
-            except asyncio.TimeoutError:
-                _LOGGER.warning("Connect attempt %d timed out", attempt)
-            except Exception as exc:
-                _LOGGER.warning("Connect attempt %d failed: %s", attempt, exc)
-            await asyncio.sleep(5)
-
-        _LOGGER.warning("All connect attempts failed; falling back to saved data and scheduling retries.")
-        if not self._retry_task or self._retry_task.done():
-            self._retry_task = self.hass.loop.create_task(self._retry_loop())
+        self._start_advertisement_tracking()
+        if self._unsub_watchdog is None:
+            self._unsub_watchdog = async_track_time_interval(
+                self.hass, self._handle_watchdog_tick, timedelta(seconds=self.watchdog_interval)
+            )
+        self.link.start()
+        if self.passive:
+            _LOGGER.info("Passive mode — not connecting until control or live data is needed")
+            return True
+        try:
+            await self.link.connect()
+            _LOGGER.info("Connected to WalkingPad")
+            return True
+        except Exception as exc:
+            # The link keeps retrying with backoff on its own
+            _LOGGER.warning("Connect failed (%s); falling back to saved data, retrying in background", exc)
         return False
 
-
     async def async_connect(self):
-        """Establish BLE connection and subscribe to notifications.
+        """Ask the link actor to connect. Raises if the attempt fails.
+        In passive mode a manual connect is released again once the pad is idle.
+        """
+        await self.link.connect()
+        if self.passive:
+            self._schedule_passive_release()
+
+    @callback
+    def _handle_link_state(self, state: str) -> None:
+        # Connectivity entities follow the link state
+        self.async_update_listeners()
+
+    async def async_establish_connection(self, ble_device):
+        """Open the GATT connection and return the connected client.
         Uses bleak_retry_connector.establish_connection() when available,
         which is HA's recommended approach for reliable BLE connections.
         Falls back to raw BleakClient.connect() if not available.
         """
-        if self.is_connected:
-            _LOGGER.info("Already connected to WalkingPad")
-            return
+        if _HAS_RETRY_CONNECTOR:
+            # Preferred path — handles retries, stale connections, concurrent attempts
+            _LOGGER.debug("Using bleak_retry_connector for reliable connection")
+            return await establish_connection(
+                BleakClientWithServiceCache,
+                ble_device,
+                self.mac,
+                disconnected_callback=self._on_disconnected,
+                cached_services=_SERVICES_CACHE.get(self.mac),
+            )
+        # Fallback — raw Bleak (works but less reliable on marginal BLE environments)
+        _LOGGER.debug("bleak_retry_connector not available, using raw BleakClient")
+        client = BleakClient(ble_device, disconnected_callback=self._on_disconnected)
+        await client.connect()
+        return client
+
+    async def _async_open_link(self, set_state) -> None:
+        """Connect pipeline — only ever run by the link actor.
+        The GATT connection itself comes from async_establish_connection().
 
+        The connect runs as timed phases (resolve → connect → subscribe) and
+        the per-phase durations are kept in self.connect_timings. GATT services
+        are cached per MAC so a reconnect skips service discovery.
+        """
         _LOGGER.debug("Connecting to WalkingPad at %s", self.mac)
+        timings = {}
+        started = phase_start = time.monotonic()
+        self._connect_started = started
+        self._awaiting_first_data = True
+        source = client = None
         try:
-            ble_device = async_ble_device_from_address(
-                self.hass, self.mac, connectable=True
-            )
+            ble_device, source = self._select_ble_device()
             if not ble_device:
                 raise RuntimeError(f"BLE device {self.mac} not found by HA Bluetooth stack")
+            timings["resolve"] = time.monotonic() - phase_start
+            phase_start = time.monotonic()
 
-            if _HAS_RETRY_CONNECTOR:
-                # Preferred path — handles retries, stale connections, concurrent attempts
-                _LOGGER.debug("Using bleak_retry_connector for reliable connection")
-                self.client = await establish_connection(
-                    BleakClient,
-                    ble_device,
-                    self.mac,
-                    disconnected_callback=self._on_disconnected,
-                )
-            else:
-                # Fallback — raw Bleak (works but less reliable on marginal BLE environments)
-                _LOGGER.debug("bleak_retry_connector not available, using raw BleakClient")
-                self.client = BleakClient(ble_device, disconnected_callback=self._on_disconnected)
-                await self.client.connect()
+            try:
+                client = await self.async_establish_connection(ble_device)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                _LOGGER.error("Failed to connect to device via %s: %s", source, exc)
+                raise
+            # Credit the path HA actually used — it may not be the one we asked for
+            source = _connected_source(client, source)
+            timings["connect"] = time.monotonic() - phase_start
+            phase_start = time.monotonic()
 
+            set_state(SUBSCRIBING, client)
+            await self._async_subscribe(client)
+        except asyncio.CancelledError:
+            # The link's connect timeout fired mid-connect or mid-subscribe
+            if source is not None:
+                self.router.record_attempt(source)
+                self.router.record_failure(source, timeout=True)
+            raise
         except Exception as exc:
-            self.client = None
-            _LOGGER.error("Failed to connect to device: %s", exc)
+            # Subscribe / auth failures count against the source too — a proxy that
+            # connects but can't carry the GATT traffic is no better than one that can't connect
+            if source is not None:
+                self.router.record_attempt(source)
+                self.router.record_failure(source, timeout=isinstance(exc, asyncio.TimeoutError))
             raise
+        self.router.record_attempt(source)
+        self.router.record_success(source, timings["connect"])
+        timings["subscribe"] = time.monotonic() - phase_start
+
+        # First connect only — afterwards the capabilities come from storage
+        if self.capabilities is None:
+            phase_start = time.monotonic()
+            await self._async_discover_capabilities()
+            timings["discover"] = time.monotonic() - phase_start
+
+        timings["total"] = time.monotonic() - started
+        self.connect_timings = timings
+        self.watchdog.reset(time.monotonic())
+        _LOGGER.info(
+            "Connect timings — resolve: %.2fs  connect: %.2fs  subscribe: %.2fs  total: %.2fs",
+            timings["resolve"], timings["connect"], timings["subscribe"], timings["total"],
+        )
+
+    async def _async_subscribe(self, client) -> None:
+        """Subscribe to the pad's notifications (and unlock MC21 control) on a new client."""
+        # Service tables never change for a given pad — remember them for next time
+        if client.services is not None:
+            _SERVICES_CACHE[self.mac] = client.services
 
+        # Subscriptions and the MC21 auth write don't depend on each other,
+        # so issue them together and let the stack pipeline them
+        steps = [
+            client.start_notify(self.profile.data_uuid, self._notification_handler),
+            client.start_notify(self.profile.control_uuid, self.handle_response),
+            client.start_notify(self.profile.status_uuid, self._training_status_handler),
+        ]
+        if self.profile.auth is not None:
+            # MC21: send proprietary authorization token to unlock 2AD9 control
+            steps.append(self.send_mc21_auth(client))
         try:
-            await self.client.start_notify(self.uuids["data"], self._notification_handler)
-            await self.client.start_notify(self.uuids["control"], self.handle_response)
-            await self.client.start_notify(self.uuids["status"], self._training_status_handler)
+            await asyncio.gather(*steps)
             _LOGGER.info("Subscribed to notifications")
         except Exception as exc:
-            _LOGGER.error("Failed to subscribe to notifications: %s", exc)
+            # A failed subscription leaves us connected but deaf, a failed MC21 auth
+            # connected but unable to control — treat either as a failed connect
+            # and drop the cached services in case they were stale
+            _LOGGER.error("Failed to subscribe to notifications / authorize: %s", exc)
+            # (the link actor tears the connection down)
+            _SERVICES_CACHE.pop(self.mac, None)
+            if hasattr(client, "clear_cache"):
+                try:
+                    await client.clear_cache()
+                except Exception as clear_exc:
+                    _LOGGER.debug("Error clearing GATT cache: %s", clear_exc)
+            raise
+
+    def _select_ble_device(self) -> tuple[BLEDevice | None, str | None]:
+        """Best connectable source for the pad — ranked by RSSI and connect history,
+        sources that keep failing are only tried after the others.
+        This is a preference only: HA's bleak wrapper picks the path itself (RSSI,
+        free slots, its own failure counts), see _connected_source().
+        """
+        devices = bluetooth.async_scanner_devices_by_address(self.hass, self.mac, connectable=True)
+        if devices:
+            by_source = {device.scanner.source: device for device in devices}
+            ranked = self.router.rank(
+                [(source, device.advertisement.rssi) for source, device in by_source.items()]
+            )
+            _LOGGER.debug("Connectable sources for %s (best first): %s", self.mac, ranked)
+            return by_source[ranked[0]].ble_device, ranked[0]
+        # Nothing in the scanner tables — let HA pick
+        ble_device = async_ble_device_from_address(self.hass, self.mac, connectable=True)
+        return ble_device, "default"
+
+    async def async_load_stored_state(self) -> None:
+        """Load the pad's cached 2AD4 / 2ACC values and last session counters. Called once on setup."""
+        try:
+            stored = await self._capabilities_store.async_load()
+            if stored:
+                self.apply_capabilities(MachineCapabilities.from_dict(stored))
+        except Exception as exc:
+            _LOGGER.debug("Ignoring unreadable capabilities cache: %s", exc)
+        try:
+            stored = await self._session_store.async_load() or {}
+            self.session_counters.restore(stored.get("counters"))
+            self.step_estimator.calibration = float(stored.get("step_calibration", 1.0))
+        except Exception as exc:
+            _LOGGER.debug("Ignoring unreadable session counters: %s", exc)
+
+    def _session_data(self) -> dict:
+        return {
+            "counters": self.session_counters.as_dict(),
+            "step_calibration": self.step_estimator.calibration,
+        }
 
-        # MC21: send proprietary authorization token to unlock 2AD9 control
-        if self.is_mc21:
-            await self.send_mc21_auth()
+    async def _async_discover_capabilities(self) -> None:
+        """Read Supported Speed Range (2AD4) and Fitness Machine Feature (2ACC) and persist them.
+        Models without these characteristics keep the profile's limits.
+        """
+        try:
+            speed_min, speed_max, speed_step = parse_speed_range(
+                await self.client.read_gatt_char(UUID_SUPPORTED_SPEED_RANGE)
+            )
+        except Exception as exc:
+            _LOGGER.debug("Supported Speed Range not available, keeping model defaults: %s", exc)
+            return
+
+        features = 0
+        try:
+            features = parse_machine_features(
+                await self.client.read_gatt_char(UUID_FITNESS_MACHINE_FEATURE)
+            )
+        except Exception as exc:
+            _LOGGER.debug("Fitness Machine Feature not available: %s", exc)
+
+        capabilities = MachineCapabilities(speed_min, speed_max, speed_step, features)
+        self.apply_capabilities(capabilities)
+        await self._capabilities_store.async_save(capabilities.as_dict())
+        _LOGGER.info(
+            "Discovered speed range %.1f–%.1f km/h (step %.2f), features 0x%08X",
+            speed_min, speed_max, speed_step, features,
+        )
+
+    def apply_capabilities(self, capabilities: MachineCapabilities) -> None:
+        self.capabilities = capabilities
+        self.speed_min = capabilities.speed_min
+        self.speed_max = capabilities.speed_max
+        self.session_counters.max_speed = capabilities.speed_max
+        self.speed_step = capabilities.speed_step
+        self._speed_commands = self.profile.speed_commands(self.speed_min, self.speed_max, self.speed_step)
+        # A pad that reports no features at all is treated as "unknown"
+        self._features = capabilities.features or None
 
     # async def async_stop(self):
     #     """Disconnect BLE client."""
     #     await self.disconnect()
     async def async_stop(self):
-        """Disconnect BLE client and cancel retry loop."""
-        if self._retry_task and not self._retry_task.done():
-            self._retry_task.cancel()
-            self._retry_task = None
-        await self.disconnect()
+        """Disconnect BLE client and stop the link actor."""
+        if self._unsub_weight:
+            self._unsub_weight()
+            self._unsub_weight = None
+        if self._unsub_watchdog:
+            self._unsub_watchdog()
+            self._unsub_watchdog = None
+        for unsub in self._unsub_advertisements:
+            unsub()
+        self._unsub_advertisements = []
+        if self._cancel_release:
+            self._cancel_release()
+            self._cancel_release = None
+        if self._cancel_status_confirm:
+            self._cancel_status_confirm()
+            self._cancel_status_confirm = None
+        if self._coalesce_handle is not None:
+            self._coalesce_handle.cancel()
+            self._coalesce_handle = None
+        if self.exporter is not None:
+            self.exporter.stop()
+            self.exporter = None
+        if self.energy_tracker is not None:
+            self.energy_tracker.async_stop()
+            self.energy_tracker = None
+        await self.statistics.async_stop()
+        if self.session_counters.as_dict() is not None:
+            await self._session_store.async_save(self._session_data())
+        await self.link.stop()
 
     async def disconnect(self):
-        if self.client and self.client.is_connected:
-            try:
-                await self.client.disconnect()
-                _LOGGER.info("Disconnected from WalkingPad")
-            except Exception as exc:
-                _LOGGER.debug("Error during disconnect: %s", exc)
-        self.client = None
-    
+        await self.link.disconnect()
+
     def _on_disconnected(self, client):
-        """Called by Bleak when the BLE connection drops unexpectedly."""
-        _LOGGER.warning("WalkingPad disconnected unexpectedly, scheduling retry")
-        self.client = None
-        if not self._retry_task or self._retry_task.done():
-            self._retry_task = self.hass.loop.create_task(self._retry_loop())
+        """Called by Bleak when the connection drops — the link actor decides what to do."""
+        self.link.notify_lost(client)
 
+    @profiled
     def _notification_handler(self, sender, data: bytearray):
         """Parse treadmill data notifications."""
         _LOGGER.debug("Received treadmill data notification")
+        self.notification_counts["treadmill_data"] += 1
         try:
-            speed_raw = int.from_bytes(data[2:4], byteorder="little") / 100
-
-            # MC11 sends 17-byte packets (distance = 3 bytes at b[4:7])
-            # MC21 sends 14-byte packets (distance = 2 bytes at b[4:6])
-            if len(data) >= 17:
-                # MC11 format
-                distance = int.from_bytes(data[4:7], byteorder="little")
-                energy   = data[7]
-                elapsed  = int.from_bytes(data[12:14], byteorder="little")
-            elif len(data) >= 14:
-                # MC21 format
-                distance = int.from_bytes(data[4:6], byteorder="little")
-                energy   = data[7]
-                elapsed  = int.from_bytes(data[12:14], byteorder="little")
-            else:
+            # Fixed model offsets, or FTMS flags gated by the pad's 2ACC
+            # features for profiles that opt in
+            parsed = self.profile.parse_treadmill(data, self._features)
+            if parsed is None:
                 _LOGGER.debug("Short data packet (%d bytes), skipping", len(data))
+                self._note_malformed("treadmill_data", data)
                 return
         except Exception as exc:
             _LOGGER.debug("Failed parsing treadmill notification: %s", exc)
+            self._note_malformed("treadmill_data", data)
             return
+        speed_raw, distance, energy, elapsed, incline = parsed
+
+        stale_for = self.watchdog.note_packet(self.data.training_status, time.monotonic())
+        if stale_for is not None:
+            _LOGGER.info("Treadmill data flowing again after %.1fs of silence", stale_for)
+            self.data.apply_link_stale(False)
 
-        self.data.update({
-            "speed": speed_raw,
-            "distance": distance,
-            "energy": energy,
-            "elapsed_time": elapsed,
-        })
+        if self._awaiting_first_data:
+            self._awaiting_first_data = False
+            self.time_to_first_data = time.monotonic() - self._connect_started
+            _LOGGER.info("First treadmill data %.2fs after connect start", self.time_to_first_data)
+
+        # Fields the packet didn't carry keep their last value
+        telemetry = self.data
+        telemetry.apply_treadmill(
+            telemetry.speed if speed_raw is None else speed_raw,
+            telemetry.distance if distance is None else distance,
+            telemetry.energy if energy is None else energy,
+            telemetry.elapsed_time if elapsed is None else elapsed,
+            telemetry.incline if incline is None else incline,
+        )
+        self._account_counters(telemetry)
         # Refresh watch data on every treadmill notification
         self.update_watch_data()
+        if self._frame_listeners:
+            frame = self.telemetry_frame()
+            for listener in tuple(self._frame_listeners):
+                # One broken subscriber must not cost the others (or the entities) this packet
+                try:
+                    listener(frame)
+                except Exception:
+                    _LOGGER.exception(
+                        "Frame listener %s failed", getattr(listener, "__qualname__", listener)
+                    )
+        self._dispatch_update()
+
+
+    def _note_malformed(self, characteristic: str, data) -> None:
+        self.malformed_frames[characteristic] += 1
+        self.last_malformed_frame = {
+            "characteristic": characteristic,
+            "data": bytes(data[:32]).hex(" "),
+            "at": time.time(),
+        }
+
+    def _dispatch_update(self) -> None:
+        """Fan a notification out to the entities — at once, or once per coalescing window.
+        State is already written when this runs; only the listener dispatch waits.
+        """
+        window = self.coalesce_window
+        if window is None:
+            self._async_notify_entities()
+            return
+        stats = self.coalesce_stats
+        stats["frames"] += 1
+        if self._coalesce_handle is not None:
+            return
+        self._coalesce_started = time.monotonic()
+        if window:
+            self._coalesce_handle = self.hass.loop.call_later(window, self._flush_coalesced)
+        else:
+            # Window 0 — everything delivered in this loop iteration
+            self._coalesce_handle = self.hass.loop.call_soon(self._flush_coalesced)
+
+    @profiled
+    @callback
+    def _flush_coalesced(self) -> None:
+        self._coalesce_handle = None
+        stats = self.coalesce_stats
+        stats["dispatches"] += 1
+        delay_ms = (time.monotonic() - self._coalesce_started) * 1000
+        if delay_ms > stats["max_delay_ms"]:
+            stats["max_delay_ms"] = round(delay_ms, 1)
+        self._async_notify_entities()
+
+    def _async_notify_entities(self) -> None:
+        # A broken entity must not abort the bleak callback or the flush timer,
+        # but it must not vanish silently either
         try:
             self.async_set_updated_data(self.data)
         except Exception:
-            pass
+            _LOGGER.exception("Entity update failed")
 
+    def telemetry_frame(self) -> list:
+        """Compact live frame for websocket subscribers: speed, distance, time, HR."""
+        telemetry = self.data
+        return [telemetry.speed, telemetry.distance, telemetry.elapsed_time, telemetry.watch_heart_rate]
 
-    # Control commands (no changes, just cleaned logs)
-    async def send_mc21_auth(self) -> None:
-        """Send the proprietary KingSmith authorization token to unlock 2AD9 control on MC21.
-        Must be called once after connecting, before any Start/Stop/Speed commands.
-        Confirmed from HCI snoop log — static 8-byte token, identical across all sessions.
+    @callback
+    def async_add_frame_listener(
+        self, listener: Callable[[list], None], keep_alive: bool = True
+    ) -> Callable[[], None]:
+        """Register a frame listener; returns the function that removes it.
+        With keep_alive=False (the exporter) the listener only gets frames while
+        something else keeps the link up — in passive mode it never connects.
         """
-        if not self.is_mc21 or not self.is_connected:
+        self._frame_listeners.append(listener)
+        if keep_alive:
+            self._keep_alive_listeners += 1
+            if self.passive and not self.is_connected:
+                # Live data needs the GATT connection
+                self.hass.async_create_task(self.async_ensure_connected())
+
+        @callback
+        def _remove() -> None:
+            if listener in self._frame_listeners:
+                self._frame_listeners.remove(listener)
+                if keep_alive:
+                    self._keep_alive_listeners -= 1
+
+        return _remove
+
+    # Liveness watchdog
+    @profiled
+    @callback
+    def _handle_watchdog_tick(self, _now) -> None:
+        if not self.is_connected:
+            return
+        if not self.watchdog.check(self.data.training_status, time.monotonic()):
             return
+        _LOGGER.warning(
+            "No treadmill data for %.0fs while %s — link is stale, reconnecting",
+            time.monotonic() - self.watchdog.last_packet, self.data.training_status,
+        )
+        self.data.apply_link_stale(True)
+        self.async_set_updated_data(self.data)
+        self.hass.async_create_task(self._async_recover_stale_link())
+
+    async def _async_recover_stale_link(self) -> None:
+        """Drop the zombie connection and reconnect straight away."""
         try:
-            await self.client.write_gatt_char(
-                UUID_MC21_AUTH,
-                CMD_MC21_AUTH,
-                response=True,
-            )
-            _LOGGER.info("MC21 authorization token sent successfully")
+            await self.link.reconnect()
         except Exception as exc:
-            _LOGGER.error("Failed to send MC21 authorization token: %s", exc)
+            # The link falls back to its backoff schedule
+            _LOGGER.warning("Reconnect after stale link failed: %s", exc)
 
-    async def send_control_request(self):
-        """MC11 only — MC21 does not need this before any command."""
-        if self.is_mc21:
+    # Passive mode — advertisements and on-demand connections
+    def _start_advertisement_tracking(self) -> None:
+        if self._unsub_advertisements:
             return
+        self._unsub_advertisements = [
+            bluetooth.async_register_callback(
+                self.hass,
+                self._handle_advertisement,
+                bluetooth.BluetoothCallbackMatcher(address=self.mac),
+                bluetooth.BluetoothScanningMode.PASSIVE,
+            ),
+            bluetooth.async_track_unavailable(
+                self.hass, self._handle_unavailable, self.mac, connectable=False
+            ),
+        ]
+
+    @profiled
+    @callback
+    def _handle_advertisement(self, service_info, change) -> None:
+        available = advertised_availability(service_info.service_data)
+        if available is None:
+            available = self.data.machine_available
+        self.router.update_rssi(service_info.source, service_info.rssi)
+        if self.data.apply_advertisement(True, available, service_info.rssi):
+            self.async_set_updated_data(self.data)
+
+    @profiled
+    @callback
+    def _handle_unavailable(self, service_info) -> None:
+        if self.data.apply_advertisement(False, None, None):
+            _LOGGER.info("WalkingPad %s stopped advertising", self.mac)
+            self.async_set_updated_data(self.data)
+
+    async def async_ensure_connected(self) -> bool:
+        """Make sure there is a GATT connection; in passive mode this is the upgrade path.
+        Outside passive mode the retry loop owns reconnects, so this only reports.
+        """
+        if self.is_connected or not self.passive:
+            return self.is_connected
+        # The link serialises requests, so concurrent callers share one attempt
+        try:
+            await self.link.connect()
+        except Exception as exc:
+            _LOGGER.warning("On-demand connect failed: %s", exc)
         if self.is_connected:
-            try:
-                # await self.client.write_gatt_char(UUID_CONTROL_POINT, CMD_CONTROL_REQUEST, response=True)
-                await self.client.write_gatt_char(
-                    self.uuids["control"],
-                    CMD_CONTROL_REQUEST,
-                    response=True
-                )
-            except Exception as e:
-                _LOGGER.debug("Error sending CONTROL REQUEST: %s", e)
+            self._schedule_passive_release()
+        return self.is_connected
+
+    async def _async_apply_passive_mode(self) -> None:
+        """Passive mode switched in the options — release or bring up the link now."""
+        if self.passive:
+            _LOGGER.info("Passive mode on — dropping the background connection")
+            if self.is_connected:
+                # Same rules as an on-demand connection: kept while a session or stream needs it
+                await self._async_passive_release(None)
+            else:
+                # Cancels a pending background retry
+                await self.disconnect()
+            return
+        _LOGGER.info("Passive mode off — connecting")
+        if self._cancel_release:
+            self._cancel_release()
+            self._cancel_release = None
+        try:
+            await self.link.connect()
+        except Exception as exc:
+            # The link keeps retrying with backoff on its own
+            _LOGGER.warning("Connect after leaving passive mode failed: %s", exc)
+
+    def _schedule_passive_release(self) -> None:
+        if self._cancel_release:
+            self._cancel_release()
+        self._cancel_release = async_call_later(
+            self.hass, PASSIVE_RELEASE_DELAY, self._async_passive_release
+        )
+
+    async def _async_passive_release(self, _now) -> None:
+        """Drop an on-demand connection once the pad is idle and nobody streams."""
+        self._cancel_release = None
+        if not self.passive or not self.is_connected:
+            return
+        if self._keep_alive_listeners or self.data.training_status in ("playing", "paused", "countdown"):
+            self._schedule_passive_release()
+            return
+        _LOGGER.info("Passive mode — releasing idle connection")
+        await self.disconnect()
+        self.async_update_listeners()
+
+    def _account_counters(self, telemetry: WalkingPadTelemetry) -> None:
+        """Turn the device totals into deltas for the energy ledger and statistics."""
+        now = time.time()
+        d_distance, d_energy, d_elapsed, segment = self.session_counters.advance(
+            telemetry.distance, telemetry.energy, telemetry.elapsed_time, now
+        )
+        speed = telemetry.speed
+        playing = telemetry.training_status == "playing"
+        if segment is not None:
+            # Packets resumed after a gap — account it once, as one interpolated segment
+            self.gap_segments.append(segment)
+            speed = segment.average_speed
+            playing = True
+            _LOGGER.info(
+                "Backfilled %s gap: %.0fs, %.0f m, %.1f kcal",
+                "new-session" if segment.new_session else "mid-session",
+                segment.elapsed, segment.distance, segment.energy,
+            )
+        if self.session_counters.restarted:
+            self.step_estimator.reset_session()
+            self.energy_estimator.reset_session()
+        self.step_estimator.add(d_distance, speed, telemetry.distance)
+        # Belt time only counts while it moves; the device counter is kept as the
+        # fallback energy source when no weight is configured
+        model_energy = self.energy_estimator.add(d_elapsed if speed > 0 else 0, speed, telemetry.incline)
+        if self.energy_estimator.weight:
+            d_energy = model_energy
+            telemetry.apply_estimated_energy(round(self.energy_estimator.session_energy, 1))
+        if segment is None and not (d_distance or d_energy or d_elapsed):
+            return
+        # Only the statistics differ for a gap — the ledger and the saved
+        # session take its energy like any other packet's
+        if segment is not None:
+            self.statistics.add_segment(segment, speed, d_distance, d_energy, d_elapsed)
         else:
-            _LOGGER.debug("Cannot send CONTROL REQUEST, client not connected")
+            self.statistics.add_sample(speed, d_distance, d_energy, d_elapsed, playing)
+        if self.energy_tracker is not None:
+            self.energy_tracker.add_energy_delta(d_energy)
+        # Persist at most every SESSION_SAVE_INTERVAL — a delayed save would be
+        # pushed back by every packet and never land while the belt is running
+        if now - self._session_saved_at >= SESSION_SAVE_INTERVAL:
+            self._session_saved_at = now
+            self._session_store.async_delay_save(self._session_data)
 
-    async def send_start(self):
-        """Start the treadmill. MC21: [0x07] direct. MC11: Request Control + [0x07,0x01]."""
-        if not self.is_connected:
-            _LOGGER.debug("Cannot send START, client not connected")
+    # Control commands — encodings and Request Control come from the model profile
+    async def send_mc21_auth(self, client) -> None:
+        """Send the proprietary KingSmith authorization token to unlock 2AD9 control (MC21).
+        Must be called once after connecting, before any Start/Stop/Speed commands —
+        it runs inside the connect pipeline, so it writes on the new client directly.
+        Confirmed from HCI snoop log — static 8-byte token, identical across all sessions.
+        A failed write raises, so the connect fails and goes to backoff instead of
+        reporting a ready link whose control point is still locked.
+        """
+        if self.profile.auth is None:
             return
-        cmd = CMD_MC21_START if self.is_mc21 else CMD_START
-        if not self.is_mc21:
-            await self.send_control_request()
+        auth_uuid, token = self.profile.auth
         try:
-            await self.client.write_gatt_char(self.uuids["control"], cmd, response=True)
-            _LOGGER.info("Start command sent")
-        except Exception as e:
-            _LOGGER.debug("Error sending START: %s", e)
+            await client.write_gatt_char(auth_uuid, token, response=True)
+        except Exception as exc:
+            _LOGGER.error("Failed to send authorization token: %s", exc)
+            raise
+        _LOGGER.info("Authorization token sent successfully")
 
-    async def send_pause(self):
-        """Pause the treadmill. MC21: [0x08] direct. MC11: Request Control + [0x08,0x02]."""
-        if not self.is_connected:
-            _LOGGER.debug("Cannot send STOP, client not connected")
+    async def send_control_request(self):
+        """MC11 family only — profiles without needs_control_request skip this."""
+        if not self.profile.needs_control_request:
             return
-        cmd = CMD_MC21_STOP if self.is_mc21 else CMD_STOP
-        if not self.is_mc21:
-            await self.send_control_request()
         try:
-            await self.client.write_gatt_char(self.uuids["control"], cmd, response=True)
-            _LOGGER.info("Pause command sent")
+            await self.link.write(self.profile.control_uuid, CMD_CONTROL_REQUEST, response=True)
+        except LinkNotReady:
+            _LOGGER.debug("Cannot send CONTROL REQUEST, client not connected")
         except Exception as e:
-            _LOGGER.debug("Error sending STOP: %s", e)
+            _LOGGER.debug("Error sending CONTROL REQUEST: %s", e)
 
-    async def send_finish(self):
-        """Stop the treadmill. MC21: [0x08] direct. MC11: Request Control + [0x08,0x01]."""
-        if not self.is_connected:
-            _LOGGER.debug("Cannot send FINISH, client not connected")
-            return
-        cmd = CMD_MC21_STOP if self.is_mc21 else CMD_FINISH
-        if not self.is_mc21:
-            await self.send_control_request()
+    async def _send_command(self, cmd: bytes, label: str) -> bool:
+        """Write one control point command. Returns True once the pad acknowledged the write."""
+        if not await self.async_ensure_connected():
+            _LOGGER.debug("Cannot send %s, client not connected", label)
+            return False
+        stats = self.command_stats
+        sent = time.monotonic()
+        await self.send_control_request()
         try:
-            await self.client.write_gatt_char(self.uuids["control"], cmd, response=True)
-            _LOGGER.info("Finish command sent")
+            await self.link.write(self.profile.control_uuid, cmd, response=True)
+            _LOGGER.info("%s command sent", label)
         except Exception as e:
-            _LOGGER.debug("Error sending FINISH: %s", e)
+            _LOGGER.debug("Error sending %s: %s", label, e)
+            stats["failed"] += 1
+            return False
+        latency = time.monotonic() - sent
+        stats["sent"] += 1
+        stats["latency_sum"] += latency
+        stats["last_latency"] = round(latency, 3)
+        return True
+
+    async def send_start(self) -> bool:
+        """Start the treadmill. MC21: [0x07] direct. MC11: Request Control + [0x07,0x01]."""
+        return await self._send_command(self.profile.start_cmd, "Start")
+
+    async def send_pause(self) -> bool:
+        """Pause the treadmill. MC21: [0x08] direct. MC11: Request Control + [0x08,0x02]."""
+        return await self._send_command(self.profile.pause_cmd, "Pause")
+
+    async def send_finish(self) -> bool:
+        """Stop the treadmill. MC21: [0x08] direct. MC11: Request Control + [0x08,0x01]."""
+        return await self._send_command(self.profile.finish_cmd, "Finish")
 
-    async def send_set_speed(self, kmh: float) -> None:
+    async def send_set_speed(self, kmh: float) -> bool:
         """Set treadmill belt speed while running.
-        Clamps to SPEED_MIN–SPEED_MAX and rounds to 0.1 km/h resolution.
+        Clamps to the supported speed range and snaps to the pad's speed increment.
         Only sends if treadmill is actively playing.
         """
-        if not self.is_connected:
+        if not await self.async_ensure_connected():
             _LOGGER.warning("Cannot set speed: device not connected")
-            return
-        if self.data.get("training_status") != "playing":
+            return False
+        if self.data.training_status != "playing":
             _LOGGER.warning("Cannot set speed: treadmill is not actively playing")
-            return
-        # Clamp and round to 0.1 resolution
-        kmh = round(max(self.speed_min, min(self.speed_max, kmh)), 1)
-        if not self.is_mc21:
-            await self.send_control_request()
+            return False
+        # Clamp and snap to the pad's speed increment (0.1 km/h unless 2AD4 says otherwise)
+        kmh = max(self.speed_min, min(self.speed_max, kmh))
+        kmh = round(self.speed_min + round((kmh - self.speed_min) / self.speed_step) * self.speed_step, 2)
+        cmd = self._speed_commands.get(int(round(kmh * 100))) or self.profile.encode_speed(kmh)
+        await self.send_control_request()
+        fast = self.fast_speed_writes
         try:
-            await self.client.write_gatt_char(
-                self.uuids["control"],
-                cmd_set_speed(kmh),
-                response=True,
-            )
+            await self.link.write(self.profile.control_uuid, cmd, response=not fast)
             _LOGGER.debug("Speed set to %.1f km/h", kmh)
         except Exception as exc:
             _LOGGER.error("Failed to set speed: %s", exc)
+            return False
+        self.speed_write_stats["sent"] += 1
+        if fast:
+            self._pending_speed_acks.append(time.monotonic())
+        return True
 
+    def _account_speed_ack(self, result: int | None) -> None:
+        """Match a Set Target Speed indication to the oldest unacknowledged write."""
+        stats = self.speed_write_stats
+        now = time.monotonic()
+        pending = self._pending_speed_acks
+        while pending and now - pending[0] > SPEED_ACK_TIMEOUT:
+            pending.popleft()
+            stats["lost"] += 1
+        if not pending:
+            return
+        stats["last_ack_latency"] = round(now - pending.popleft(), 3)
+        if result == RESULT_SUCCESS:
+            stats["acked"] += 1
+        else:
+            stats["rejected"] += 1
+            _LOGGER.debug("Set speed rejected by the pad (result 0x%02X)", result or 0)
+
+    @profiled
     def handle_response(self, sender, data):
         """Parse control point responses and update state."""
         _LOGGER.debug("Control point response: %s", " ".join(f"{b:02X}" for b in data))
+        self.notification_counts["control_point"] += 1
         try:
-            if len(data) >= 2 and data[0] == 0x80:
-                opcode = data[1]
-                if opcode == 0x07:
-                    self.control_state = "playing"
-                elif opcode == 0x08:
-                    tail = data[2:]
-                    if 0x02 in tail:
-                        self.control_state = "paused"
-                    elif 0x01 in tail:
-                        self.control_state = "idle"
-                    else:
-                        self.control_state = "paused"
+            decoded = decode_control_response(data)
+            if decoded is None:
+                self._note_malformed("control_point", data)
+            else:
+                opcode, result, state = decoded
+                if opcode == OP_SET_TARGET_SPEED:
+                    # Set Target Speed: 80 02 <result>, result 0x01 = success
+                    self._account_speed_ack(result)
+                    return
+                if state is not None:
+                    self.control_state = state
                 self.control_state_last = self.control_state
         except Exception as exc:
             _LOGGER.debug("Error parsing control response: %s", exc)
 
-        try:
-            self.async_set_updated_data(self.data)
-        except Exception:
-            pass
+        self._dispatch_update()
     
+    @profiled
     def _training_status_handler(self, sender, data: bytearray):
         """Handle training status notifications.
 
         MC11 uses UUID 2AD3 (Training Status) with proprietary byte format.
         MC21 uses UUID 2ADA (Fitness Machine Status) with FTMS standard format.
-        Both are routed here — we detect which format based on b[0].
+        Both are routed here — the model profile's status table decodes either
+        format with a single lookup on (b[0], b[1]).
         """
-        hex_data = " ".join(f"{b:02X}" for b in data)
-        _LOGGER.debug("Training Status raw data: %s", hex_data)
-
-        status_str = "unknown"
-        countdown_number = None
-
-        if len(data) >= 2:
-            # ---- MC21 / FTMS Fitness Machine Status (2ADA) format ----
-            # b[0]=0x04 → Playing
-            # b[0]=0x02, b[1]=0x02 → Paused
-            # b[0]=0x02, b[1]=0x01 → Stopped/Idle
-            # b[0]=0x05 → Speed update notification (not a state change)
-            if data[0] == 0x04:
-                status_str = "playing"
-            elif data[0] == 0x02 and data[1] == 0x02:
-                status_str = "stopping/paused"
-            elif data[0] == 0x02 and data[1] == 0x01:
-                status_str = "idle"
-            elif data[0] == 0x05:
-                # Speed notification from MC21 — not a state change, ignore for status
-                # Speed is already read from the 2ACD Treadmill Data notifications
-                _LOGGER.debug("MC21 speed notification: %s (handled by data handler)", hex_data)
-                return
+        _LOGGER.debug("Training Status raw data: %s", data.hex(" ").upper())
+        self.notification_counts["status"] += 1
 
-            # ---- MC11 / Proprietary Training Status (2AD3) format ----
-            # Check for countdown messages
-            elif data[0] == 0x03 and len(data) >= 3 and data[1] == 0x0E:
-                countdown_map = {
-                    0x33: "countdown 3",
-                    0x32: "countdown 2",
-                    0x31: "countdown 1",
-                }
-                status_str = countdown_map.get(data[2], f"mode unknown ({data[2]:02X})")
-                if status_str.startswith("countdown"):
-                    countdown_number = int(status_str.split()[1])
-            # ---- MC11 format (b[0]=0x01) ----
-            # Playing
-            elif data[0] == 0x01 and data[1] == 0x0D:
-                status_str = "playing"
-            # Stopping / Paused
-            elif data[0] == 0x01 and data[1] == 0x0F:
-                status_str = "stopping/paused"
-            # Idle
-            elif data[0] == 0x01 and data[1] == 0x01:
-                status_str = "idle"
-
-            # ---- MC21 2AD3 format (b[0]=0x00) ----
-            # Quick Start / Manual Mode → treat as playing
-            elif data[0] == 0x00 and data[1] == 0x0D:
-                status_str = "playing"
-            # PostWorkout → treat as stopping/paused
-            elif data[0] == 0x00 and data[1] == 0x0F:
-                status_str = "stopping/paused"
-            # Pre-Workout → treat as idle (ready state)
-            elif data[0] == 0x00 and data[1] == 0x0E:
-                status_str = "idle"
-            # Idle
-            elif data[0] == 0x00 and data[1] == 0x01:
-                status_str = "idle"
+        # Repeats, non-state notifications (MC21 0x05 speed) and playing/paused
+        # flaps inside the debounce window never get past the decoder
+        malformed = self.status_decoder.malformed
+        transition = self.status_decoder.feed(data, time.monotonic())
+        if self.status_decoder.malformed != malformed:
+            _LOGGER.debug(
+                "Unrecognised status bytes — treating as unknown. "
+                "Please report this for model support."
+            )
+            self._note_malformed("status", data)
+        if self.status_decoder.pending is not None:
+            self._schedule_status_confirm()
+        if transition is not None:
+            self._apply_status_transition(transition)
 
-            else:
-                _LOGGER.debug(
-                    "Unrecognised status bytes: %s — treating as unknown. "
-                    "Please report this for model support.", hex_data
-                )
-
-        _LOGGER.debug("Training Status update: %s", status_str)
-
-        self.data["training_status_raw"] = status_str
-        self.data["countdown_number"] = countdown_number
-
-        # Determine previous status before overwriting
-        prev_status = self.data.get("training_status")
-
-        # Normalize status for other components
-        if "countdown" in status_str:
-            self.data["training_status"] = "countdown"
-        elif status_str == "playing":
-            self.data["training_status"] = "playing"
-        elif status_str == "stopping/paused":
-            self.data["training_status"] = "paused"
-        elif status_str == "idle":
-            self.data["training_status"] = "idle"
-        else:
-            self.data["training_status"] = "unknown"
+    def _schedule_status_confirm(self) -> None:
+        if self._cancel_status_confirm:
+            self._cancel_status_confirm()
+        delay = max(0.0, self.status_decoder.pending_deadline - time.monotonic())
+        self._cancel_status_confirm = async_call_later(self.hass, delay, self._handle_status_confirm)
 
-        new_status = self.data["training_status"]
+    @profiled
+    @callback
+    def _handle_status_confirm(self, _now) -> None:
+        self._cancel_status_confirm = None
+        transition = self.status_decoder.confirm(time.monotonic())
+        if transition is not None:
+            self._apply_status_transition(transition)
+
+    def _apply_status_transition(self, transition: StatusTransition) -> None:
+        """Write one real status change and run the watch session lifecycle."""
+        new_status, prev_status = transition.status, transition.previous
+        _LOGGER.debug(
+            "Training Status: %s -> %s (after %s s)", prev_status, transition.raw,
+            f"{transition.duration:.1f}" if transition.duration is not None else "?",
+        )
+
+        self.data.apply_status(new_status, transition.raw, transition.countdown)
 
         # Watch session lifecycle — snapshot on first "playing", reset on "idle"
         if self.use_watch:
             if new_status == "playing" and prev_status != "playing":
                 self.start_watch_session()
             elif new_status == "idle" and prev_status not in ("idle", "unknown"):
+                self.calibrate_steps()
                 self.reset_watch_session()
             self.update_watch_data()
 
-        try:
-            self.async_set_updated_data(self.data)
-        except Exception:
-            pass
+        self._dispatch_update()
 
     
     # ------------------------------------------------------------------
     # Watch integration helpers
     # ------------------------------------------------------------------
 
+    def load_options(self, options: dict) -> None:
+        """Apply config entry options. Called on setup and from the options flow."""
+        self.load_watch_entities(options)
+        passive = bool(options.get(CONF_PASSIVE_MODE))
+        switched = passive != self.passive
+        self.passive = passive
+        # Passive mode reconnects on demand, not in the background
+        self.link.auto_reconnect = not self.passive
+        # Before async_start (setup) the start-up path picks the mode up by itself
+        if switched and self._unsub_watchdog is not None:
+            self.hass.async_create_task(self._async_apply_passive_mode())
+        self.fast_speed_writes = bool(options.get(CONF_FAST_SPEED_WRITES))
+        window_ms = options.get(CONF_COALESCE_WINDOW)
+        self.coalesce_window = None if window_ms is None else float(window_ms) / 1000
+        self.watchdog.min_timeout = float(options.get(CONF_STALE_TIMEOUT) or STALE_MIN_TIMEOUT)
+        debounce = options.get(CONF_STATUS_DEBOUNCE)
+        self.status_decoder.debounce = float(DEFAULT_STATUS_DEBOUNCE if debounce is None else debounce)
+        if self.exporter is not None:
+            self.exporter.stop()
+        self.exporter = create_exporter(self.hass, self, options)
+        if self.exporter is not None:
+            self.exporter.start()
+        self.metrics_enabled = bool(options.get(CONF_METRICS))
+        if self.metrics_enabled:
+            async_register_metrics_view(self.hass)
+
     def load_watch_entities(self, options: dict) -> None:
         """Load watch entity IDs from config entry options. Called on setup and reload."""
         from .const import CONF_WATCH_HR_ENTITY, CONF_WATCH_STEPS_ENTITY, CONF_WATCH_CALORIES_ENTITY
         self.watch_hr_entity = options.get(CONF_WATCH_HR_ENTITY)
         self.watch_steps_entity = options.get(CONF_WATCH_STEPS_ENTITY)
         self.watch_calories_entity = options.get(CONF_WATCH_CALORIES_ENTITY)
+        self._set_weight_entity(options.get(CONF_WEIGHT_ENTITY) or self._config_weight_entity)
         _LOGGER.debug(
             "Watch entities loaded — HR: %s  Steps: %s  Calories: %s",
             self.watch_hr_entity, self.watch_steps_entity, self.watch_calories_entity,
         )
 
+    def _set_weight_entity(self, entity_id: str | None) -> None:
+        """Follow the weight entity so the energy model never reads state per packet."""
+        if entity_id == self.weight_entity:
+            return
+        if self._unsub_weight:
+            self._unsub_weight()
+            self._unsub_weight = None
+        self.weight_entity = entity_id
+        if entity_id:
+            self._unsub_weight = async_track_state_change_event(
+                self.hass, [entity_id], self._handle_weight_change
+            )
+        self._refresh_weight()
+
+    @profiled
+    @callback
+    def _handle_weight_change(self, event) -> None:
+        self._refresh_weight()
+
+    def _refresh_weight(self) -> None:
+        weight = None
+        if self.weight_entity:
+            state = self.hass.states.get(self.weight_entity)
+            if state and state.state not in (None, "unknown", "unavailable"):
+                try:
+                    weight = float(str(state.state).replace("kg", "").strip())
+                except (ValueError, TypeError):
+                    weight = None
+        previous = self.energy_estimator.weight
+        if weight is not None and weight > 0:
+            self.energy_estimator.weight = weight
+        elif not self.weight_entity:
+            self.energy_estimator.weight = None
+        # An unavailable scale keeps the last known weight
+        if self.energy_estimator.weight != previous:
+            # Estimated energy appears, disappears or changes rate — re-render it
+            self.data.mark_changed(BODY_MODEL)
+            self.async_update_listeners()
+
     def _get_watch_value(self, entity_id: str | None) -> float | None:
         """Read a numeric state from a HA entity. Returns None if unavailable."""
         if not entity_id:
@@ -497,20 +1074,29 @@ class WalkingPadCoordinator(DataUpdateCoordinator):
         """
         self._watch_steps_snapshot = self._get_watch_value(self.watch_steps_entity)
         self._watch_calories_snapshot = self._get_watch_value(self.watch_calories_entity)
-        # Reset session counters in data dict
-        self.data["watch_session_steps"] = 0
-        self.data["watch_session_calories"] = 0
+        # Reset session counters
+        self.data.apply_watch(0, 0, self.data.watch_heart_rate)
         _LOGGER.info(
             "Watch session started — steps snapshot: %s  calories snapshot: %s",
             self._watch_steps_snapshot, self._watch_calories_snapshot,
         )
 
+    def calibrate_steps(self) -> None:
+        """Calibrate the step model against the watch at the end of a session."""
+        if not self.watch_steps_entity or self._watch_steps_snapshot is None:
+            return
+        self.update_watch_data()
+        if self.step_estimator.calibrate(self.data.watch_session_steps):
+            _LOGGER.info("Step model calibration now %.3f", self.step_estimator.calibration)
+            # The finished session's steps are shown at the new calibration
+            self.data.mark_changed(BODY_MODEL)
+            self._session_store.async_delay_save(self._session_data)
+
     def reset_watch_session(self) -> None:
         """Clear snapshot when session ends, ready for next session."""
         self._watch_steps_snapshot = None
         self._watch_calories_snapshot = None
-        self.data["watch_session_steps"] = 0
-        self.data["watch_session_calories"] = 0
+        self.data.apply_watch(0, 0, self.data.watch_heart_rate)
         _LOGGER.debug("Watch session reset")
 
     def update_watch_data(self) -> None:
@@ -521,29 +1107,18 @@ class WalkingPadCoordinator(DataUpdateCoordinator):
             return
 
         # Heart rate — always live passthrough, no delta needed
-        self.data["watch_heart_rate"] = self._get_watch_value(self.watch_hr_entity)
+        heart_rate = self._get_watch_value(self.watch_hr_entity)
 
         # Steps session delta
+        steps = self.data.watch_session_steps
         current_steps = self._get_watch_value(self.watch_steps_entity)
         if current_steps is not None and self._watch_steps_snapshot is not None:
-            delta = current_steps - self._watch_steps_snapshot
-            self.data["watch_session_steps"] = max(0, delta)
+            steps = max(0, current_steps - self._watch_steps_snapshot)
 
         # Calories session delta
+        calories = self.data.watch_session_calories
         current_calories = self._get_watch_value(self.watch_calories_entity)
         if current_calories is not None and self._watch_calories_snapshot is not None:
-            delta = current_calories - self._watch_calories_snapshot
-            self.data["watch_session_calories"] = max(0, delta)
+            calories = max(0, current_calories - self._watch_calories_snapshot)
 
-    async def _retry_loop(self):
-        """Background loop to retry connection until successful."""
-        while not self.is_connected:
-            _LOGGER.debug("Retry loop: attempting reconnect...")
-            try:
-                await self.async_connect()
-                if self.is_connected:
-                    _LOGGER.info("Successfully connected in retry loop")
-                    break
-            except Exception as e:
-                _LOGGER.debug("Retry loop connection failed: %s", e)
-            await asyncio.sleep(60)
+        self.data.apply_watch(steps, calories, heart_rate)
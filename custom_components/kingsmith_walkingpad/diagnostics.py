@@ -0,0 +1,57 @@
+# diagnostics.py
+"""Diagnostics download for a WalkingPad config entry."""
+import time
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_MAC, DOMAIN
+
+TO_REDACT = {CONF_MAC, "mac"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    telemetry = coordinator.data
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "model": coordinator.model,
+        "profile": coordinator.profile.model,
+        "connected": coordinator.is_connected,
+        "link": {
+            "state": coordinator.link.state,
+            "failures": coordinator.link.failures,
+            "connects": coordinator.link.connects,
+            "connect_failures": coordinator.link.connect_failures,
+            "lost": coordinator.link.lost,
+            "write_timeouts": coordinator.link.write_timeouts,
+        },
+        "notifications": coordinator.notification_counts,
+        "commands": coordinator.command_stats,
+        "passive": coordinator.passive,
+        "capabilities": coordinator.capabilities.as_dict() if coordinator.capabilities else None,
+        "connect_timings": coordinator.connect_timings,
+        "time_to_first_data": coordinator.time_to_first_data,
+        "routing": coordinator.router.as_dict(),
+        "coalescing": {"window": coordinator.coalesce_window, **coordinator.coalesce_stats},
+        "liveness": coordinator.watchdog.as_dict(time.monotonic()),
+        "fast_speed_writes": coordinator.fast_speed_writes,
+        "speed_writes": coordinator.speed_write_stats,
+        "presence": {
+            "present": telemetry.present,
+            "rssi": telemetry.rssi,
+            "machine_available": telemetry.machine_available,
+        },
+        "training_status": telemetry.training_status,
+        "status_decoder": coordinator.status_decoder.as_dict(),
+        "malformed_frames": {
+            **coordinator.malformed_frames,
+            "last": coordinator.last_malformed_frame,
+        },
+        "gap_segments": [segment.as_dict() for segment in coordinator.gap_segments],
+        "exporter": coordinator.exporter.as_dict() if coordinator.exporter else None,
+    }
@@ -0,0 +1,130 @@
+# estimators.py
+"""Per-packet body models fed from treadmill deltas.
+
+Each estimator does constant work per packet and keeps its result cached, so
+the sensors reading it are plain attribute lookups.
+"""
+
+STEP_LENGTH_METERS = 0.7        # fallback step length when no height is configured
+STEP_HEIGHT_RATIO = 0.415       # walking step length / body height at the reference speed
+STEP_REFERENCE_SPEED = 1.34     # m/s (≈ 4.8 km/h) — speed the height ratio holds at
+STEP_SPEED_EXPONENT = 0.42      # step length grows ~ v^0.42 with walking speed
+STEP_MIN_SPEED = 0.5            # m/s — below this the belt is creeping, use the floor length
+CALIBRATION_MIN_STEPS = 200     # a session needs this many steps to calibrate against the watch
+CALIBRATION_WEIGHT = 0.3        # how much one session moves the calibration factor
+CALIBRATION_LIMITS = (0.6, 1.6)
+
+
+class StepEstimator:
+    """Integrates steps from belt distance using a height- and speed-dependent step length.
+
+    When watch steps are available for a session, ``calibrate`` nudges a
+    per-user correction factor towards watch/model, so the watch-off mode
+    converges on what the watch would have counted.
+    """
+
+    __slots__ = (
+        "height", "calibration", "session_steps", "cadence",
+        "_raw_session_steps", "_session_distance", "_length_cache",
+    )
+
+    def __init__(self, height_m: float | None = None, calibration: float = 1.0):
+        self.height = height_m
+        self.calibration = calibration
+        self.session_steps = 0      # calibrated, shown by the Steps sensor
+        self.cadence = 0.0          # steps/min at the current speed
+        self._raw_session_steps = 0.0
+        self._session_distance = 0.0  # belt distance already turned into steps
+        self._length_cache: tuple[float, float] = (-1.0, STEP_LENGTH_METERS)
+
+    def step_length(self, speed_kmh: float) -> float:
+        """Step length in metres for the given belt speed."""
+        if speed_kmh == self._length_cache[0]:
+            return self._length_cache[1]
+        if not self.height:
+            length = STEP_LENGTH_METERS
+        else:
+            speed_ms = max(speed_kmh / 3.6, STEP_MIN_SPEED)
+            length = STEP_HEIGHT_RATIO * self.height * (speed_ms / STEP_REFERENCE_SPEED) ** STEP_SPEED_EXPONENT
+        self._length_cache = (speed_kmh, length)
+        return length
+
+    def add(self, d_distance: float, speed_kmh: float, session_distance: float) -> None:
+        """Account one packet's distance delta at the current speed.
+        ``session_distance`` is the pad's session total; distance we never saw
+        deltas for (e.g. joining a session mid-way) is counted at this speed.
+        """
+        length = self.step_length(speed_kmh)
+        self.cadence = speed_kmh / 3.6 / length * 60 * self.calibration
+        unseen = session_distance - self._session_distance - d_distance
+        if unseen > 0:
+            d_distance += unseen
+        if d_distance <= 0:
+            return
+        self._session_distance += d_distance
+        self._raw_session_steps += d_distance / length
+        self.session_steps = int(self._raw_session_steps * self.calibration)
+
+    def reset_session(self) -> None:
+        self.session_steps = 0
+        self._raw_session_steps = 0.0
+        self._session_distance = 0.0
+
+    def calibrate(self, watch_steps: float | None) -> bool:
+        """Fold a finished session's watch step count into the calibration factor."""
+        if watch_steps is None or self._raw_session_steps < CALIBRATION_MIN_STEPS:
+            return False
+        ratio = watch_steps / self._raw_session_steps
+        low, high = CALIBRATION_LIMITS
+        ratio = min(high, max(low, ratio))
+        self.calibration += (ratio - self.calibration) * CALIBRATION_WEIGHT
+        self.session_steps = int(self._raw_session_steps * self.calibration)
+        return True
+
+
+# ACSM metabolic equations (ml O2 / kg / min), speed in m/min, grade as a fraction
+ACSM_RESTING_VO2 = 3.5
+ACSM_WALKING_HORIZONTAL = 0.1
+ACSM_WALKING_VERTICAL = 1.8
+ACSM_RUNNING_HORIZONTAL = 0.2
+ACSM_RUNNING_VERTICAL = 0.9
+ACSM_RUNNING_THRESHOLD = 134.0  # m/min (≈ 8 km/h) — above this use the running equation
+KCAL_PER_LITRE_O2 = 5.0
+
+
+class EnergyEstimator:
+    """Integrates gross energy expenditure per packet with the ACSM walking/running equations.
+
+    Needs a body weight; without one ``add`` returns 0 and the caller keeps
+    using the pad's own energy counter.
+    """
+
+    __slots__ = ("weight", "session_energy", "rate")
+
+    def __init__(self, weight_kg: float | None = None):
+        self.weight = weight_kg
+        self.session_energy = 0.0   # kcal this session
+        self.rate = 0.0             # kcal/min at the current speed and grade
+
+    def kcal_per_minute(self, speed_kmh: float, grade_percent: float = 0.0) -> float:
+        if not self.weight or speed_kmh <= 0:
+            return 0.0
+        speed = speed_kmh * 1000 / 60
+        grade = grade_percent / 100
+        if speed > ACSM_RUNNING_THRESHOLD:
+            vo2 = ACSM_RESTING_VO2 + ACSM_RUNNING_HORIZONTAL * speed + ACSM_RUNNING_VERTICAL * speed * grade
+        else:
+            vo2 = ACSM_RESTING_VO2 + ACSM_WALKING_HORIZONTAL * speed + ACSM_WALKING_VERTICAL * speed * grade
+        return vo2 * self.weight / 1000 * KCAL_PER_LITRE_O2
+
+    def add(self, d_elapsed: float, speed_kmh: float, grade_percent: float = 0.0) -> float:
+        """Account ``d_elapsed`` seconds at the given speed. Returns the kcal added."""
+        self.rate = self.kcal_per_minute(speed_kmh, grade_percent)
+        if d_elapsed <= 0 or not self.rate:
+            return 0.0
+        kcal = self.rate * d_elapsed / 60
+        self.session_energy += kcal
+        return kcal
+
+    def reset_session(self) -> None:
+        self.session_energy = 0.0
@@ -0,0 +1,155 @@
+# export_wire.py
+"""Wire side of the telemetry export — HA-free, see exporter.py for the glue.
+
+Frame encoders, just enough MQTT 3.1.1 to publish QoS 0 frames to one
+broker, a UDP sender and the bounded sample queue that keeps a slow or
+unreachable target from backing up into the notification path.
+
+Frame formats:
+  json    {"mac": ..., "fields": [...], "samples": [[t, speed, distance, elapsed, hr], ...]}
+  binary  b"WP" + version (u8) + count (u16), then per sample
+          t (f64 unix) speed (u16, 0.01 km/h) distance (u32, m) elapsed (u32, s) hr (u8, 0 = none)
+"""
+import asyncio
+import json
+import struct
+from collections import deque
+
+FRAME_FIELDS = ("t", "speed", "distance", "elapsed", "hr")
+BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<2sBH")
+_BINARY_SAMPLE = struct.Struct("<dHIIB")
+
+
+def encode_json(mac: str, samples) -> bytes:
+    return json.dumps(
+        {"mac": mac, "fields": FRAME_FIELDS, "samples": list(samples)},
+        separators=(",", ":"),
+    ).encode()
+
+
+def encode_binary(mac: str, samples) -> bytes:
+    parts = [_BINARY_HEADER.pack(b"WP", BINARY_VERSION, len(samples))]
+    pack = _BINARY_SAMPLE.pack
+    for t, speed, distance, elapsed, hr in samples:
+        parts.append(pack(t, int(round(speed * 100)), int(distance), int(elapsed), int(hr or 0) & 0xFF))
+    return b"".join(parts)
+
+
+ENCODERS = {"json": encode_json, "binary": encode_binary}
+
+BROKER_TIMEOUT = 5.0    # s — connect + CONNACK
+
+
+def _mqtt_length(length: int) -> bytes:
+    """MQTT variable-length "remaining length"."""
+    out = bytearray()
+    while True:
+        byte, length = length & 0x7F, length >> 7
+        out.append(byte | (0x80 if length else 0))
+        if not length:
+            return bytes(out)
+
+
+def _mqtt_string(value: str) -> bytes:
+    raw = value.encode()
+    return len(raw).to_bytes(2, "big") + raw
+
+
+def mqtt_connect_packet(client_id: str) -> bytes:
+    # Protocol "MQTT" level 4 (3.1.1), clean session, keep-alive off
+    body = _mqtt_string("MQTT") + bytes([4, 0x02, 0, 0]) + _mqtt_string(client_id)
+    return b"\x10" + _mqtt_length(len(body)) + body
+
+
+def mqtt_publish_packet(topic: str, payload: bytes) -> bytes:
+    body = _mqtt_string(topic) + payload
+    return b"\x30" + _mqtt_length(len(body)) + body
+
+
+class MqttBrokerClient:
+    """Just enough MQTT to publish QoS 0 frames to one broker."""
+
+    def __init__(self, host: str, port: int, client_id: str):
+        self.host = host
+        self.port = port
+        self.client_id = client_id
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def publish(self, topic: str, payload: bytes) -> None:
+        if self._writer is None or self._writer.is_closing():
+            await self._connect()
+        self._writer.write(mqtt_publish_packet(topic, payload))
+        try:
+            await self._writer.drain()
+        except Exception:
+            self.close()
+            raise
+
+    async def _connect(self) -> None:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), BROKER_TIMEOUT
+        )
+        try:
+            writer.write(mqtt_connect_packet(self.client_id))
+            connack = await asyncio.wait_for(reader.readexactly(4), BROKER_TIMEOUT)
+        except BaseException:
+            writer.close()
+            raise
+        if connack[0] != 0x20 or connack[3] != 0:
+            writer.close()
+            raise ConnectionError(f"MQTT broker refused the connection (code {connack[3]})")
+        self._writer = writer
+
+    def close(self) -> None:
+        if self._writer is not None:
+            if not self._writer.is_closing():
+                self._writer.write(b"\xe0\x00")   # DISCONNECT
+                self._writer.close()
+            self._writer = None
+
+
+class UdpSender:
+    """One datagram per frame to host:port; the endpoint is opened on first use."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._transport: asyncio.DatagramTransport | None = None
+
+    async def send(self, payload: bytes) -> None:
+        if self._transport is None or self._transport.is_closing():
+            self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                asyncio.DatagramProtocol, remote_addr=(self.host, self.port)
+            )
+        self._transport.sendto(payload)
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+class SampleQueue:
+    """Bounded FIFO of samples — when full the oldest sample is dropped and counted."""
+
+    __slots__ = ("maxlen", "dropped", "_samples")
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.dropped = 0
+        self._samples: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def append(self, sample: list) -> None:
+        if len(self._samples) >= self.maxlen:
+            self._samples.popleft()
+            self.dropped += 1
+        self._samples.append(sample)
+
+    def pop_batch(self, size: int) -> list:
+        """Up to ``size`` of the oldest samples."""
+        count = min(len(self._samples), size)
+        return [self._samples.popleft() for _ in range(count)]
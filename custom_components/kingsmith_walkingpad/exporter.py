@@ -0,0 +1,185 @@
+# exporter.py
+"""Optional batched telemetry export to MQTT or a UDP endpoint.
+
+MQTT goes through HA's MQTT integration, or — when a host is set — straight
+to that broker (MQTT 3.1.1, anonymous, QoS 0) so a local broker can be used
+without configuring the integration. UDP sends to host:port.
+
+The exporter hangs off the coordinator's frame listeners (the same hook the
+websocket API uses), queues samples in a bounded deque and ships them as one
+frame per batch — every ``interval`` seconds or every ``batch_size`` samples,
+whichever comes first. A slow or unreachable target never backs up into the
+notification path: when the queue is full the oldest samples are dropped and
+counted.
+
+Encoders, the MQTT / UDP senders and the queue live in export_wire.py.
+"""
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_EXPORT_BATCH_SIZE,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_HOST,
+    CONF_EXPORT_INTERVAL,
+    CONF_EXPORT_PORT,
+    CONF_EXPORT_TARGET,
+    CONF_EXPORT_TOPIC,
+    DOMAIN,
+    EXPORT_DEFAULT_BATCH_SIZE,
+    EXPORT_DEFAULT_INTERVAL,
+    EXPORT_DEFAULT_MQTT_PORT,
+    EXPORT_DEFAULT_PORT,
+    EXPORT_QUEUE_SIZE,
+    EXPORT_TARGET_MQTT,
+    EXPORT_TARGET_UDP,
+)
+from .export_wire import ENCODERS, MqttBrokerClient, SampleQueue, UdpSender, encode_json
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TelemetryExporter:
+    """Batches coordinator frames and sends them to the configured target."""
+
+    def __init__(self, hass, coordinator, options: dict):
+        self.hass = hass
+        self.coordinator = coordinator
+        self.target = options.get(CONF_EXPORT_TARGET)
+        host = options.get(CONF_EXPORT_HOST)
+        default_port = EXPORT_DEFAULT_MQTT_PORT if self.target == EXPORT_TARGET_MQTT else EXPORT_DEFAULT_PORT
+        self.host = host or "127.0.0.1"
+        self.port = int(options.get(CONF_EXPORT_PORT) or default_port)
+        slug = coordinator.mac.replace(":", "").lower()
+        # MQTT with a host → our own broker connection instead of HA's MQTT integration
+        self._broker = (
+            MqttBrokerClient(self.host, self.port, f"{DOMAIN}_{slug}")
+            if self.target == EXPORT_TARGET_MQTT and host else None
+        )
+        self.topic = options.get(CONF_EXPORT_TOPIC) or f"{DOMAIN}/{slug}/telemetry"
+        self.encode = ENCODERS.get(options.get(CONF_EXPORT_FORMAT) or "json", encode_json)
+        self.interval = float(options.get(CONF_EXPORT_INTERVAL) or EXPORT_DEFAULT_INTERVAL)
+        self.batch_size = int(options.get(CONF_EXPORT_BATCH_SIZE) or EXPORT_DEFAULT_BATCH_SIZE)
+
+        self._udp = UdpSender(self.host, self.port) if self.target == EXPORT_TARGET_UDP else None
+        self._queue = SampleQueue(EXPORT_QUEUE_SIZE)
+        self._send_task: asyncio.Task | None = None
+        self._unsub_frames = None
+        self._unsub_timer = None
+        # Counters — exposed in diagnostics
+        self.sent_batches = 0
+        self.sent_samples = 0
+        self.send_errors = 0
+
+    @property
+    def dropped_samples(self) -> int:
+        """Samples pushed out of the full queue plus those in batches that failed to send."""
+        return self._queue.dropped
+
+    def as_dict(self) -> dict:
+        return {
+            "target": self.target,
+            "destination": self.destination,
+            "queued": len(self._queue),
+            "sent_batches": self.sent_batches,
+            "sent_samples": self.sent_samples,
+            "dropped_samples": self.dropped_samples,
+            "send_errors": self.send_errors,
+        }
+
+    @property
+    def destination(self) -> str:
+        if self.target != EXPORT_TARGET_MQTT:
+            return f"{self.host}:{self.port}"
+        broker = f"{self.host}:{self.port}" if self._broker is not None else "HA MQTT"
+        return f"{broker} {self.topic}"
+
+    @callback
+    def start(self) -> None:
+        # Rides along on connections others need — never holds one open in passive mode
+        self._unsub_frames = self.coordinator.async_add_frame_listener(self._handle_frame, keep_alive=False)
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._handle_interval, timedelta(seconds=self.interval)
+        )
+        _LOGGER.info(
+            "Telemetry export to %s started (%s, every %.1fs or %d samples)",
+            self.target, self.destination,
+            self.interval, self.batch_size,
+        )
+
+    @callback
+    def stop(self) -> None:
+        if self._unsub_frames:
+            self._unsub_frames()
+            self._unsub_frames = None
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._send_task and not self._send_task.done():
+            self._send_task.cancel()
+        if self._udp is not None:
+            self._udp.close()
+        if self._broker is not None:
+            self._broker.close()
+        if self.dropped_samples:
+            _LOGGER.info("Telemetry export stopped — %d samples dropped", self.dropped_samples)
+
+    @callback
+    def _handle_frame(self, frame: list) -> None:
+        self._queue.append([round(time.time(), 3), *frame])
+        if len(self._queue) >= self.batch_size:
+            self._schedule_send()
+
+    @callback
+    def _handle_interval(self, _now) -> None:
+        if self._queue:
+            self._schedule_send()
+
+    def _schedule_send(self) -> None:
+        # One send in flight at a time; samples keep queueing (bounded) behind it
+        if self._send_task is None or self._send_task.done():
+            self._send_task = self.hass.async_create_background_task(
+                self._async_send(), f"{DOMAIN} telemetry export"
+            )
+
+    async def _async_send(self) -> None:
+        while self._queue:
+            batch = self._queue.pop_batch(self.batch_size)
+            count = len(batch)
+            payload = self.encode(self.coordinator.mac, batch)
+            try:
+                if self.target == EXPORT_TARGET_MQTT:
+                    await self._async_publish_mqtt(payload)
+                else:
+                    await self._udp.send(payload)
+            except Exception as exc:
+                # The batch is lost; the queue bound keeps memory flat while the target is down
+                self.send_errors += 1
+                self._queue.dropped += count
+                _LOGGER.debug("Telemetry export to %s failed: %s", self.target, exc)
+                return
+            self.sent_batches += 1
+            self.sent_samples += count
+            if len(self._queue) < self.batch_size:
+                return
+
+    async def _async_publish_mqtt(self, payload: bytes) -> None:
+        if self._broker is not None:
+            await self._broker.publish(self.topic, payload)
+            return
+        # No host — HA's MQTT integration, with whatever broker it is configured for
+        from homeassistant.components import mqtt
+
+        await mqtt.async_publish(self.hass, self.topic, payload)
+
+
+def create_exporter(hass, coordinator, options: dict) -> TelemetryExporter | None:
+    """Build the exporter for these options, or None when export is off."""
+    if options.get(CONF_EXPORT_TARGET) not in (EXPORT_TARGET_MQTT, EXPORT_TARGET_UDP):
+        return None
+    return TelemetryExporter(hass, coordinator, options)
@@ -0,0 +1,235 @@
+# link.py
+"""Single owner of the BLE link.
+
+Everything that touches the connection — connect requests from the start-up
+path, the Connect button, passive-mode upgrades and the watchdog, GATT writes
+from the control entities, and bleak's disconnect callback — goes through
+WalkingPadLink's inbox. One task works the inbox in order, so there is never
+more than one connect in flight, a write never sees a half-torn-down client,
+and reconnect backoff lives in one place.
+
+States: disconnected → connecting → subscribing → ready, and backoff between
+failed attempts while auto-reconnect is on.
+"""
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+DISCONNECTED = "disconnected"
+CONNECTING = "connecting"
+SUBSCRIBING = "subscribing"
+READY = "ready"
+BACKOFF = "backoff"
+
+CONNECT_TIMEOUT = 15                    # s for one full connect (resolve → subscribe → discover)
+WRITE_TIMEOUT = 5                       # s for one GATT write — a hung write would block the inbox
+DISCONNECT_TIMEOUT = 5                  # s for a teardown disconnect
+BACKOFF_DELAYS = (1, 5, 15, 30, 60)     # s between automatic attempts, last one repeats
+
+# Inbox message kinds
+_CONNECT = "connect"
+_RECONNECT = "reconnect"
+_DISCONNECT = "disconnect"
+_WRITE = "write"
+_LOST = "lost"
+_RETRY = "retry"
+_STOP = "stop"
+
+
+class LinkNotReady(Exception):
+    """A write was requested while the link isn't ready."""
+
+
+class WalkingPadLink:
+    """Actor owning the BleakClient. ``opener`` runs the connect pipeline."""
+
+    def __init__(self, hass, opener, on_state_change, backoff_delays=BACKOFF_DELAYS):
+        self.hass = hass
+        # async opener(set_state) -> client; calls set_state(SUBSCRIBING, client) once connected
+        self._opener = opener
+        self._on_state_change = on_state_change
+        self.backoff_delays = tuple(backoff_delays)
+        self.state = DISCONNECTED
+        self.client = None
+        self.auto_reconnect = True
+        self.failures = 0           # consecutive failed connect attempts
+        # Lifetime counters — diagnostics and the metrics endpoint
+        self.connects = 0
+        self.connect_failures = 0
+        self.lost = 0
+        self.write_timeouts = 0
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._retry_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == READY and self.client is not None and self.client.is_connected
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(self._run(), "walkingpad link")
+
+    # Requests — safe to call from anywhere on the event loop
+    async def connect(self) -> None:
+        """Bring the link up; returns when ready, raises if the attempt failed."""
+        await self._request(_CONNECT)
+
+    async def reconnect(self) -> None:
+        """Tear the link down and bring it straight back (zombie link recovery)."""
+        await self._request(_RECONNECT)
+
+    async def disconnect(self) -> None:
+        """Tear the link down and stay down until the next connect request."""
+        await self._request(_DISCONNECT)
+
+    async def write(self, uuid: str, data: bytes, response: bool = True) -> None:
+        await self._request(_WRITE, uuid, data, response)
+
+    async def stop(self) -> None:
+        if self._task is None or self._task.done():
+            return
+        await self._request(_STOP)
+        await self._task
+
+    def notify_lost(self, client) -> None:
+        """bleak's disconnected callback — may fire from a teardown we started ourselves."""
+        self._inbox.put_nowait((_LOST, None, client))
+
+    def _request(self, kind: str, *args) -> asyncio.Future:
+        self.start()
+        future = self.hass.loop.create_future()
+        self._inbox.put_nowait((kind, future, *args))
+        return future
+
+    # Actor
+    def _set_state(self, state: str, client=None) -> None:
+        if client is not None:
+            self.client = client
+        if state == self.state:
+            return
+        _LOGGER.debug("Link %s -> %s", self.state, state)
+        self.state = state
+        self._on_state_change(state)
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                kind, future, *args = await self._inbox.get()
+                try:
+                    if kind == _STOP:
+                        self._cancel_retry()
+                        await self._teardown()
+                        _resolve(future)
+                        break
+                    result = await self._handle(kind, args)
+                    _resolve(future, result)
+                except asyncio.CancelledError:
+                    if future is not None and not future.done():
+                        future.set_exception(LinkNotReady(f"{kind} was cancelled"))
+                    task = asyncio.current_task()
+                    if task is not None and task.cancelling():
+                        raise
+                    # Cancelled inside the opener (bleak / the connector), not the actor
+                    # itself — keep working the inbox
+                    _LOGGER.debug("Link %s was cancelled", kind)
+                except Exception as exc:
+                    if future is not None and not future.done():
+                        future.set_exception(exc)
+                    elif kind != _LOST:
+                        _LOGGER.debug("Link %s failed: %s", kind, exc)
+        finally:
+            # Fail anything that was queued behind the stop (or a cancelled actor)
+            while not self._inbox.empty():
+                _, future, *_ = self._inbox.get_nowait()
+                if future is not None and not future.done():
+                    future.set_exception(LinkNotReady("link stopped"))
+
+    async def _handle(self, kind: str, args: list):
+        if kind == _WRITE:
+            uuid, data, response = args
+            if not self.is_ready:
+                raise LinkNotReady(f"link is {self.state}")
+            try:
+                return await asyncio.wait_for(
+                    self.client.write_gatt_char(uuid, data, response=response), timeout=WRITE_TIMEOUT
+                )
+            except asyncio.TimeoutError as exc:
+                # A write that never completes means a dead link — drop it and retry
+                _LOGGER.warning("GATT write timed out after %ss, dropping the link", WRITE_TIMEOUT)
+                self.write_timeouts += 1
+                await self._teardown()
+                self._schedule_retry()
+                raise TimeoutError(f"write timed out after {WRITE_TIMEOUT}s") from exc
+        if kind in (_CONNECT, _RETRY):
+            if self.is_ready:
+                return None
+            return await self._connect(manual=kind == _CONNECT)
+        if kind == _RECONNECT:
+            await self._teardown()
+            return await self._connect(manual=True)
+        if kind == _DISCONNECT:
+            self._cancel_retry()
+            await self._teardown()
+            return None
+        if kind == _LOST:
+            (client,) = args
+            if client is not self.client:
+                return None     # callback from a client we already let go of
+            _LOGGER.warning("WalkingPad link lost")
+            self.lost += 1
+            self.client = None
+            self._set_state(DISCONNECTED)
+            self._schedule_retry()
+        return None
+
+    async def _connect(self, manual: bool) -> None:
+        self._cancel_retry()
+        self._set_state(CONNECTING)
+        try:
+            await asyncio.wait_for(self._opener(self._set_state), timeout=CONNECT_TIMEOUT)
+        except BaseException as exc:
+            await self._teardown()
+            self.failures += 1
+            self.connect_failures += 1
+            self._schedule_retry()
+            if isinstance(exc, asyncio.TimeoutError):
+                raise TimeoutError(f"connect timed out after {CONNECT_TIMEOUT}s") from exc
+            raise
+        self.failures = 0
+        self.connects += 1
+        self._set_state(READY)
+        _LOGGER.info("WalkingPad link ready%s", "" if manual else " (automatic retry)")
+
+    async def _teardown(self) -> None:
+        client, self.client = self.client, None
+        if client is not None and client.is_connected:
+            try:
+                await asyncio.wait_for(client.disconnect(), timeout=DISCONNECT_TIMEOUT)
+                _LOGGER.info("Disconnected from WalkingPad")
+            except Exception as exc:
+                _LOGGER.debug("Error during disconnect: %s", exc)
+        self._set_state(DISCONNECTED)
+
+    def _schedule_retry(self) -> None:
+        if not self.auto_reconnect or self._retry_handle is not None:
+            return
+        delay = self.backoff_delays[min(self.failures, len(self.backoff_delays) - 1)]
+        self._set_state(BACKOFF)
+        _LOGGER.debug("Reconnecting in %ss", delay)
+        self._retry_handle = self.hass.loop.call_later(delay, self._fire_retry)
+
+    def _fire_retry(self) -> None:
+        self._retry_handle = None
+        self._inbox.put_nowait((_RETRY, None))
+
+    def _cancel_retry(self) -> None:
+        if self._retry_handle is not None:
+            self._retry_handle.cancel()
+            self._retry_handle = None
+
+
+def _resolve(future, result=None) -> None:
+    if future is not None and not future.done():
+        future.set_result(result)
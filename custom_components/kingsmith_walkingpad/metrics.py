@@ -0,0 +1,124 @@
+# metrics.py
+"""Optional Prometheus endpoint — GET /api/kingsmith_walkingpad/metrics.
+
+Rendered straight from coordinator state for every pad that has the
+"Prometheus metrics" option on, so a scrape costs a few string formats per
+pad and never touches entities or the state machine. Authenticated like the
+rest of the HA API (long-lived access token as a bearer token).
+"""
+import time
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+DATA_VIEW_REGISTERED = f"{DOMAIN}_metrics_view"
+PREFIX = "walkingpad_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name, type, help, value(coordinator) — None values are left out of the scrape
+METRICS = (
+    ("speed_kmh", "gauge", "Belt speed.", lambda c: c.data.speed),
+    ("distance_meters", "gauge", "Distance in the current session.", lambda c: c.data.distance),
+    ("session_seconds", "gauge", "Elapsed time in the current session.", lambda c: c.data.elapsed_time),
+    ("energy_kcal", "gauge", "Energy in the current session, as reported by the pad.", lambda c: c.data.energy),
+    ("playing", "gauge", "1 while the belt is running.", lambda c: int(c.data.training_status == "playing")),
+    ("connected", "gauge", "1 while the GATT link is ready.", lambda c: int(c.is_connected)),
+    ("link_stale", "gauge", "1 while a connected link delivers no data.", lambda c: int(c.data.link_stale)),
+    ("present", "gauge", "1 while the pad is advertising.", lambda c: int(c.data.present)),
+    ("rssi_dbm", "gauge", "Last advertisement RSSI.", lambda c: c.data.rssi),
+    ("link_connects_total", "counter", "Successful connects.", lambda c: c.link.connects),
+    ("link_connect_failures_total", "counter", "Failed connect attempts.", lambda c: c.link.connect_failures),
+    ("link_lost_total", "counter", "Links dropped by the pad or the adapter.", lambda c: c.link.lost),
+    ("link_stale_seconds_total", "counter", "Time connected links delivered no data.",
+     lambda c: round(c.watchdog.stale_seconds(time.monotonic()), 3)),
+    ("commands_total", "counter", "Start / pause / finish commands acknowledged.", lambda c: c.command_stats["sent"]),
+    ("command_failures_total", "counter", "Commands that failed to write.", lambda c: c.command_stats["failed"]),
+    ("command_last_latency_seconds", "gauge", "Last command round trip time.",
+     lambda c: c.command_stats["last_latency"]),
+    ("speed_writes_total", "counter", "Speed writes sent.", lambda c: c.speed_write_stats["sent"]),
+    ("speed_writes_lost_total", "counter", "Fast speed writes never acknowledged.",
+     lambda c: c.speed_write_stats["lost"]),
+)
+
+# Per-characteristic counters, labelled characteristic="..."
+CHARACTERISTIC_METRICS = (
+    ("notifications_total", "Notifications received.", lambda c: c.notification_counts),
+    ("notifications_dropped_total", "Notifications that failed to decode.", lambda c: c.malformed_frames),
+)
+
+LEDGER_PERIODS = ("daily", "weekly", "monthly", "total")
+
+
+@callback
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the view the first time any pad turns metrics on (views can't be removed)."""
+    if hass.data.get(DATA_VIEW_REGISTERED):
+        return
+    hass.data[DATA_VIEW_REGISTERED] = True
+    hass.http.register_view(WalkingPadMetricsView(hass))
+
+
+class WalkingPadMetricsView(HomeAssistantView):
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:
+        coordinators = [c for c in self.hass.data.get(DOMAIN, {}).values() if c.metrics_enabled]
+        if not coordinators:
+            return web.Response(status=404, text="No WalkingPad has metrics enabled")
+        return web.Response(
+            body=render_metrics(coordinators).encode(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+
+def render_metrics(coordinators: list) -> str:
+    """Prometheus text exposition format, one sample per pad per metric."""
+    labels = {c: f'mac="{c.mac}",name="{_escape(c.device_name or c.mac)}"' for c in coordinators}
+    lines = []
+    for name, kind, help_text, value_fn in METRICS:
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        for coordinator in coordinators:
+            value = value_fn(coordinator)
+            if value is not None:
+                lines.append(f"{PREFIX}{name}{{{labels[coordinator]}}} {value}")
+    for name, help_text, counts_fn in CHARACTERISTIC_METRICS:
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} counter")
+        for coordinator in coordinators:
+            for characteristic, count in counts_fn(coordinator).items():
+                lines.append(
+                    f'{PREFIX}{name}{{{labels[coordinator]},characteristic="{characteristic}"}} {count}'
+                )
+    lines.append(f"# HELP {PREFIX}command_latency_seconds Command round trip time, Request Control included.")
+    lines.append(f"# TYPE {PREFIX}command_latency_seconds summary")
+    for coordinator in coordinators:
+        stats = coordinator.command_stats
+        lines.append(f"{PREFIX}command_latency_seconds_sum{{{labels[coordinator]}}} {round(stats['latency_sum'], 4)}")
+        lines.append(f"{PREFIX}command_latency_seconds_count{{{labels[coordinator]}}} {stats['sent']}")
+    lines.append(f"# HELP {PREFIX}energy_ledger_kcal Energy ledger totals per period.")
+    lines.append(f"# TYPE {PREFIX}energy_ledger_kcal gauge")
+    for coordinator in coordinators:
+        tracker = coordinator.energy_tracker
+        if tracker is None:
+            continue
+        for period in LEDGER_PERIODS:
+            lines.append(
+                f'{PREFIX}energy_ledger_kcal{{{labels[coordinator]},period="{period}"}} '
+                f"{round(getattr(tracker, period), 3)}"
+            )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -2,9 +2,8 @@
 import logging
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.core import callback
-from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN, SPEED_MIN, SPEED_MAX, SPEED_STEP
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,26 +15,21 @@ async def async_setup_entry(hass, entry, async_add_entities):
 
 class WalkingPadSpeedNumber(NumberEntity):
     """Speed control for the WalkingPad treadmill.
-    Shows and sets belt speed in km/h (1.0–12.0, step 0.1).
+    Shows and sets belt speed in km/h within the pad's supported range
+    (2AD4 when the pad reports it, otherwise the per-model table).
     Only active while the treadmill is playing.
     """
 
     _attr_name = "WalkingPad Speed Control"
     _attr_unique_id_suffix = "_speed_control"
     _attr_icon = "mdi:speedometer"
-    _attr_native_step = SPEED_STEP
     _attr_native_unit_of_measurement = "km/h"
     _attr_mode = NumberMode.SLIDER   # renders as a slider with the actual km/h values shown
 
     def __init__(self, coordinator):
         self.coordinator = coordinator
         self._attr_unique_id = f"{coordinator.mac}_speed_control"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     @property
     def native_min_value(self) -> float:
@@ -47,18 +41,25 @@ class WalkingPadSpeedNumber(NumberEntity):
         """Return max speed for this model."""""
         return self.coordinator.speed_max
 
+    @property
+    def native_step(self) -> float:
+        """Return the speed increment the pad accepts."""
+        return self.coordinator.speed_step
+
     @property
     def native_value(self) -> float:
         """Return current speed from treadmill BLE data."""""
-        speed = self.coordinator.data.get("speed", self.coordinator.speed_min)
+        speed = self.coordinator.data.speed
         return max(self.coordinator.speed_min, min(self.coordinator.speed_max, speed))
 
     @property
     def available(self) -> bool:
-        """Only available when treadmill is actively playing."""
+        """Only available when treadmill is actively playing.
+        In passive mode a speed change connects on demand.
+        """
         return (
-            self.coordinator.is_connected
-            and self.coordinator.data.get("training_status") == "playing"
+            (self.coordinator.is_connected or self.coordinator.passive)
+            and self.coordinator.data.training_status == "playing"
         )
 
     async def async_set_native_value(self, value: float) -> None:
@@ -66,7 +67,7 @@ class WalkingPadSpeedNumber(NumberEntity):
         await self.coordinator.send_set_speed(value)
 
     async def async_added_to_hass(self):
-        self.coordinator.async_add_listener(self._handle_update)
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_update))
 
     @callback
     def _handle_update(self):
@@ -2,12 +2,31 @@ import logging
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers import selector
+from .walkingpad_protocol import DEFAULT_STATUS_DEBOUNCE
+from .watchdog import STALE_MIN_TIMEOUT
 from .const import (
     DOMAIN,
     CONF_WEIGHT_ENTITY,
     CONF_WATCH_HR_ENTITY,
     CONF_WATCH_STEPS_ENTITY,
     CONF_WATCH_CALORIES_ENTITY,
+    CONF_PASSIVE_MODE,
+    CONF_STATUS_DEBOUNCE,
+    CONF_FAST_SPEED_WRITES,
+    CONF_STALE_TIMEOUT,
+    CONF_COALESCE_WINDOW,
+    CONF_EXPORT_TARGET,
+    CONF_EXPORT_HOST,
+    CONF_EXPORT_PORT,
+    CONF_EXPORT_TOPIC,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_INTERVAL,
+    CONF_EXPORT_BATCH_SIZE,
+    CONF_METRICS,
+    EXPORT_DEFAULT_BATCH_SIZE,
+    EXPORT_DEFAULT_INTERVAL,
+    EXPORT_TARGET_MQTT,
+    EXPORT_TARGET_UDP,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,11 +39,11 @@ class WalkingPadOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         if user_input is not None:
-            # Strip empty strings — treat them as "not configured"
-            cleaned = {k: v for k, v in user_input.items() if v}
-            # Push new watch entity config into coordinator immediately (no restart needed)
+            # Strip empty strings — treat them as "not configured" (0 / False are real values)
+            cleaned = {k: v for k, v in user_input.items() if v not in (None, "")}
+            # Push new watch / export config into coordinator immediately (no restart needed)
             coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]
-            coordinator.load_watch_entities(cleaned)
+            coordinator.load_options(cleaned)
             return self.async_create_entry(title="", data=cleaned)
 
         options = self.config_entry.options
@@ -58,6 +77,82 @@ class WalkingPadOptionsFlowHandler(config_entries.OptionsFlow):
             ): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain=["sensor"])
             ),
+            # Passive mode — presence from advertisements, connect only for control / live data
+            vol.Optional(
+                CONF_PASSIVE_MODE,
+                default=options.get(CONF_PASSIVE_MODE, False),
+            ): selector.BooleanSelector(),
+            # Speed writes without a GATT response — acks are tracked from the 2AD9 indication
+            vol.Optional(
+                CONF_FAST_SPEED_WRITES,
+                default=options.get(CONF_FAST_SPEED_WRITES, False),
+            ): selector.BooleanSelector(),
+            # Notification silence before a connected link counts as stale and is reconnected
+            vol.Optional(
+                CONF_STALE_TIMEOUT,
+                description={"suggested_value": options.get(CONF_STALE_TIMEOUT, STALE_MIN_TIMEOUT)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=3, max=300, step=1, unit_of_measurement="s")
+            ),
+            # Coalesce bursty notifications — one entity update per window (ms), 0 = per loop tick
+            vol.Optional(
+                CONF_COALESCE_WINDOW,
+                description={"suggested_value": options.get(CONF_COALESCE_WINDOW)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=500, step=10, unit_of_measurement="ms")
+            ),
+            # Playing <-> paused changes shorter than this are treated as flapping
+            vol.Optional(
+                CONF_STATUS_DEBOUNCE,
+                description={"suggested_value": options.get(CONF_STATUS_DEBOUNCE, DEFAULT_STATUS_DEBOUNCE)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=10, step=0.1, unit_of_measurement="s")
+            ),
+            # Telemetry export — batched frames over MQTT or UDP. For MQTT, host/port
+            # name a broker to publish to directly; empty host = HA's MQTT integration
+            vol.Optional(
+                CONF_EXPORT_TARGET,
+                description={"suggested_value": options.get(CONF_EXPORT_TARGET)},
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=[EXPORT_TARGET_MQTT, EXPORT_TARGET_UDP])
+            ),
+            vol.Optional(
+                CONF_EXPORT_HOST,
+                description={"suggested_value": options.get(CONF_EXPORT_HOST)},
+            ): selector.TextSelector(),
+            vol.Optional(
+                CONF_EXPORT_PORT,
+                description={"suggested_value": options.get(CONF_EXPORT_PORT)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=65535, mode=selector.NumberSelectorMode.BOX)
+            ),
+            vol.Optional(
+                CONF_EXPORT_TOPIC,
+                description={"suggested_value": options.get(CONF_EXPORT_TOPIC)},
+            ): selector.TextSelector(),
+            vol.Optional(
+                CONF_EXPORT_FORMAT,
+                description={"suggested_value": options.get(CONF_EXPORT_FORMAT, "json")},
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=["json", "binary"])
+            ),
+            vol.Optional(
+                CONF_EXPORT_INTERVAL,
+                description={"suggested_value": options.get(CONF_EXPORT_INTERVAL, EXPORT_DEFAULT_INTERVAL)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.2, max=60, step=0.1, unit_of_measurement="s")
+            ),
+            vol.Optional(
+                CONF_EXPORT_BATCH_SIZE,
+                description={"suggested_value": options.get(CONF_EXPORT_BATCH_SIZE, EXPORT_DEFAULT_BATCH_SIZE)},
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=500, mode=selector.NumberSelectorMode.BOX)
+            ),
+            # Prometheus text endpoint at /api/kingsmith_walkingpad/metrics
+            vol.Optional(
+                CONF_METRICS,
+                default=options.get(CONF_METRICS, False),
+            ): selector.BooleanSelector(),
         })
 
         return self.async_show_form(step_id="init", data_schema=schema)
@@ -0,0 +1,126 @@
+# profiler.py
+"""On-demand cProfile of the integration's own event-loop callbacks.
+
+Nothing is measured until the ``kingsmith_walkingpad.profile`` service
+attaches a CallbackProfiler to the coordinators. Coordinator entry points
+decorated with ``@profiled`` (notification handlers, coalesced fan-out,
+watchdog / advertisement / weight callbacks) then run under cProfile for the
+sampling window, so the profile holds this integration's work — entity
+listeners, energy tracker and watch reads included — and nothing else on the
+event loop. Detached, the decorator costs one attribute check per call.
+"""
+import cProfile
+import functools
+import io
+import logging
+import pstats
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_DURATION = 300          # s — longest window the service accepts
+PACKET_ENTRY_POINT = "_notification_handler"
+
+
+def profiled(func):
+    """Run a coordinator callback under the attached profiler, if any."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args):
+        profiler = self.profiler
+        if profiler is None:
+            return func(self, *args)
+        return profiler.call(name, func, self, *args)
+
+    return wrapper
+
+
+class CallbackProfiler:
+    """One sampling window shared by every coordinator it is attached to."""
+
+    __slots__ = ("profile", "calls", "error", "_depth")
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.calls: dict[str, int] = {}     # entry point → calls seen
+        self.error: str | None = None       # why profiling was given up for this window
+        self._depth = 0
+
+    def call(self, name: str, func, *args):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self._depth or self.error is not None:
+            # Entry point called from another one — already inside the profile
+            return func(*args)
+        try:
+            self.profile.enable()
+        except ValueError as exc:
+            # Another profiler owns the interpreter (Python 3.12+) — the callback
+            # must still run, so give up on this window instead
+            self.error = str(exc)
+            _LOGGER.warning("Profiling disabled for this window: %s", exc)
+            return func(*args)
+        self._depth += 1
+        try:
+            return func(*args)
+        finally:
+            self.profile.disable()
+            self._depth -= 1
+
+    @property
+    def packets(self) -> int:
+        return self.calls.get(PACKET_ENTRY_POINT, 0)
+
+    def write(self, path_base: str, top: int) -> dict:
+        """Write ``<path_base>.pstats`` and a text report; return the per-packet summary.
+        Blocking — run it in the executor once the profiler is detached.
+        Nothing is written when the window profiled no callbacks.
+        """
+        self.profile.create_stats()
+        if self.error is not None or not self.profile.stats:
+            return self.empty_summary()
+        stats = pstats.Stats(self.profile)
+        stats.dump_stats(f"{path_base}.pstats")
+        summary = self.summary(stats, top)
+
+        report = io.StringIO()
+        report.write(
+            f"{self.packets} packets, {summary['total_ms']} ms profiled, "
+            f"{summary['per_packet_us']} µs per packet\n"
+            f"entry points: {self.calls}\n\n"
+        )
+        pstats.Stats(self.profile, stream=report).sort_stats("tottime").print_stats(top)
+        with open(f"{path_base}.txt", "w", encoding="utf-8") as file:
+            file.write(report.getvalue())
+        summary["files"] = [f"{path_base}.pstats", f"{path_base}.txt"]
+        return summary
+
+    def empty_summary(self) -> dict:
+        return {
+            "packets": self.packets,
+            "calls": dict(self.calls),
+            "total_ms": 0.0,
+            "per_packet_us": 0.0,
+            "top": [],
+            "files": [],
+            "error": self.error or "no samples",
+        }
+
+    def summary(self, stats: pstats.Stats, top: int) -> dict:
+        packets = self.packets
+        per_packet = 1e6 / packets if packets else 0.0
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        return {
+            "packets": packets,
+            "calls": dict(self.calls),
+            "total_ms": round(stats.total_tt * 1000, 3),
+            "per_packet_us": round(stats.total_tt * per_packet, 2),
+            "top": [
+                {
+                    "function": pstats.func_std_string(func),
+                    "calls": calls,
+                    "self_us_per_packet": round(self_time * per_packet, 2),
+                    "cumulative_us_per_packet": round(cumulative * per_packet, 2),
+                }
+                for func, (_, calls, self_time, cumulative, _) in rows
+            ],
+        }
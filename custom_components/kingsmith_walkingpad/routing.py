@@ -0,0 +1,138 @@
+# routing.py
+"""Pick which Bluetooth source (local adapter or proxy) to connect through.
+
+HA may see a pad through several connectable scanners — the local adapter and
+any number of ESPHome proxies. ConnectionRouter keeps per-source RSSI and
+connect outcomes and ranks the candidates HA reports, so the coordinator tries
+the strongest source with a good track record first and moves on to the next
+one after repeated failures instead of hammering a marginal link.
+
+AdapterLimiter caps how many pads talk through one source at a time — the
+fleet services fan commands out under it, since proxies only have a few
+connection slots.
+"""
+import asyncio
+import time
+
+FAILOVER_AFTER = 2          # consecutive failures before a source goes to the back of the queue
+FAILURE_PENALTY_DB = 10     # ranking penalty per consecutive failure
+SUCCESS_BONUS_DB = 10       # ranking bonus at a 100 % success rate
+RSSI_UNKNOWN = -100
+DEFAULT_SOURCE = "default"  # pads that haven't connected through a known source yet
+
+
+class SourceStats:
+    """Connect history and last RSSI for one scanner source."""
+
+    __slots__ = (
+        "source", "rssi", "attempts", "successes", "failures", "timeouts",
+        "consecutive_failures", "last_connect_time", "last_attempt",
+    )
+
+    def __init__(self, source: str):
+        self.source = source
+        self.rssi: int | None = None
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.consecutive_failures = 0
+        self.last_connect_time: float | None = None
+        self.last_attempt: float | None = None
+
+    @property
+    def success_rate(self) -> float | None:
+        return self.successes / self.attempts if self.attempts else None
+
+    def score(self, rssi: int | None) -> float:
+        """Higher is better: RSSI in dB, nudged by connect history."""
+        score = float(rssi if rssi is not None else RSSI_UNKNOWN)
+        rate = self.success_rate
+        if rate is not None:
+            score += SUCCESS_BONUS_DB * rate
+        return score - FAILURE_PENALTY_DB * self.consecutive_failures
+
+    def as_dict(self) -> dict:
+        return {
+            "rssi": self.rssi,
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "consecutive_failures": self.consecutive_failures,
+            "success_rate": self.success_rate,
+            "last_connect_time": self.last_connect_time,
+        }
+
+
+class ConnectionRouter:
+    """Ranks scanner sources for a pad and records how connecting through them went."""
+
+    def __init__(self):
+        self.sources: dict[str, SourceStats] = {}
+        self.current_source: str | None = None
+        self.failovers = 0
+
+    def _stats(self, source: str) -> SourceStats:
+        stats = self.sources.get(source)
+        if stats is None:
+            stats = self.sources[source] = SourceStats(source)
+        return stats
+
+    def update_rssi(self, source: str, rssi: int | None) -> None:
+        self._stats(source).rssi = rssi
+
+    def rank(self, candidates: list[tuple[str, int | None]]) -> list[str]:
+        """Order (source, rssi) candidates best first; sources failing repeatedly go last."""
+        scored = []
+        for source, rssi in candidates:
+            stats = self._stats(source)
+            if rssi is not None:
+                stats.rssi = rssi
+            demoted = stats.consecutive_failures >= FAILOVER_AFTER
+            scored.append((demoted, -stats.score(rssi), source))
+        scored.sort()
+        return [source for _, _, source in scored]
+
+    def record_attempt(self, source: str) -> None:
+        stats = self._stats(source)
+        stats.attempts += 1
+        stats.last_attempt = time.monotonic()
+        if self.current_source is not None and source != self.current_source:
+            self.failovers += 1
+        self.current_source = source
+
+    def record_success(self, source: str, duration: float) -> None:
+        stats = self._stats(source)
+        stats.successes += 1
+        stats.consecutive_failures = 0
+        stats.last_connect_time = duration
+
+    def record_failure(self, source: str, timeout: bool = False) -> None:
+        stats = self._stats(source)
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        if timeout:
+            stats.timeouts += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "current_source": self.current_source,
+            "failovers": self.failovers,
+            "sources": {source: stats.as_dict() for source, stats in self.sources.items()},
+        }
+
+
+class AdapterLimiter:
+    """One semaphore per scanner source, created on first use."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def slot(self, source: str | None) -> asyncio.Semaphore:
+        source = source or DEFAULT_SOURCE
+        semaphore = self._semaphores.get(source)
+        if semaphore is None:
+            semaphore = self._semaphores[source] = asyncio.Semaphore(self.limit)
+        return semaphore
@@ -1,10 +1,15 @@
-import math
-from homeassistant.components.sensor import SensorEntity, RestoreEntity
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, RestoreEntity
+from homeassistant.const import EntityCategory
 from homeassistant.core import callback
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.event import async_track_state_change_event, async_track_time_change
 
 from .const import DOMAIN, CONF_HEIGHT, CONF_WEIGHT_ENTITY, CONF_WATCH_HR_ENTITY
+from . import telemetry
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
@@ -12,26 +17,25 @@ async def async_setup_entry(hass, entry, async_add_entities):
     height = float(raw_height) / 100 if raw_height else None
     weight_entity_id = entry.data.get(CONF_WEIGHT_ENTITY)
 
-    tracker = WalkingPadEnergyTracker(hass, coordinator.mac, coordinator.async_set_updated_data)
-
+    tracker = WalkingPadEnergyTracker(
+        hass, coordinator.mac, lambda: coordinator.async_set_updated_data(coordinator.data)
+    )
+    # The coordinator feeds per-packet energy deltas (including reconstructed gaps) into the ledger
+    coordinator.energy_tracker = tracker
 
     sensors = [
-        WalkingPadSensor(coordinator, "speed", "Speed", "km/h", "mdi:run"),
-        WalkingPadSensor(coordinator, "distance", "Distance", "m", "mdi:map-marker-distance"),
-        WalkingPadEnergySensor(coordinator, "energy", "Energy", "kcal", "mdi:fire"),
-        WalkingPadStepsSensor(coordinator, "steps", "Steps", "steps"),
-        WalkingPadEnergyAggregateSensor(coordinator, tracker, "daily", "Daily Energy"),
-        WalkingPadEnergyAggregateSensor(coordinator, tracker, "weekly", "Weekly Energy"),
-        WalkingPadEnergyAggregateSensor(coordinator, tracker, "monthly", "Monthly Energy"),
-        WalkingPadEnergyAggregateSensor(coordinator, tracker, "total", "Total Energy"),
+        WalkingPadSensor(coordinator, description)
+        for description in SENSOR_DESCRIPTIONS
     ]
+    sensors.extend(
+        WalkingPadEnergyAggregateSensor(coordinator, tracker, description)
+        for description in ENERGY_AGGREGATE_DESCRIPTIONS
+    )
     if height:
         bmi_sensor = WalkingPadBmiSensor(coordinator, height, weight_entity_id)
         sensors.append(bmi_sensor)
         sensors.append(WalkingPadBmiRatingSensor(coordinator, bmi_sensor))
 
-    sensors.append(WalkingPadElapsedTimeSensor(coordinator))
-
     # Heart rate sensor — only created when a watch HR entity is configured
     watch_hr_entity_id = entry.options.get(CONF_WATCH_HR_ENTITY) or entry.data.get(CONF_WATCH_HR_ENTITY)
     if watch_hr_entity_id:
@@ -40,41 +44,180 @@ async def async_setup_entry(hass, entry, async_add_entities):
     async_add_entities(sensors)
 
 
-STEP_LENGTH_METERS = 0.7  # average adult walking step length in meters
+def _energy_value(coordinator):
+    # When watch mode is active, return session delta from watch
+    if coordinator.use_watch and coordinator.watch_calories_entity:
+        return round(coordinator.data.watch_session_calories, 1)
+    # Default: raw energy from treadmill BLE
+    return coordinator.data.energy
+
+
+def _steps_value(coordinator):
+    # When watch mode is active, return session delta from watch
+    if coordinator.use_watch and coordinator.watch_steps_entity:
+        return int(coordinator.data.watch_session_steps)
+    # Default: step model integrated per packet (height, speed, watch calibration)
+    return coordinator.step_estimator.session_steps
+
+
+def _elapsed_value(coordinator):
+    """Format elapsed seconds as HH:MM:SS."""
+    seconds = coordinator.data.elapsed_time
+    if seconds is None:
+        return None
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours:02}:{minutes:02}:{secs:02}"
+
+
+@dataclass(frozen=True, kw_only=True)
+class WalkingPadSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor whose value is read straight from the coordinator."""
+
+    value_fn: Callable[[Any], Any]
+    # Telemetry field indices the value depends on; state is only written
+    # when one of them changed since the last write
+    fields: tuple[int, ...] = ()
+    # Live treadmill values — unavailable while the watchdog calls the link stale
+    live: bool = False
+
+
+# Adding a new treadmill field is one row here — unique_id is "<mac>_<key>"
+SENSOR_DESCRIPTIONS: tuple[WalkingPadSensorEntityDescription, ...] = (
+    WalkingPadSensorEntityDescription(
+        key="speed",
+        name="WalkingPad Speed",
+        native_unit_of_measurement="km/h",
+        icon="mdi:run",
+        value_fn=lambda coordinator: coordinator.data.speed,
+        fields=(telemetry.SPEED,),
+        live=True,
+    ),
+    WalkingPadSensorEntityDescription(
+        key="distance",
+        name="WalkingPad Distance",
+        native_unit_of_measurement="m",
+        icon="mdi:map-marker-distance",
+        value_fn=lambda coordinator: coordinator.data.distance,
+        fields=(telemetry.DISTANCE,),
+        live=True,
+    ),
+    WalkingPadSensorEntityDescription(
+        key="energy",
+        name="WalkingPad Energy",
+        native_unit_of_measurement="kcal",
+        icon="mdi:fire",
+        value_fn=_energy_value,
+        fields=(telemetry.ENERGY, telemetry.WATCH_CALORIES),
+        live=True,
+    ),
+    WalkingPadSensorEntityDescription(
+        key="energy_estimated",
+        name="WalkingPad Estimated Energy",
+        native_unit_of_measurement="kcal",
+        icon="mdi:fire-circle",
+        # ACSM model — only meaningful once a weight entity is configured
+        value_fn=lambda coordinator: (
+            coordinator.data.estimated_energy if coordinator.energy_estimator.weight else None
+        ),
+        fields=(telemetry.ESTIMATED_ENERGY, telemetry.BODY_MODEL),
+    ),
+    WalkingPadSensorEntityDescription(
+        key="steps",
+        name="WalkingPad Steps",
+        native_unit_of_measurement="steps",
+        icon="mdi:walk",
+        value_fn=_steps_value,
+        fields=(telemetry.DISTANCE, telemetry.WATCH_STEPS, telemetry.BODY_MODEL),
+    ),
+    WalkingPadSensorEntityDescription(
+        key="elapsed_time_formatted",
+        name="WalkingPad Elapsed Time",
+        icon="mdi:timer",
+        value_fn=_elapsed_value,
+        fields=(telemetry.ELAPSED_TIME,),
+        live=True,
+    ),
+    WalkingPadSensorEntityDescription(
+        key="link_stale_time",
+        name="WalkingPad Link Stale Time",
+        native_unit_of_measurement="s",
+        icon="mdi:bluetooth-off",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        # Total time "connected" links delivered no data, updated on stale/recovered
+        value_fn=lambda coordinator: coordinator.watchdog.stale_seconds(time.monotonic()),
+        fields=(telemetry.LINK,),
+    ),
+)
+
+# Energy ledger periods — key is the WalkingPadEnergyTracker attribute name
+ENERGY_AGGREGATE_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="daily",
+        name="WalkingPad Daily Energy",
+        native_unit_of_measurement="kcal",
+        icon="mdi:calendar-today",
+    ),
+    SensorEntityDescription(
+        key="weekly",
+        name="WalkingPad Weekly Energy",
+        native_unit_of_measurement="kcal",
+        icon="mdi:calendar-week",
+    ),
+    SensorEntityDescription(
+        key="monthly",
+        name="WalkingPad Monthly Energy",
+        native_unit_of_measurement="kcal",
+        icon="mdi:calendar-month",
+    ),
+    SensorEntityDescription(
+        key="total",
+        name="WalkingPad Total Energy",
+        native_unit_of_measurement="kcal",
+        icon="mdi:counter",
+    ),
+)
 
 
-class WalkingPadElapsedTimeSensor(SensorEntity):
-    """Sensor to display elapsed time as HH:MM:SS."""
+class WalkingPadSensor(SensorEntity):
+    """Coordinator-backed sensor driven entirely by its entity description."""
+
+    entity_description: WalkingPadSensorEntityDescription
+    _attr_should_poll = False
 
-    def __init__(self, coordinator):
+    def __init__(self, coordinator, description: WalkingPadSensorEntityDescription):
         self.coordinator = coordinator
-        self._attr_name = "WalkingPad Elapsed Time"
-        self._attr_unique_id = f"{coordinator.mac}_elapsed_time_formatted"
-        self._attr_native_unit_of_measurement = None
-        self._attr_icon = "mdi:timer"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model
-        )
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.mac}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+        self._written_version = -1
 
     @property
-    def native_value(self):
-        seconds = self.coordinator.data.get("elapsed_time", 0)
-        if seconds is None:
-            return None
-        hours, remainder = divmod(int(seconds), 3600)
-        minutes, secs = divmod(remainder, 60)
-        return f"{hours:02}:{minutes:02}:{secs:02}"
+    def available(self) -> bool:
+        return not (self.entity_description.live and self.coordinator.data.link_stale)
 
-    async def async_added_to_hass(self):
-        self.coordinator.async_add_listener(self._handle_coordinator_update)
+    @property
+    def native_value(self):
+        return self.entity_description.value_fn(self.coordinator)
 
     @callback
     def _handle_coordinator_update(self):
+        data = self.coordinator.data
+        description = self.entity_description
+        fields = description.fields
+        written = self._written_version
+        if fields and written >= 0 and not any(
+            data.changed_since(index, written) for index in fields
+        ) and not (description.live and data.changed_since(telemetry.LINK, written)):
+            return
+        self._written_version = data.version
         self.async_write_ha_state()
 
+    async def async_added_to_hass(self):
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+
 
 class WalkingPadBmiSensor(SensorEntity):
     """Calculate BMI from height and linked weight entity."""
@@ -88,12 +231,7 @@ class WalkingPadBmiSensor(SensorEntity):
         self._attr_unique_id = f"{coordinator.mac}_bmi"
         self._attr_native_unit_of_measurement = "kg/m²"
         self._attr_icon = "mdi:human-male-height"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model
-        )
+        self._attr_device_info = coordinator.device_info
         self._state = None
 
     @property
@@ -102,11 +240,15 @@ class WalkingPadBmiSensor(SensorEntity):
 
     async def async_added_to_hass(self):
         """Register for updates from both treadmill and weight sensor."""
-        self.coordinator.async_add_listener(self._handle_coordinator_update)
-        async_track_state_change_event(
-            self.hass,
-            [self.weight_entity_id],
-            self._handle_weight_update
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self.weight_entity_id],
+                self._handle_weight_update
+            )
         )
         self._recalculate_bmi()
         self.async_write_ha_state()
@@ -148,12 +290,7 @@ class WalkingPadBmiRatingSensor(SensorEntity):
         self._attr_name = "WalkingPad BMI Rating"
         self._attr_unique_id = f"{coordinator.mac}_bmi_rating"
         self._attr_icon = "mdi:tag-text-outline"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model
-        )
+        self._attr_device_info = coordinator.device_info
         self._state = None
 
     @property
@@ -161,12 +298,14 @@ class WalkingPadBmiRatingSensor(SensorEntity):
         return self._state
 
     async def async_added_to_hass(self):
-        self.coordinator.async_add_listener(self._handle_update)
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_update))
         # self.hass.bus.async_listen("state_changed", self._handle_update_event)
-        async_track_state_change_event(
-            self.hass,
-            [self.bmi_sensor.entity_id],
-            lambda event: self._update_rating() or self.async_write_ha_state()
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self.bmi_sensor.entity_id],
+                lambda event: self._update_rating() or self.async_write_ha_state()
+            )
         )
         self._update_rating()
         self.async_write_ha_state()
@@ -202,80 +341,6 @@ class WalkingPadBmiRatingSensor(SensorEntity):
             self._state = "Obese (Class III)"
 
 
-class WalkingPadSensor(SensorEntity):
-    ICON_MAP = {
-        "speed": "mdi:run",
-        "distance": "mdi:map-marker-distance",
-        "energy": "mdi:fire",
-    }
-
-    def __init__(self, coordinator, key, name, unit, icon):
-        self.coordinator = coordinator
-        self._attr_name = f"WalkingPad {name}"
-        self._attr_unique_id = f"{coordinator.mac}_{key}"
-        self._key = key
-        self._attr_native_unit_of_measurement = unit
-        self._attr_icon = self.ICON_MAP.get(key, "mdi:gauge")
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model
-        )
-
-    @property
-    def native_value(self):
-        return self.coordinator.data.get(self._key)
-
-    async def async_update(self):
-        pass
-
-    @callback
-    def _handle_coordinator_update(self):
-        self.async_write_ha_state()
-
-    async def async_added_to_hass(self):
-        self.coordinator.async_add_listener(self._handle_coordinator_update)
-
-
-class WalkingPadStepsSensor(SensorEntity):
-    """Sensor to calculate steps from distance."""
-
-    def __init__(self, coordinator, key, name, unit):
-        self.coordinator = coordinator
-        self._attr_name = f"WalkingPad {name}"
-        self._attr_unique_id = f"{coordinator.mac}_{key}"
-        self._attr_native_unit_of_measurement = unit
-        self._attr_icon = "mdi:walk"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model
-        )
-
-    @property
-    def native_value(self):
-        # When watch mode is active, return session delta from watch
-        if self.coordinator.use_watch and self.coordinator.watch_steps_entity:
-            return int(self.coordinator.data.get("watch_session_steps", 0))
-        # Default: calculate from treadmill distance
-        distance_m = self.coordinator.data.get("distance", 0)
-        if distance_m is None:
-            return None
-        return math.floor(distance_m / STEP_LENGTH_METERS)
-
-    async def async_update(self):
-        pass
-
-    @callback
-    def _handle_coordinator_update(self):
-        self.async_write_ha_state()
-
-    async def async_added_to_hass(self):
-        self.coordinator.async_add_listener(self._handle_coordinator_update)
-
-
 class WalkingPadEnergyTracker:
     """Tracks and accumulates energy, supports daily/weekly/monthly resets and persistence."""
 
@@ -284,19 +349,25 @@ class WalkingPadEnergyTracker:
         self.device_mac = device_mac
         self._update_callback = update_callback
 
-        # Initialize stored values and last known energy reading
+        # Initialize stored values
         self.daily = 0.0
         self.weekly = 0.0
         self.monthly = 0.0
         self.total = 0.0
-        self._last_energy = None
 
-        # Setup resets at midnight / weekly / monthly
-        async_track_time_change(hass, self._reset_daily, hour=0, minute=0, second=0)
-        async_track_time_change(hass, self._reset_weekly_if_monday, hour=0, minute=0, second=0)
-        async_track_time_change(hass, self._reset_monthly_if_first_day, hour=0, minute=0, second=0)
+        # Setup resets at midnight / weekly / monthly — released again by async_stop()
+        self._unsub_resets = [
+            async_track_time_change(hass, self._reset_daily, hour=0, minute=0, second=0),
+            async_track_time_change(hass, self._reset_weekly_if_monday, hour=0, minute=0, second=0),
+            async_track_time_change(hass, self._reset_monthly_if_first_day, hour=0, minute=0, second=0),
+        ]
 
-        
+    @callback
+    def async_stop(self):
+        """Cancel the reset timers. Called when the config entry unloads."""
+        for unsub in self._unsub_resets:
+            unsub()
+        self._unsub_resets = []
 
     @callback
     def _reset_daily(self, now):
@@ -326,59 +397,31 @@ class WalkingPadEnergyTracker:
         self._update_callback()
 
 
-    def add_energy(self, current_energy):
-        """Add the difference (delta) between current and last reading to counters."""
-        if current_energy is None:
-            return
-
-        try:
-            current_energy = float(current_energy)
-        except Exception:
-            return
-
-        if self._last_energy is None:
-            # First reading, just set last_energy without adding
-            self._last_energy = current_energy
+    def add_energy_delta(self, delta):
+        """Add an energy delta to all counters.
+        The coordinator derives deltas from the device's session counters, so
+        device resets and gaps (HA restart, BLE outage) are already accounted for.
+        """
+        if not delta or delta < 0:
             return
-
-        delta = current_energy - self._last_energy
-        # Sometimes device resets energy count, delta may be negative
-        if delta < 0:
-            delta = current_energy  # assume restart, count full current
-
         self.daily += delta
         self.weekly += delta
         self.monthly += delta
         self.total += delta
 
-        self._last_energy = current_energy
-
 
 class WalkingPadEnergyAggregateSensor(RestoreEntity, SensorEntity):
     """Aggregated energy sensor for daily, weekly, monthly, total."""
 
-    ICON_MAP = {
-        "daily": "mdi:calendar-today",
-        "weekly": "mdi:calendar-week",
-        "monthly": "mdi:calendar-month",
-        "total": "mdi:counter",
-    }
+    _attr_should_poll = False
 
-    def __init__(self, coordinator, tracker, key, name):
+    def __init__(self, coordinator, tracker, description: SensorEntityDescription):
         self.coordinator = coordinator
         self.tracker = tracker
-        self.key = key  # 'daily', 'weekly', 'monthly', or 'total'
-        self._attr_name = f"WalkingPad {name}"
-        self._attr_unique_id = f"{coordinator.mac}_energy_{key}"
-        self._attr_native_unit_of_measurement = "kcal"
-        self._attr_icon = self.ICON_MAP.get(key, "mdi:fire")
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model
-        )
-        self._state = None
+        self.entity_description = description
+        self.key = description.key  # 'daily', 'weekly', 'monthly', or 'total'
+        self._attr_unique_id = f"{coordinator.mac}_energy_{self.key}"
+        self._attr_device_info = coordinator.device_info
 
     @property
     def native_value(self):
@@ -393,27 +436,13 @@ class WalkingPadEnergyAggregateSensor(RestoreEntity, SensorEntity):
             except ValueError:
                 pass
 
-        self.coordinator.async_add_listener(self._handle_update)
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_update))
 
     @callback
     def _handle_update(self):
-        energy = self.coordinator.data.get("energy")
-        self.tracker.add_energy(energy)
         self.async_write_ha_state()
 
 
-class WalkingPadEnergySensor(WalkingPadSensor):
-    """Energy sensor that switches source between treadmill BLE and watch when use_watch is on."""
-
-    @property
-    def native_value(self):
-        # When watch mode is active, return session delta from watch
-        if self.coordinator.use_watch and self.coordinator.watch_calories_entity:
-            return round(self.coordinator.data.get("watch_session_calories", 0), 1)
-        # Default: raw energy from treadmill BLE
-        return self.coordinator.data.get(self._key)
-
-
 class WalkingPadHeartRateSensor(SensorEntity):
     """Live heart rate from a linked watch entity. Only created when HR entity is configured."""
 
@@ -425,12 +454,7 @@ class WalkingPadHeartRateSensor(SensorEntity):
         self._attr_unique_id = f"{coordinator.mac}_heart_rate"
         self._attr_native_unit_of_measurement = "bpm"
         self._attr_icon = "mdi:heart-pulse"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model,
-        )
+        self._attr_device_info = coordinator.device_info
         self._state = None
 
     @property
@@ -449,11 +473,15 @@ class WalkingPadHeartRateSensor(SensorEntity):
 
     async def async_added_to_hass(self):
         # Update when coordinator pushes data AND when the HR entity itself changes
-        self.coordinator.async_add_listener(self._handle_coordinator_update)
-        async_track_state_change_event(
-            self.hass,
-            [self._hr_entity_id],
-            self._handle_hr_update,
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [self._hr_entity_id],
+                self._handle_hr_update,
+            )
         )
         self._refresh()
         self.async_write_ha_state()
@@ -0,0 +1,189 @@
+# services.py
+"""Domain services.
+
+``kingsmith_walkingpad.profile`` — cProfile the integration's own callbacks
+for a few seconds on a live system (see profiler.py). Nothing is profiled
+until it is called, only one window runs at a time, and the results go to
+``<config>/kingsmith_walkingpad_profile_<time>.pstats`` / ``.txt`` plus a
+per-packet summary returned as the service response.
+
+``kingsmith_walkingpad.start`` / ``pause`` / ``finish`` / ``set_speed`` — one
+command to every targeted pad at once. Pads run concurrently, at most
+``max_per_adapter`` at a time on each Bluetooth adapter / proxy (the source
+the link last connected through), so a group start costs about one command
+round trip instead of one per pad. The response has per-pad success and
+latency.
+"""
+import asyncio
+import logging
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import DOMAIN, FLEET_MAX_PER_ADAPTER
+from .profiler import MAX_DURATION, CallbackProfiler
+from .routing import DEFAULT_SOURCE, AdapterLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+ATTR_DEVICE_ID = "device_id"
+ATTR_DURATION = "duration"
+ATTR_TOP = "top"
+ATTR_SPEED = "speed"
+ATTR_MAX_PER_ADAPTER = "max_per_adapter"
+
+SERVICE_START = "start"
+SERVICE_PAUSE = "pause"
+SERVICE_FINISH = "finish"
+SERVICE_SET_SPEED = "set_speed"
+
+# service → coroutine sending it to one coordinator; each returns True on success
+FLEET_COMMANDS = {
+    SERVICE_START: lambda coordinator, data: coordinator.send_start(),
+    SERVICE_PAUSE: lambda coordinator, data: coordinator.send_pause(),
+    SERVICE_FINISH: lambda coordinator, data: coordinator.send_finish(),
+    SERVICE_SET_SPEED: lambda coordinator, data: coordinator.send_set_speed(data[ATTR_SPEED]),
+}
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DURATION, default=30): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_DURATION)
+        ),
+        vol.Optional(ATTR_TOP, default=15): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+FLEET_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MAX_PER_ADAPTER, default=FLEET_MAX_PER_ADAPTER): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+    }
+)
+SET_SPEED_SCHEMA = FLEET_SCHEMA.extend(
+    {vol.Required(ATTR_SPEED): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=20))}
+)
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    async def _async_profile(call: ServiceCall) -> ServiceResponse:
+        return await async_profile(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_fleet_command(call: ServiceCall) -> ServiceResponse:
+        return await async_fleet_command(hass, call)
+
+    for service in FLEET_COMMANDS:
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            _async_fleet_command,
+            schema=SET_SPEED_SCHEMA if service == SERVICE_SET_SPEED else FLEET_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+
+def target_coordinators(hass: HomeAssistant, device_ids: list[str] | None) -> list:
+    """Coordinators for the given WalkingPad devices, or every loaded pad when None."""
+    coordinators = list(hass.data.get(DOMAIN, {}).values())
+    if not device_ids:
+        return coordinators
+    registry = dr.async_get(hass)
+    macs = set()
+    for device_id in device_ids:
+        device = registry.async_get(device_id)
+        if device is None:
+            raise HomeAssistantError(f"Unknown device {device_id}")
+        macs.update(identifier for domain, identifier in device.identifiers if domain == DOMAIN)
+    return [coordinator for coordinator in coordinators if coordinator.mac in macs]
+
+
+async def async_profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    coordinators = target_coordinators(hass, call.data.get(ATTR_DEVICE_ID))
+    if not coordinators:
+        raise HomeAssistantError("No WalkingPad to profile")
+    if any(coordinator.profiler is not None for coordinator in coordinators):
+        raise HomeAssistantError("A profile is already running")
+
+    duration = call.data[ATTR_DURATION]
+    profiler = CallbackProfiler()
+    for coordinator in coordinators:
+        coordinator.profiler = profiler
+    _LOGGER.info("Profiling %d WalkingPad(s) for %.0fs", len(coordinators), duration)
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        for coordinator in coordinators:
+            if coordinator.profiler is profiler:
+                coordinator.profiler = None
+
+    path_base = hass.config.path(
+        f"{DOMAIN}_profile_{time.strftime('%Y%m%d_%H%M%S')}"
+    )
+    summary = await hass.async_add_executor_job(profiler.write, path_base, call.data[ATTR_TOP])
+    summary["duration"] = duration
+    if not summary["files"]:
+        _LOGGER.info("WalkingPad profile: nothing profiled (%s)", summary["error"])
+        return summary
+    _LOGGER.info(
+        "WalkingPad profile: %d packets, %s µs per packet, written to %s.pstats",
+        summary["packets"], summary["per_packet_us"], path_base,
+    )
+    return summary
+
+
+async def async_fleet_command(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    coordinators = target_coordinators(hass, call.data.get(ATTR_DEVICE_ID))
+    if not coordinators:
+        raise HomeAssistantError("No WalkingPad targeted")
+    command = FLEET_COMMANDS[call.service]
+    limiter = AdapterLimiter(call.data[ATTR_MAX_PER_ADAPTER])
+
+    async def _send(coordinator) -> dict:
+        adapter = coordinator.router.current_source or DEFAULT_SOURCE
+        error = None
+        async with limiter.slot(adapter):
+            sent = time.monotonic()
+            try:
+                success = bool(await command(coordinator, call.data))
+            except Exception as exc:
+                success, error = False, str(exc)
+            latency = time.monotonic() - sent
+        result = {
+            "device": coordinator.device_name,
+            "mac": coordinator.mac,
+            "adapter": adapter,
+            "success": success,
+            "latency_ms": round(latency * 1000, 1),
+        }
+        if error is not None:
+            result["error"] = error
+        return result
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(_send(coordinator) for coordinator in coordinators))
+    elapsed = time.monotonic() - started
+    failed = [result["device"] for result in results if not result["success"]]
+    if failed:
+        _LOGGER.warning("WalkingPad %s failed on: %s", call.service, ", ".join(map(str, failed)))
+    return {
+        "command": call.service,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "results": list(results),
+    }
@@ -0,0 +1,128 @@
+# session.py
+"""Turns the pad's cumulative session counters into per-packet deltas.
+
+The pad reports distance, energy and elapsed time as running totals for the
+current session. SessionCounters remembers the last totals (persisted across
+HA restarts by the coordinator) and, when packets resume after a gap — HA
+restart or BLE outage — uses the device's own elapsed/distance counters to
+reconstruct what happened in between as a single interpolated GapSegment
+instead of guessing. Totals that grew faster than the pad can run are not
+a gap but a different session, which is accounted as a new one.
+"""
+from dataclasses import asdict, dataclass
+
+# Device elapsed time advancing more than this between two packets is a gap
+GAP_THRESHOLD_SECONDS = 10
+# Fallback top speed (km/h) for the plausibility check when the model's isn't known
+DEFAULT_MAX_SPEED = 12.0
+
+
+@dataclass(frozen=True)
+class GapSegment:
+    """An interval the integration didn't see, reconstructed from device counters."""
+
+    start: float        # wall-clock timestamp, interpolated from elapsed time
+    end: float
+    distance: float     # m
+    energy: float       # kcal
+    elapsed: float      # s
+    new_session: bool   # the pad started a new session during the gap
+
+    @property
+    def average_speed(self) -> float:
+        """Mean speed over the gap in km/h."""
+        return self.distance / self.elapsed * 3.6 if self.elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class SessionCounters:
+    """Last seen device totals plus the wall-clock time they were seen at."""
+
+    __slots__ = ("distance", "energy", "elapsed", "timestamp", "restarted", "max_speed")
+
+    def __init__(self, max_speed: float = DEFAULT_MAX_SPEED):
+        self.distance: float | None = None
+        self.energy: float = 0.0
+        self.elapsed: float = 0.0
+        self.timestamp: float = 0.0
+        # True when the last advance() saw the pad start a new session
+        self.restarted = False
+        # km/h — the most distance the pad can cover in a given time
+        self.max_speed = max_speed
+
+    def as_dict(self) -> dict | None:
+        if self.distance is None:
+            return None
+        return {
+            "distance": self.distance,
+            "energy": self.energy,
+            "elapsed": self.elapsed,
+            "timestamp": self.timestamp,
+        }
+
+    def restore(self, data: dict | None) -> None:
+        if not data:
+            return
+        self.distance = float(data["distance"])
+        self.energy = float(data["energy"])
+        self.elapsed = float(data["elapsed"])
+        self.timestamp = float(data["timestamp"])
+
+    def advance(self, distance: float, energy: float, elapsed: float, now: float):
+        """Account one packet.
+
+        Returns (d_distance, d_energy, d_elapsed, segment) where segment is a
+        GapSegment when the packet follows a gap, else None. The deltas always
+        include the gap, so consumers can simply add them up.
+        """
+        if self.distance is None:
+            # Very first packet for this pad — nothing to compare against
+            self.distance, self.energy, self.elapsed, self.timestamp = distance, energy, elapsed, now
+            self.restarted = False
+            return 0.0, 0.0, 0.0, None
+
+        new_session = (
+            elapsed < self.elapsed
+            or distance < self.distance
+            or self._implausible(distance - self.distance, elapsed - self.elapsed, now)
+        )
+        self.restarted = new_session
+        if new_session:
+            # Pad counters restarted — everything on them belongs to the new session
+            d_distance, d_energy, d_elapsed = distance, energy, elapsed
+        else:
+            d_distance = distance - self.distance
+            d_energy = energy - self.energy
+            if d_energy < 0:
+                # Same session but energy went down — the counter wrapped. The fixed
+                # layouts carry a single byte, FTMS a uint16.
+                d_energy += 0x100 if self.energy <= 0xFF else 0x10000
+            d_elapsed = elapsed - self.elapsed
+
+        segment = None
+        if d_elapsed > GAP_THRESHOLD_SECONDS:
+            # Interpolate: the pad was running for d_elapsed seconds up to now
+            start = max(now - d_elapsed, self.timestamp)
+            segment = GapSegment(
+                start=start,
+                end=now,
+                distance=d_distance,
+                energy=d_energy,
+                elapsed=d_elapsed,
+                new_session=new_session,
+            )
+
+        self.distance, self.energy, self.elapsed, self.timestamp = distance, energy, elapsed, now
+        return d_distance, d_energy, d_elapsed, segment
+
+    def _implausible(self, d_distance: float, d_elapsed: float, now: float) -> bool:
+        """True when the totals grew more than the time since the last packet allows.
+
+        Rising counters after an outage usually mean the same session went on,
+        but a whole other session with larger totals looks the same. Elapsed
+        time can't outrun the wall clock, nor distance the model's top speed.
+        """
+        window = max(now - self.timestamp, 0.0) + GAP_THRESHOLD_SECONDS
+        return d_elapsed > window or d_distance > self.max_speed / 3.6 * window
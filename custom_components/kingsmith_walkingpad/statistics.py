@@ -0,0 +1,272 @@
+# statistics.py
+"""Hourly long-term statistics computed from treadmill packets.
+
+Instead of relying on the recorder sampling the high-rate speed / distance /
+energy sensors, the coordinator feeds every packet into WalkingPadStatistics,
+which keeps one in-memory hourly bucket and pushes it with
+async_add_external_statistics when the hour rolls over. Dashboards use the
+``kingsmith_walkingpad:<mac>_*`` statistics, so the raw entities can be
+excluded from the recorder.
+"""
+import logging
+import time
+from datetime import datetime, timezone
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_utc_time_change
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # HA < 2025.4 only knows has_mean
+    StatisticMeanType = None
+
+# HA 2025.10+ metadata also carries unit_class
+_HAS_UNIT_CLASS = "unit_class" in StatisticMetaData.__annotations__
+
+from .const import DOMAIN
+from .session import GapSegment
+
+_LOGGER = logging.getLogger(__name__)
+
+# (suffix, name, unit) for the summed statistics
+SUM_STATISTICS = (
+    ("distance", "Distance", "m"),
+    ("energy", "Energy", "kcal"),
+    ("active_minutes", "Active Minutes", "min"),
+)
+SPEED_STATISTIC = ("speed", "Speed", "km/h")
+
+
+class _HourBucket:
+    """Running totals for one clock hour."""
+
+    __slots__ = ("hour", "distance", "energy", "active_seconds", "speed_seconds", "speed_weighted", "speed_max")
+
+    def __init__(self, hour: int):
+        self.hour = hour  # hours since epoch (UTC)
+        self.distance = 0.0
+        self.energy = 0.0
+        self.active_seconds = 0.0
+        self.speed_seconds = 0.0
+        self.speed_weighted = 0.0
+        self.speed_max = 0.0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.distance or self.energy or self.active_seconds)
+
+    def add(self, speed: float, d_distance: float, d_energy: float, d_elapsed: float, playing: bool) -> None:
+        self.distance += d_distance
+        self.energy += d_energy
+        if playing and d_elapsed:
+            self.active_seconds += d_elapsed
+            self.speed_seconds += d_elapsed
+            self.speed_weighted += speed * d_elapsed
+        if speed > self.speed_max:
+            self.speed_max = speed
+
+    def state(self, suffix: str) -> float:
+        return self.active_seconds / 60 if suffix == "active_minutes" else getattr(self, suffix)
+
+    def set_state(self, suffix: str, value: float) -> None:
+        if suffix == "active_minutes":
+            self.active_seconds = value * 60
+        else:
+            setattr(self, suffix, value)
+
+
+class WalkingPadStatistics:
+    """Aggregates packets into hourly buckets and imports them as external statistics."""
+
+    def __init__(self, hass, mac: str, device_name: str | None):
+        self.hass = hass
+        self.device_name = device_name or "WalkingPad"
+        slug = mac.replace(":", "").lower()
+        self.statistic_ids = {
+            suffix: f"{DOMAIN}:{slug}_{suffix}"
+            for suffix in (*(s[0] for s in SUM_STATISTICS), SPEED_STATISTIC[0])
+        }
+        # Cumulative sum at the start of the current bucket, per summed statistic
+        self._base_sums = {suffix: 0.0 for suffix, _, _ in SUM_STATISTICS}
+        self._bucket: _HourBucket | None = None
+        # Last bucket written before the current one — a backfilled gap may add to it
+        self._previous: _HourBucket | None = None
+        self._unsub_timer = None
+
+    async def async_setup(self) -> None:
+        """Load the last imported sums so the running totals continue across restarts."""
+        current_hour = int(datetime.now(timezone.utc).timestamp() // 3600)
+        bucket = _HourBucket(current_hour)
+        for suffix, _, _ in SUM_STATISTICS:
+            statistic_id = self.statistic_ids[suffix]
+            try:
+                last = await get_instance(self.hass).async_add_executor_job(
+                    get_last_statistics, self.hass, 1, statistic_id, True, {"state", "sum"}
+                )
+            except Exception as exc:
+                _LOGGER.debug("Could not read last statistics for %s: %s", statistic_id, exc)
+                continue
+            rows = last.get(statistic_id)
+            if not rows:
+                continue
+            row = rows[0]
+            row_sum = row.get("sum") or 0.0
+            row_state = row.get("state") or 0.0
+            row_start = row.get("start")
+            if isinstance(row_start, datetime):
+                row_start = row_start.timestamp()
+            if row_start is not None and int(row_start // 3600) == current_hour:
+                # We were restarted mid-hour — keep adding to the row we already wrote
+                self._base_sums[suffix] = row_sum - row_state
+                bucket.set_state(suffix, row_state)
+            else:
+                self._base_sums[suffix] = row_sum
+                if row_start is not None:
+                    row_hour = int(row_start // 3600)
+                    if self._previous is None or self._previous.hour != row_hour:
+                        self._previous = _HourBucket(row_hour)
+                    self._previous.set_state(suffix, row_state)
+        self._bucket = bucket
+        self._unsub_timer = async_track_utc_time_change(
+            self.hass, self._handle_hour_change, minute=0, second=0
+        )
+
+    async def async_stop(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._flush()
+
+    @callback
+    def add_sample(self, speed: float, d_distance: float, d_energy: float, d_elapsed: float, playing: bool) -> None:
+        """Account one treadmill packet's deltas (see session.SessionCounters)."""
+        if self._bucket is None:
+            return
+        hour = int(time.time() // 3600)
+        if hour != self._bucket.hour:
+            self._roll_over(hour)
+        self._bucket.add(speed, d_distance, d_energy, d_elapsed, playing)
+
+    @callback
+    def add_segment(
+        self, segment: GapSegment, speed: float, d_distance: float, d_energy: float, d_elapsed: float
+    ) -> None:
+        """Account a backfilled gap, split over the clock hours it covered.
+
+        Earlier hours had no packets, so their rows are written now (added to
+        the last written row when the gap started in its hour) and the running
+        sums move on; the share for the current hour goes into the live bucket.
+        """
+        if self._bucket is None:
+            return
+        hour = int(time.time() // 3600)
+        if hour != self._bucket.hour:
+            self._roll_over(hour)
+        span = segment.end - segment.start
+        if span <= 0 or segment.start >= hour * 3600:
+            self._bucket.add(speed, d_distance, d_energy, d_elapsed, True)
+            return
+        for slice_hour in range(int(segment.start // 3600), hour + 1):
+            overlap = min(segment.end, (slice_hour + 1) * 3600) - max(segment.start, slice_hour * 3600)
+            if overlap <= 0:
+                continue
+            share = overlap / span
+            if slice_hour == hour:
+                self._bucket.add(speed, d_distance * share, d_energy * share, d_elapsed * share, True)
+                continue
+            bucket = self._previous
+            if bucket is None or bucket.hour != slice_hour:
+                bucket = _HourBucket(slice_hour)
+            # Sum before this row = running sum minus what the row already holds
+            base_sums = {suffix: self._base_sums[suffix] - bucket.state(suffix) for suffix in self._base_sums}
+            bucket.add(speed, d_distance * share, d_energy * share, d_elapsed * share, True)
+            self._import(bucket, base_sums)
+            for suffix in self._base_sums:
+                self._base_sums[suffix] = base_sums[suffix] + bucket.state(suffix)
+            self._previous = bucket
+
+    @callback
+    def _handle_hour_change(self, now) -> None:
+        hour = int(now.timestamp() // 3600)
+        if self._bucket is not None and hour != self._bucket.hour:
+            self._roll_over(hour)
+
+    def _roll_over(self, hour: int) -> None:
+        self._flush()
+        bucket = self._bucket
+        for suffix in self._base_sums:
+            self._base_sums[suffix] += bucket.state(suffix)
+        if not bucket.is_empty:
+            self._previous = bucket
+        self._bucket = _HourBucket(hour)
+
+    def _flush(self) -> None:
+        """Import the current bucket (idempotent — the recorder upserts by start time)."""
+        if self._bucket is not None:
+            self._import(self._bucket, self._base_sums)
+
+    def _import(self, bucket: _HourBucket, base_sums: dict[str, float]) -> None:
+        if bucket.is_empty:
+            return
+        start = datetime.fromtimestamp(bucket.hour * 3600, tz=timezone.utc)
+        for suffix, name, unit in SUM_STATISTICS:
+            value = bucket.state(suffix)
+            async_add_external_statistics(
+                self.hass,
+                self._metadata(suffix, name, unit, has_sum=True),
+                [StatisticData(
+                    start=start,
+                    state=round(value, 3),
+                    sum=round(base_sums[suffix] + value, 3),
+                )],
+            )
+        if bucket.speed_seconds:
+            suffix, name, unit = SPEED_STATISTIC
+            async_add_external_statistics(
+                self.hass,
+                self._metadata(suffix, name, unit, has_sum=False),
+                [StatisticData(
+                    start=start,
+                    mean=round(bucket.speed_weighted / bucket.speed_seconds, 2),
+                    max=bucket.speed_max,
+                )],
+            )
+
+    def _metadata(self, suffix: str, name: str, unit: str, has_sum: bool) -> StatisticMetaData:
+        name = f"{self.device_name} {name}"
+        statistic_id = self.statistic_ids[suffix]
+        if StatisticMeanType is None:
+            return StatisticMetaData(
+                has_mean=not has_sum,
+                has_sum=has_sum,
+                name=name,
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=unit,
+            )
+        mean_type = StatisticMeanType.NONE if has_sum else StatisticMeanType.ARITHMETIC
+        if not _HAS_UNIT_CLASS:
+            return StatisticMetaData(
+                mean_type=mean_type,
+                has_sum=has_sum,
+                name=name,
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=unit,
+            )
+        # No unit class — the statistics keep the units the pad reports, unconverted
+        return StatisticMetaData(
+            mean_type=mean_type,
+            has_sum=has_sum,
+            name=name,
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_class=None,
+            unit_of_measurement=unit,
+        )
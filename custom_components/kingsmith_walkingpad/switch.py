@@ -2,7 +2,6 @@
 import logging
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.core import callback
-from homeassistant.helpers.entity import DeviceInfo
 
 from .const import DOMAIN, CONF_WATCH_STEPS_ENTITY, CONF_WATCH_CALORIES_ENTITY
 
@@ -24,12 +23,7 @@ class WalkingPadUseWatchSwitch(SwitchEntity):
         self.coordinator = coordinator
         self._entry = entry
         self._attr_unique_id = f"{coordinator.mac}_use_watch"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.mac)},
-            name=coordinator.device_name,
-            manufacturer="KingSmith",
-            model=coordinator.model,
-        )
+        self._attr_device_info = coordinator.device_info
 
     @property
     def is_on(self) -> bool:
@@ -49,9 +43,11 @@ class WalkingPadUseWatchSwitch(SwitchEntity):
         _LOGGER.info("Watch mode enabled")
         self.coordinator.use_watch = True
         # If treadmill is currently playing, start a fresh session snapshot immediately
-        if self.coordinator.data.get("training_status") == "playing":
+        if self.coordinator.data.training_status == "playing":
             self.coordinator.start_watch_session()
         self.coordinator.update_watch_data()
+        # Steps and Energy sensors switch source — force them to re-render
+        self.coordinator.data.invalidate()
         try:
             self.coordinator.async_set_updated_data(self.coordinator.data)
         except Exception:
@@ -63,6 +59,7 @@ class WalkingPadUseWatchSwitch(SwitchEntity):
         _LOGGER.info("Watch mode disabled — reverting to treadmill data")
         self.coordinator.use_watch = False
         self.coordinator.reset_watch_session()
+        self.coordinator.data.invalidate()
         try:
             self.coordinator.async_set_updated_data(self.coordinator.data)
         except Exception:
@@ -70,7 +67,7 @@ class WalkingPadUseWatchSwitch(SwitchEntity):
         self.async_write_ha_state()
 
     async def async_added_to_hass(self):
-        self.coordinator.async_add_listener(self._handle_update)
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_update))
 
     @callback
     def _handle_update(self):
@@ -0,0 +1,165 @@
+# telemetry.py
+"""Live telemetry state shared by the coordinator and its entities.
+
+The coordinator owns one WalkingPadTelemetry per pad and writes parsed packets
+straight into it. Every write that changes a field bumps ``version`` and stamps
+that field, so an entity can tell whether anything it shows changed since the
+last version it rendered with a single list index — no dict lookups, no
+per-packet allocation.
+"""
+from dataclasses import dataclass, field
+
+# Field indices into WalkingPadTelemetry.stamps
+SPEED = 0
+DISTANCE = 1
+ENERGY = 2
+ELAPSED_TIME = 3
+TRAINING_STATUS = 4
+COUNTDOWN = 5
+WATCH_STEPS = 6
+WATCH_CALORIES = 7
+WATCH_HEART_RATE = 8
+INCLINE = 9
+ESTIMATED_ENERGY = 10
+PRESENCE = 11
+LINK = 12
+BODY_MODEL = 13      # weight / step calibration — inputs of the estimated values
+FIELD_COUNT = 14
+
+
+@dataclass(slots=True)
+class WalkingPadTelemetry:
+    speed: float = 0.0
+    distance: int = 0
+    energy: int = 0
+    elapsed_time: int = 0
+    incline: float = 0.0            # % grade, 0 for pads that don't report it
+    estimated_energy: float = 0.0   # kcal this session from the ACSM model
+    training_status: str = "unknown"
+    training_status_raw: str | None = None
+    countdown_number: int | None = None
+    # Watch session data (populated when use_watch=True)
+    watch_session_steps: float = 0
+    watch_session_calories: float = 0
+    watch_heart_rate: float | None = None
+    # Advertisement state — kept without a GATT connection
+    present: bool = False
+    machine_available: bool | None = None
+    rssi: int | None = None
+    # Set by the liveness watchdog while a "connected" link delivers nothing
+    link_stale: bool = False
+    # Monotonic change counter and the version each field last changed at
+    version: int = 0
+    stamps: list[int] = field(default_factory=lambda: [0] * FIELD_COUNT)
+
+    def changed_since(self, index: int, version: int) -> bool:
+        """True if the field at ``index`` changed after ``version``."""
+        return self.stamps[index] > version
+
+    def mark_changed(self, index: int) -> None:
+        """Stamp a field whose inputs live outside this state (e.g. BODY_MODEL)."""
+        self.version += 1
+        self.stamps[index] = self.version
+
+    def invalidate(self) -> None:
+        """Mark every field as changed, e.g. when a data source is switched."""
+        self.version += 1
+        stamps = self.stamps
+        for index in range(FIELD_COUNT):
+            stamps[index] = self.version
+
+    def apply_treadmill(
+        self, speed: float, distance: int, energy: int, elapsed: int, incline: float
+    ) -> bool:
+        """Write one treadmill data packet. Returns True if anything changed."""
+        version = self.version + 1
+        stamps = self.stamps
+        changed = False
+        if speed != self.speed:
+            self.speed = speed
+            stamps[SPEED] = version
+            changed = True
+        if distance != self.distance:
+            self.distance = distance
+            stamps[DISTANCE] = version
+            changed = True
+        if energy != self.energy:
+            self.energy = energy
+            stamps[ENERGY] = version
+            changed = True
+        if elapsed != self.elapsed_time:
+            self.elapsed_time = elapsed
+            stamps[ELAPSED_TIME] = version
+            changed = True
+        if incline != self.incline:
+            self.incline = incline
+            stamps[INCLINE] = version
+            changed = True
+        if changed:
+            self.version = version
+        return changed
+
+    def apply_estimated_energy(self, energy: float) -> bool:
+        if energy == self.estimated_energy:
+            return False
+        self.version += 1
+        self.estimated_energy = energy
+        self.stamps[ESTIMATED_ENERGY] = self.version
+        return True
+
+    def apply_advertisement(self, present: bool, available: bool | None, rssi: int | None) -> bool:
+        """Write advertisement state. RSSI alone doesn't count as a change."""
+        self.rssi = rssi
+        if present == self.present and available == self.machine_available:
+            return False
+        self.version += 1
+        self.present = present
+        self.machine_available = available
+        self.stamps[PRESENCE] = self.version
+        return True
+
+    def apply_link_stale(self, stale: bool) -> bool:
+        if stale == self.link_stale:
+            return False
+        self.version += 1
+        self.link_stale = stale
+        self.stamps[LINK] = self.version
+        return True
+
+    def apply_status(self, status: str, raw: str | None, countdown_number: int | None) -> bool:
+        """Write a decoded training status. Returns True if anything changed."""
+        version = self.version + 1
+        changed = False
+        if status != self.training_status or raw != self.training_status_raw:
+            self.training_status = status
+            self.training_status_raw = raw
+            self.stamps[TRAINING_STATUS] = version
+            changed = True
+        if countdown_number != self.countdown_number:
+            self.countdown_number = countdown_number
+            self.stamps[COUNTDOWN] = version
+            changed = True
+        if changed:
+            self.version = version
+        return changed
+
+    def apply_watch(self, steps: float, calories: float, heart_rate: float | None) -> bool:
+        """Write watch session values. Returns True if anything changed."""
+        version = self.version + 1
+        stamps = self.stamps
+        changed = False
+        if steps != self.watch_session_steps:
+            self.watch_session_steps = steps
+            stamps[WATCH_STEPS] = version
+            changed = True
+        if calories != self.watch_session_calories:
+            self.watch_session_calories = calories
+            stamps[WATCH_CALORIES] = version
+            changed = True
+        if heart_rate != self.watch_heart_rate:
+            self.watch_heart_rate = heart_rate
+            stamps[WATCH_HEART_RATE] = version
+            changed = True
+        if changed:
+            self.version = version
+        return changed
@@ -0,0 +1,59 @@
+# walkingpad_protocol/__init__.py
+"""WalkingPad protocol core — encoders, decoders and model profiles.
+
+Pure Python with no Home Assistant or bleak imports, so scripts and tests can
+load it on its own — by file location, as scripts/_standalone.py does, never
+by putting the component directory on sys.path. The integration's
+coordinator is the adapter that feeds it GATT notifications.
+"""
+from .constants import (
+    CMD_CONTROL_REQUEST,
+    SPEED_MAX,
+    SPEED_MIN,
+    SPEED_STEP,
+    cmd_set_speed,
+)
+from .control_point import decode_control_response
+from .ftms import (
+    MachineCapabilities,
+    advertised_availability,
+    parse_ftms_service_data,
+    parse_machine_features,
+    parse_speed_range,
+    parse_treadmill_data,
+)
+from .profiles import (
+    NORMALIZED_STATUS,
+    PROFILES,
+    ModelProfile,
+    get_profile,
+    profile_for_ble_name,
+    register_profile,
+    supported_name_prefixes,
+)
+from .status import DEFAULT_STATUS_DEBOUNCE, StatusDecoder, StatusTransition
+
+__all__ = [
+    "CMD_CONTROL_REQUEST",
+    "DEFAULT_STATUS_DEBOUNCE",
+    "MachineCapabilities",
+    "ModelProfile",
+    "NORMALIZED_STATUS",
+    "PROFILES",
+    "SPEED_MAX",
+    "SPEED_MIN",
+    "SPEED_STEP",
+    "StatusDecoder",
+    "StatusTransition",
+    "advertised_availability",
+    "cmd_set_speed",
+    "decode_control_response",
+    "get_profile",
+    "parse_ftms_service_data",
+    "parse_machine_features",
+    "parse_speed_range",
+    "parse_treadmill_data",
+    "profile_for_ble_name",
+    "register_profile",
+    "supported_name_prefixes",
+]
@@ -0,0 +1,38 @@
+# walkingpad_protocol/control_point.py
+"""Fitness Machine Control Point (2AD9) responses.
+
+The pad answers every control point write with an indication
+``80 <request opcode> <result> [parameters]``.
+"""
+
+RESPONSE_CODE = 0x80
+OP_REQUEST_CONTROL = 0x00
+OP_SET_TARGET_SPEED = 0x02
+OP_START = 0x07
+OP_STOP = 0x08
+RESULT_SUCCESS = 0x01
+
+
+def decode_control_response(data) -> tuple[int, int | None, str | None] | None:
+    """Decode a control point indication → (request opcode, result code, control state).
+
+    ``control state`` is what a start/stop response says the belt is now
+    doing ("playing" / "paused" / "idle"), None for other opcodes. Returns
+    None when ``data`` isn't a response at all.
+    """
+    if len(data) < 2 or data[0] != RESPONSE_CODE:
+        return None
+    opcode = data[1]
+    result = data[2] if len(data) >= 3 else None
+    state = None
+    if opcode == OP_START:
+        state = "playing"
+    elif opcode == OP_STOP:
+        tail = data[2:]
+        if 0x02 in tail:
+            state = "paused"
+        elif 0x01 in tail:
+            state = "idle"
+        else:
+            state = "paused"
+    return opcode, result, state
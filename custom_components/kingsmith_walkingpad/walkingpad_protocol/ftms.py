@@ -0,0 +1,179 @@
+# walkingpad_protocol/ftms.py
+"""Decoders for the standard FTMS characteristics the WalkingPads expose.
+
+Pure functions only — no Home Assistant or bleak imports — so the coordinator
+can call them from notification callbacks without any setup cost.
+"""
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+# Fitness Machine Feature (2ACC) — machine feature bits we care about
+FEATURE_AVERAGE_SPEED = 1 << 0
+FEATURE_TOTAL_DISTANCE = 1 << 2
+FEATURE_INCLINATION = 1 << 3
+FEATURE_EXPENDED_ENERGY = 1 << 9
+FEATURE_HEART_RATE = 1 << 10
+FEATURE_ELAPSED_TIME = 1 << 12
+
+# Treadmill Data (2ACD) flag bits, in field order
+FLAG_MORE_DATA = 1 << 0        # 0 = instantaneous speed IS present
+FLAG_AVERAGE_SPEED = 1 << 1
+FLAG_TOTAL_DISTANCE = 1 << 2
+FLAG_INCLINATION = 1 << 3
+FLAG_ELEVATION_GAIN = 1 << 4
+FLAG_INSTANT_PACE = 1 << 5
+FLAG_AVERAGE_PACE = 1 << 6
+FLAG_EXPENDED_ENERGY = 1 << 7
+FLAG_HEART_RATE = 1 << 8
+FLAG_METABOLIC_EQUIVALENT = 1 << 9
+FLAG_ELAPSED_TIME = 1 << 10
+FLAG_REMAINING_TIME = 1 << 11
+FLAG_FORCE_AND_POWER = 1 << 12
+
+ENERGY_NOT_AVAILABLE = 0xFFFF
+
+# FTMS service data (advertisement, UUID 0x1826): flags (uint8) + machine type (uint16)
+FTMS_SERVICE_DATA_UUID = "00001826-0000-1000-8000-00805f9b34fb"
+ADV_FLAG_MACHINE_AVAILABLE = 1 << 0
+MACHINE_TYPE_TREADMILL = 1 << 0
+
+
+@dataclass(frozen=True)
+class MachineCapabilities:
+    """What the pad reported about itself on first connect."""
+
+    speed_min: float
+    speed_max: float
+    speed_step: float
+    features: int = 0
+
+    def supports(self, feature: int) -> bool:
+        return bool(self.features & feature)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MachineCapabilities":
+        return cls(
+            speed_min=float(data["speed_min"]),
+            speed_max=float(data["speed_max"]),
+            speed_step=float(data["speed_step"]),
+            features=int(data.get("features", 0)),
+        )
+
+
+def parse_speed_range(data: bytes) -> tuple[float, float, float]:
+    """Decode Supported Speed Range (2AD4): min, max, increment in km/h.
+    Each value is a little-endian uint16 with 0.01 km/h resolution.
+    """
+    if len(data) < 6:
+        raise ValueError(f"Supported Speed Range too short ({len(data)} bytes)")
+    speed_min = int.from_bytes(data[0:2], "little") / 100
+    speed_max = int.from_bytes(data[2:4], "little") / 100
+    speed_step = int.from_bytes(data[4:6], "little") / 100
+    if speed_max <= speed_min:
+        raise ValueError(f"Invalid speed range {speed_min}–{speed_max}")
+    return speed_min, speed_max, speed_step or 0.1
+
+
+def parse_machine_features(data: bytes) -> int:
+    """Decode the Fitness Machine Features bitfield from 2ACC (first uint32)."""
+    if len(data) < 4:
+        raise ValueError(f"Fitness Machine Feature too short ({len(data)} bytes)")
+    return int.from_bytes(data[0:4], "little")
+
+
+def parse_ftms_service_data(data: bytes) -> tuple[bool, int] | None:
+    """Decode the FTMS advertisement service data: (machine available, machine type bits).
+    Returns None when the payload is too short to be FTMS service data.
+    """
+    if len(data) < 3:
+        return None
+    return bool(data[0] & ADV_FLAG_MACHINE_AVAILABLE), data[1] | (data[2] << 8)
+
+
+def advertised_availability(service_data) -> bool | None:
+    """Machine-available flag from an advertisement's service data (UUID → bytes).
+    None when the advertisement carries no usable FTMS service data.
+    """
+    data = service_data.get(FTMS_SERVICE_DATA_UUID)
+    if not data:
+        return None
+    decoded = parse_ftms_service_data(data)
+    return None if decoded is None else decoded[0]
+
+
+@lru_cache(maxsize=32)
+def treadmill_layout(flags: int) -> tuple[int, int, int, int, int, int]:
+    """Byte offsets for a 2ACD packet with the given flags.
+
+    Returns (speed, distance, incline, energy, elapsed, length) where a field that is
+    not present has offset -1. Pads send the same flags on every packet, so
+    the walk over optional fields runs once and later packets hit the cache.
+    """
+    offset = 2
+    speed = distance = incline = energy = elapsed = -1
+    if not flags & FLAG_MORE_DATA:
+        speed = offset
+        offset += 2
+    if flags & FLAG_AVERAGE_SPEED:
+        offset += 2
+    if flags & FLAG_TOTAL_DISTANCE:
+        distance = offset
+        offset += 3
+    if flags & FLAG_INCLINATION:
+        incline = offset
+        offset += 4     # inclination + ramp angle
+    if flags & FLAG_ELEVATION_GAIN:
+        offset += 4     # positive + negative
+    if flags & FLAG_INSTANT_PACE:
+        offset += 1
+    if flags & FLAG_AVERAGE_PACE:
+        offset += 1
+    if flags & FLAG_EXPENDED_ENERGY:
+        energy = offset
+        offset += 5     # total (2) + per hour (2) + per minute (1)
+    if flags & FLAG_HEART_RATE:
+        offset += 1
+    if flags & FLAG_METABOLIC_EQUIVALENT:
+        offset += 1
+    if flags & FLAG_ELAPSED_TIME:
+        elapsed = offset
+        offset += 2
+    if flags & FLAG_REMAINING_TIME:
+        offset += 2
+    if flags & FLAG_FORCE_AND_POWER:
+        offset += 4
+    return speed, distance, incline, energy, elapsed, offset
+
+
+def parse_treadmill_data(data: bytes, features: int | None = None):
+    """Decode a Treadmill Data (2ACD) packet using its own flags.
+
+    Returns (speed_kmh, distance_m, energy_kcal, elapsed_s, incline_pct) with None for any
+    field the packet doesn't carry or the machine doesn't support, or None if
+    the flags don't describe this packet (caller falls back to fixed offsets).
+    ``features`` is the 2ACC bitfield; None means "unknown, decode everything".
+    """
+    if len(data) < 2:
+        return None
+    flags = data[0] | (data[1] << 8)
+    speed_off, distance_off, incline_off, energy_off, elapsed_off, length = treadmill_layout(flags)
+    if length != len(data):
+        return None
+
+    speed = distance = energy = elapsed = incline = None
+    if speed_off >= 0:
+        speed = (data[speed_off] | (data[speed_off + 1] << 8)) / 100
+    if distance_off >= 0 and (features is None or features & FEATURE_TOTAL_DISTANCE):
+        distance = data[distance_off] | (data[distance_off + 1] << 8) | (data[distance_off + 2] << 16)
+    if incline_off >= 0 and (features is None or features & FEATURE_INCLINATION):
+        incline = int.from_bytes(data[incline_off:incline_off + 2], "little", signed=True) / 10
+    if energy_off >= 0 and (features is None or features & FEATURE_EXPENDED_ENERGY):
+        energy = data[energy_off] | (data[energy_off + 1] << 8)
+        if energy == ENERGY_NOT_AVAILABLE:
+            energy = None
+    if elapsed_off >= 0 and (features is None or features & FEATURE_ELAPSED_TIME):
+        elapsed = data[elapsed_off] | (data[elapsed_off + 1] << 8)
+    return speed, distance, energy, elapsed, incline
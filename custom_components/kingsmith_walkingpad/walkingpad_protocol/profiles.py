@@ -0,0 +1,251 @@
+# walkingpad_protocol/profiles.py
+"""Model profiles — everything that differs between WalkingPad protocol variants.
+
+A profile is picked once when the coordinator is created. The notification
+handlers then only do table lookups on the selected profile, so supporting a
+new model means registering a profile here, not touching the hot path.
+"""
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+from .constants import (
+    UUID_TREADMILL_DATA,
+    UUID_CONTROL_POINT,
+    UUID_TREADMILL_STATUS,
+    UUID_FITNESS_MACHINE_STATUS,
+    UUID_MC21_AUTH,
+    CMD_START,
+    CMD_STOP,
+    CMD_FINISH,
+    CMD_MC21_START,
+    CMD_MC21_STOP,
+    CMD_MC21_AUTH,
+    cmd_set_speed,
+)
+from .ftms import parse_treadmill_data
+
+DEFAULT_MODEL = "WalkingPad"
+
+# Decoded status markers — anything else in a status table is a raw status string
+STATUS_IGNORE = "ignore"        # not a state change (e.g. MC21 0x05 speed notification)
+STATUS_COUNTDOWN = "countdown"  # countdown digit follows in b[2]
+
+COUNTDOWN_DIGITS = {0x33: 3, 0x32: 2, 0x31: 1}
+
+# Raw status string → normalized training_status used by the entities
+NORMALIZED_STATUS = {
+    "playing": "playing",
+    "stopping/paused": "paused",
+    "idle": "idle",
+}
+
+
+def _key(b0: int, b1: int) -> int:
+    return (b0 << 8) | b1
+
+
+def _build_status_table() -> Mapping[int, str]:
+    """Status lookup keyed on (b[0] << 8) | b[1], covering both status formats."""
+    table = {}
+
+    # ---- MC21 / FTMS Fitness Machine Status (2ADA) format ----
+    # b[0]=0x04 → Playing (any parameter)
+    # b[0]=0x05 → Speed update notification (not a state change)
+    for b1 in range(256):
+        table[_key(0x04, b1)] = "playing"
+        table[_key(0x05, b1)] = STATUS_IGNORE
+    table[_key(0x02, 0x02)] = "stopping/paused"
+    table[_key(0x02, 0x01)] = "idle"
+
+    # ---- MC11 / Proprietary Training Status (2AD3) format ----
+    table[_key(0x03, 0x0E)] = STATUS_COUNTDOWN
+    table[_key(0x01, 0x0D)] = "playing"
+    table[_key(0x01, 0x0F)] = "stopping/paused"
+    table[_key(0x01, 0x01)] = "idle"
+
+    # ---- MC21 2AD3 format (b[0]=0x00) ----
+    table[_key(0x00, 0x0D)] = "playing"          # Quick Start / Manual Mode
+    table[_key(0x00, 0x0F)] = "stopping/paused"  # PostWorkout
+    table[_key(0x00, 0x0E)] = "idle"             # Pre-Workout (ready state)
+    table[_key(0x00, 0x01)] = "idle"
+    return MappingProxyType(table)
+
+
+DEFAULT_STATUS_TABLE = _build_status_table()
+
+# Precomputed Set Target Speed encodings, keyed by (model, min, max, step) in centi-km/h
+_SPEED_COMMAND_TABLES: dict[tuple[str, int, int, int], dict[int, bytes]] = {}
+
+# Fixed 2ACD layouts used when the FTMS flags don't describe a packet:
+# (minimum length, distance byte count) — checked longest first.
+# MC11 sends 17-byte packets (distance = 3 bytes at b[4:7])
+# MC21 sends 14-byte packets (distance = 2 bytes at b[4:6])
+DEFAULT_FIXED_LAYOUTS = ((17, 3), (14, 2))
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    model: str
+    name_prefixes: tuple[str, ...]
+    status_uuid: str
+    speed_min: float
+    speed_max: float
+    start_cmd: bytes
+    pause_cmd: bytes
+    finish_cmd: bytes
+    # MC11 family needs Request Control (0x00) before every command
+    needs_control_request: bool = True
+    auth: tuple[str, bytes] | None = None
+    data_uuid: str = UUID_TREADMILL_DATA
+    control_uuid: str = UUID_CONTROL_POINT
+    # Read-only, and left out of the hash so profiles stay hashable values
+    status_table: Mapping[int, str] = field(default_factory=lambda: DEFAULT_STATUS_TABLE, repr=False, hash=False)
+    fixed_layouts: tuple[tuple[int, int], ...] = DEFAULT_FIXED_LAYOUTS
+    # Decode 2ACD from its FTMS flags before the fixed layouts. Off for the
+    # known models: their energy has always been the single byte b[7] (and
+    # MC21 distance 2 bytes), and the long-term statistics are built on that
+    ftms_flags: bool = False
+
+    def encode_speed(self, kmh: float) -> bytes:
+        return cmd_set_speed(kmh)
+
+    def speed_commands(self, speed_min: float, speed_max: float, speed_step: float) -> dict[int, bytes]:
+        """Encodings for every valid speed in the range, keyed by km/h * 100.
+        Built once per (model, range) and shared by every coordinator using it.
+        """
+        low, high, step = round(speed_min * 100), round(speed_max * 100), max(1, round(speed_step * 100))
+        key = (self.model, low, high, step)
+        table = _SPEED_COMMAND_TABLES.get(key)
+        if table is None:
+            table = {centi: self.encode_speed(centi / 100) for centi in range(low, high + 1, step)}
+            _SPEED_COMMAND_TABLES[key] = table
+        return table
+
+    def decode_status(self, data) -> tuple[str | None, int | None]:
+        """Map a status notification to (raw status, countdown number).
+        Returns (None, None) for notifications that aren't a state change and
+        ("unknown", None) for bytes the profile doesn't recognise.
+        """
+        if len(data) < 2:
+            return "unknown", None
+        status = self.status_table.get((data[0] << 8) | data[1])
+        if status is None:
+            return "unknown", None
+        if status == STATUS_IGNORE:
+            return None, None
+        if status == STATUS_COUNTDOWN:
+            if len(data) < 3:
+                return "unknown", None
+            number = COUNTDOWN_DIGITS.get(data[2])
+            if number is None:
+                return f"mode unknown ({data[2]:02X})", None
+            return f"countdown {number}", number
+        return status, None
+
+    def parse_treadmill(self, data, features: int | None = None):
+        """2ACD → (speed, distance, energy, elapsed, incline) or None if it can't be decoded."""
+        if self.ftms_flags:
+            parsed = parse_treadmill_data(data, features)
+            if parsed is not None:
+                return parsed
+        return self.parse_fixed_layout(data)
+
+    def parse_fixed_layout(self, data):
+        """Fixed-offset 2ACD decode → (speed, distance, energy, elapsed, incline) or None if too short."""
+        length = len(data)
+        for min_length, distance_bytes in self.fixed_layouts:
+            if length >= min_length:
+                return (
+                    int.from_bytes(data[2:4], byteorder="little") / 100,
+                    int.from_bytes(data[4:4 + distance_bytes], byteorder="little"),
+                    data[7],
+                    int.from_bytes(data[12:14], byteorder="little"),
+                    None,
+                )
+        return None
+
+
+PROFILES: dict[str, ModelProfile] = {}
+
+
+def register_profile(profile: ModelProfile) -> ModelProfile:
+    PROFILES[profile.model] = profile
+    return profile
+
+
+register_profile(ModelProfile(
+    model="WalkingPad MC11",
+    name_prefixes=("KS-AP",),
+    status_uuid=UUID_TREADMILL_STATUS,
+    speed_min=1.0,
+    speed_max=12.0,
+    start_cmd=CMD_START,
+    pause_cmd=CMD_STOP,
+    finish_cmd=CMD_FINISH,
+))
+
+register_profile(ModelProfile(
+    model="WalkingPad C2",
+    name_prefixes=("KS-C2",),
+    status_uuid=UUID_TREADMILL_STATUS,
+    speed_min=1.0,
+    speed_max=6.0,
+    start_cmd=CMD_START,
+    pause_cmd=CMD_STOP,
+    finish_cmd=CMD_FINISH,
+))
+
+# MC21 — bare opcodes, no Request Control, 2ADA for status, auth token to unlock 2AD9
+register_profile(ModelProfile(
+    model="WalkingPad MC21",
+    name_prefixes=("KS-MC21",),
+    status_uuid=UUID_FITNESS_MACHINE_STATUS,
+    speed_min=0.5,   # confirmed from 2AD4 Supported Speed Range
+    speed_max=10.0,  # confirmed from 2AD4 Supported Speed Range
+    start_cmd=CMD_MC21_START,
+    pause_cmd=CMD_MC21_STOP,
+    finish_cmd=CMD_MC21_STOP,
+    needs_control_request=False,
+    auth=(UUID_MC21_AUTH, CMD_MC21_AUTH),
+))
+
+# Fallback for unknown / future models — speed limits are replaced by the
+# pad's own 2AD4 Supported Speed Range once it has been read
+register_profile(ModelProfile(
+    model=DEFAULT_MODEL,
+    name_prefixes=("KS-", "WalkingPad"),
+    status_uuid=UUID_TREADMILL_STATUS,
+    speed_min=1.0,
+    speed_max=10.0,
+    start_cmd=CMD_START,
+    pause_cmd=CMD_STOP,
+    finish_cmd=CMD_FINISH,
+    ftms_flags=True,
+))
+
+
+def get_profile(model: str | None) -> ModelProfile:
+    return PROFILES.get((model or "").strip(), PROFILES[DEFAULT_MODEL])
+
+
+def profile_for_ble_name(ble_name: str | None) -> ModelProfile:
+    """Pick the profile whose name prefix matches the BLE advertised name.
+    Longer (more specific) prefixes win over generic ones like "KS-".
+    """
+    if ble_name:
+        best = None
+        best_len = 0
+        for profile in PROFILES.values():
+            for prefix in profile.name_prefixes:
+                if ble_name.startswith(prefix) and len(prefix) > best_len:
+                    best, best_len = profile, len(prefix)
+        if best is not None:
+            return best
+    return PROFILES[DEFAULT_MODEL]
+
+
+def supported_name_prefixes() -> tuple[str, ...]:
+    return tuple(
+        prefix for profile in PROFILES.values() for prefix in profile.name_prefixes
+    )
@@ -0,0 +1,191 @@
+# walkingpad_protocol/simulator.py
+"""A simulated WalkingPad that looks like a connected bleak client.
+
+SimulatedPad implements the part of the BleakClient interface the integration
+uses (start_notify, write_gatt_char, read_gatt_char, disconnect, is_connected,
+services, clear_cache) and behaves like a pad of the given profile: it answers
+control point writes, emits status notifications on start/pause/finish and streams
+FTMS Treadmill Data at ``rate`` Hz. ``time_scale`` runs the pad's own clock
+faster than wall time for soak tests; ``drop_link`` and ``go_silent``
+reproduce a lost link and a zombie link.
+"""
+import asyncio
+
+from .constants import (
+    UUID_CONTROL_POINT,
+    UUID_FITNESS_MACHINE_FEATURE,
+    UUID_FITNESS_MACHINE_STATUS,
+    UUID_SUPPORTED_SPEED_RANGE,
+    UUID_TREADMILL_DATA,
+)
+from .control_point import OP_REQUEST_CONTROL, OP_SET_TARGET_SPEED, OP_START, OP_STOP, RESPONSE_CODE, RESULT_SUCCESS
+from .ftms import (
+    FEATURE_ELAPSED_TIME,
+    FEATURE_EXPENDED_ENERGY,
+    FEATURE_TOTAL_DISTANCE,
+    FLAG_ELAPSED_TIME,
+    FLAG_EXPENDED_ENERGY,
+    FLAG_TOTAL_DISTANCE,
+)
+from .profiles import ModelProfile
+
+TREADMILL_FLAGS = FLAG_TOTAL_DISTANCE | FLAG_EXPENDED_ENERGY | FLAG_ELAPSED_TIME
+FEATURES = FEATURE_TOTAL_DISTANCE | FEATURE_EXPENDED_ENERGY | FEATURE_ELAPSED_TIME
+KCAL_PER_METRE = 0.05
+
+# Status frames per status characteristic: 2ADA (MC21 / FTMS) vs 2AD3 (MC11 family)
+_STATUS_FRAMES = {
+    True: {"playing": b"\x04\x01", "paused": b"\x02\x02", "idle": b"\x02\x01"},
+    False: {"playing": b"\x01\x0d", "paused": b"\x01\x0f", "idle": b"\x01\x01"},
+}
+
+
+class SimulatedPad:
+    """In-process stand-in for a connected pad."""
+
+    def __init__(
+        self,
+        profile: ModelProfile,
+        rate: float = 1.0,
+        time_scale: float = 1.0,
+        disconnected_callback=None,
+    ):
+        self.profile = profile
+        self.rate = rate
+        self.time_scale = time_scale
+        self.disconnected_callback = disconnected_callback
+        self.address = "SIM"
+        self.services = None
+        self.is_connected = False
+        self.status = "idle"
+        self.speed = 0.0
+        self.target_speed = max(profile.speed_min, 2.0)
+        self.distance = 0.0
+        self.energy = 0.0
+        self.elapsed = 0.0
+        self.silent = False
+        self.writes: list[tuple[str, bytes]] = []
+        self._callbacks: dict[str, object] = {}
+        self._frames = _STATUS_FRAMES[profile.status_uuid == UUID_FITNESS_MACHINE_STATUS]
+        self._ticker: asyncio.Task | None = None
+
+    # bleak client interface
+    async def connect(self) -> bool:
+        self.is_connected = True
+        self.silent = False
+        return True
+
+    async def disconnect(self) -> bool:
+        self._shutdown()
+        if self.disconnected_callback is not None:
+            self.disconnected_callback(self)
+        return True
+
+    async def start_notify(self, uuid: str, callback) -> None:
+        self._require_connection()
+        self._callbacks[uuid] = callback
+        if uuid == UUID_TREADMILL_DATA and self._ticker is None:
+            self._ticker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop_notify(self, uuid: str) -> None:
+        self._callbacks.pop(uuid, None)
+
+    async def clear_cache(self) -> bool:
+        # BleakClientWithServiceCache API — nothing is cached
+        return True
+
+    async def read_gatt_char(self, uuid: str) -> bytes:
+        self._require_connection()
+        if uuid == UUID_SUPPORTED_SPEED_RANGE:
+            return b"".join(
+                round(value * 100).to_bytes(2, "little")
+                for value in (self.profile.speed_min, self.profile.speed_max, 0.1)
+            )
+        if uuid == UUID_FITNESS_MACHINE_FEATURE:
+            return FEATURES.to_bytes(4, "little") + bytes(4)
+        raise ValueError(f"Characteristic {uuid} not simulated")
+
+    async def write_gatt_char(self, uuid: str, data: bytes, response: bool = True) -> None:
+        self._require_connection()
+        data = bytes(data)
+        self.writes.append((uuid, data))
+        if uuid != UUID_CONTROL_POINT or not data:
+            return  # auth token and friends are accepted silently
+        opcode = data[0]
+        if opcode == OP_START:
+            self._set_status("playing")
+            self.speed = self.target_speed
+        elif opcode == OP_STOP:
+            finish = data[1:] == b"\x01" or (len(data) == 1 and self.status == "paused")
+            self.speed = 0.0
+            if finish:
+                self._set_status("idle")
+                self.distance = self.energy = self.elapsed = 0.0
+            else:
+                self._set_status("paused")
+        elif opcode == OP_SET_TARGET_SPEED and len(data) >= 3:
+            self.target_speed = int.from_bytes(data[1:3], "little") / 100
+            if self.status == "playing":
+                self.speed = self.target_speed
+        elif opcode != OP_REQUEST_CONTROL:
+            return
+        # Indication echoes the request parameters after the result, like the pads do
+        self._notify(UUID_CONTROL_POINT, bytes([RESPONSE_CODE, opcode, RESULT_SUCCESS]) + data[1:])
+
+    # Fault injection
+    def drop_link(self) -> None:
+        """The link dies under us — bleak reports it through the disconnected callback."""
+        self._shutdown()
+        if self.disconnected_callback is not None:
+            self.disconnected_callback(self)
+
+    def go_silent(self) -> None:
+        """Stay 'connected' but stop notifying — a zombie link."""
+        self.silent = True
+
+    # Internals
+    def treadmill_frame(self) -> bytes:
+        energy = min(int(self.energy), 0xFFFE)
+        return (
+            TREADMILL_FLAGS.to_bytes(2, "little")
+            + round(self.speed * 100).to_bytes(2, "little")
+            + int(self.distance).to_bytes(3, "little")
+            + energy.to_bytes(2, "little") + bytes(3)
+            + (int(self.elapsed) & 0xFFFF).to_bytes(2, "little")
+        )
+
+    def advance(self, seconds: float) -> None:
+        if self.status != "playing":
+            return
+        metres = self.speed / 3.6 * seconds
+        self.distance += metres
+        self.energy += metres * KCAL_PER_METRE
+        self.elapsed += seconds
+
+    async def _run(self) -> None:
+        interval = 1 / self.rate
+        while self.is_connected:
+            await asyncio.sleep(interval)
+            self.advance(interval * self.time_scale)
+            if not self.silent:
+                self._notify(UUID_TREADMILL_DATA, self.treadmill_frame())
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        self._notify(self.profile.status_uuid, self._frames[status])
+
+    def _notify(self, uuid: str, data: bytes) -> None:
+        callback = self._callbacks.get(uuid)
+        if callback is not None and self.is_connected and not self.silent:
+            callback(uuid, bytearray(data))
+
+    def _require_connection(self) -> None:
+        if not self.is_connected:
+            raise ConnectionError("Simulated pad is not connected")
+
+    def _shutdown(self) -> None:
+        self.is_connected = False
+        self._callbacks.clear()
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
@@ -0,0 +1,134 @@
+# walkingpad_protocol/status.py
+"""Training status state machine.
+
+StatusDecoder sits between the raw 2AD3 / 2ADA notifications and the
+coordinator. It decodes them through the model profile and drops repeats and
+non-state notifications (e.g. MC21 0x05 speed updates). Truncated or
+unrecognised bytes are counted as malformed and, as before, reported as the
+"unknown" status. With a debounce window set (off by default),
+playing <-> paused changes must hold for that long, so a pad flapping
+playing/paused/playing produces no transition at all instead of three state
+writes. Only real transitions come out, each with how long the previous
+status lasted.
+"""
+from collections import deque
+from dataclasses import dataclass
+
+from .profiles import NORMALIZED_STATUS, ModelProfile
+
+DEFAULT_STATUS_DEBOUNCE = 0.0   # s a playing <-> paused change must hold before it counts (opt-in)
+_FLAPPING_PAIR = frozenset(("playing", "paused"))
+
+
+@dataclass(frozen=True, slots=True)
+class StatusTransition:
+    previous: str
+    status: str             # normalized: playing / paused / idle / countdown / unknown
+    raw: str | None         # profile status string, e.g. "stopping/paused"
+    countdown: int | None
+    at: float               # monotonic time the new status was first seen
+    duration: float | None  # seconds spent in ``previous``, None for the first status
+
+    def as_dict(self) -> dict:
+        return {
+            "previous": self.previous,
+            "status": self.status,
+            "raw": self.raw,
+            "countdown": self.countdown,
+            "duration": self.duration,
+        }
+
+
+class StatusDecoder:
+    """Turns status notifications into debounced StatusTransitions."""
+
+    __slots__ = (
+        "profile", "debounce", "status", "raw", "countdown", "since", "pending",
+        "history", "time_in_status", "transitions", "duplicates", "ignored", "malformed",
+        "flaps_suppressed",
+    )
+
+    def __init__(self, profile: ModelProfile, debounce: float = DEFAULT_STATUS_DEBOUNCE):
+        self.profile = profile
+        self.debounce = debounce
+        self.status = "unknown"
+        self.raw: str | None = None
+        self.countdown: int | None = None
+        self.since: float | None = None
+        # (status, raw, countdown, first seen) waiting out the debounce window
+        self.pending: tuple[str, str | None, int | None, float] | None = None
+        self.history: deque[StatusTransition] = deque(maxlen=20)
+        self.time_in_status: dict[str, float] = {}
+        self.transitions = 0
+        self.duplicates = 0
+        self.ignored = 0
+        self.malformed = 0
+        self.flaps_suppressed = 0
+
+    @property
+    def pending_deadline(self) -> float | None:
+        """Monotonic time the pending change commits at, if there is one."""
+        return self.pending[3] + self.debounce if self.pending else None
+
+    def feed(self, data, now: float) -> StatusTransition | None:
+        """Account one notification. Returns a transition only on a real change."""
+        raw, countdown = self.profile.decode_status(data)
+        if raw is None:
+            self.ignored += 1
+            return None
+        status = "countdown" if countdown is not None else NORMALIZED_STATUS.get(raw, "unknown")
+        if status == "unknown":
+            # Truncated or unrecognised bytes (flaky proxy, new firmware) — counted,
+            # and still reported as "unknown" with the raw description
+            self.malformed += 1
+
+        if status == self.status and raw == self.raw and countdown == self.countdown:
+            if self.pending is not None:
+                # Flipped back inside the window — the excursion never happened
+                self.pending = None
+                self.flaps_suppressed += 1
+            else:
+                self.duplicates += 1
+            return None
+
+        if self.debounce > 0 and {self.status, status} == _FLAPPING_PAIR:
+            if self.pending is None or self.pending[0] != status:
+                self.pending = (status, raw, countdown, now)
+            else:
+                self.duplicates += 1
+            return None
+
+        self.pending = None
+        return self._commit(status, raw, countdown, now)
+
+    def confirm(self, now: float) -> StatusTransition | None:
+        """Commit the pending change once it has held for the debounce window."""
+        if self.pending is None or now < self.pending_deadline:
+            return None
+        status, raw, countdown, at = self.pending
+        self.pending = None
+        return self._commit(status, raw, countdown, at)
+
+    def _commit(self, status: str, raw: str | None, countdown: int | None, at: float) -> StatusTransition:
+        duration = None
+        if self.since is not None:
+            duration = at - self.since
+            self.time_in_status[self.status] = self.time_in_status.get(self.status, 0.0) + duration
+        transition = StatusTransition(self.status, status, raw, countdown, at, duration)
+        self.status, self.raw, self.countdown, self.since = status, raw, countdown, at
+        self.transitions += 1
+        self.history.append(transition)
+        return transition
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "debounce": self.debounce,
+            "transitions": self.transitions,
+            "duplicates": self.duplicates,
+            "ignored": self.ignored,
+            "malformed": self.malformed,
+            "flaps_suppressed": self.flaps_suppressed,
+            "time_in_status": {k: round(v, 1) for k, v in self.time_in_status.items()},
+            "history": [transition.as_dict() for transition in self.history],
+        }
@@ -0,0 +1,105 @@
+# watchdog.py
+"""Link liveness — spots connections that report connected but deliver nothing.
+
+The pad notifies 2ACD at a steady cadence while the belt runs; some firmware
+keeps doing so when idle, some goes quiet. LivenessWatchdog learns the
+notification interval per training status (EWMA) and calls the link stale
+once the silence is well past what that status normally shows. A status we
+have never seen notifications in (e.g. idle on a pad that stops notifying)
+is never judged, so quiet pads don't get reconnected in a loop.
+"""
+
+STALE_MIN_TIMEOUT = 10.0    # s — never call a link stale sooner than this
+STALE_INTERVAL_FACTOR = 8   # silence of this many typical intervals is stale
+EWMA_WEIGHT = 0.2
+# Statuses in which notifications are expected even before a cadence is learned
+STREAMING_STATUSES = ("playing", "countdown")
+
+
+class LivenessWatchdog:
+    """Per-status notification cadence and stale-link bookkeeping."""
+
+    __slots__ = (
+        "min_timeout", "intervals", "last_packet", "last_status", "stale_since", "armed",
+        "stale_events", "total_stale_seconds", "last_stale_duration",
+    )
+
+    def __init__(self, min_timeout: float = STALE_MIN_TIMEOUT):
+        self.min_timeout = min_timeout
+        self.intervals: dict[str, float] = {}   # status → EWMA seconds between packets
+        self.last_packet: float | None = None
+        self.last_status: str | None = None     # status the last packet arrived in
+        self.stale_since: float | None = None
+        # Whether check() may judge the silence since last_packet — off once it
+        # has called the link stale, back on with the next packet or reconnect
+        self.armed = False
+        self.stale_events = 0
+        self.total_stale_seconds = 0.0
+        self.last_stale_duration: float | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self.stale_since is not None
+
+    def reset(self, now: float) -> None:
+        """New baseline on (re)connect — silence is measured from ``now``.
+        A stale period stays open until packets flow again, but a reconnected
+        link that is just as silent is called stale again.
+        """
+        self.last_packet = now
+        self.last_status = None
+        self.armed = True
+
+    def note_packet(self, status: str, now: float) -> float | None:
+        """Account one notification. Returns how long the link was stale, if it was."""
+        # The gap that ends a stale period says nothing about the normal cadence,
+        # and neither does one spanning a status change (e.g. a long idle silence
+        # ended by the first playing packet)
+        if self.last_packet is not None and self.stale_since is None and status == self.last_status:
+            interval = now - self.last_packet
+            previous = self.intervals.get(status)
+            self.intervals[status] = interval if previous is None else previous + (interval - previous) * EWMA_WEIGHT
+        self.last_packet = now
+        self.last_status = status
+        self.armed = True
+        if self.stale_since is None:
+            return None
+        duration = now - self.stale_since
+        self.stale_since = None
+        self.total_stale_seconds += duration
+        self.last_stale_duration = duration
+        return duration
+
+    def timeout(self, status: str) -> float | None:
+        """Allowed silence for ``status``, None when we can't judge it."""
+        interval = self.intervals.get(status)
+        if interval is None:
+            return self.min_timeout if status in STREAMING_STATUSES else None
+        return max(self.min_timeout, interval * STALE_INTERVAL_FACTOR)
+
+    def check(self, status: str, now: float) -> bool:
+        """True when the link just turned stale (or stayed stale across a reconnect)."""
+        if not self.armed or self.last_packet is None:
+            return False
+        timeout = self.timeout(status)
+        if timeout is None or now - self.last_packet < timeout:
+            return False
+        self.armed = False
+        if self.stale_since is None:
+            self.stale_since = self.last_packet
+        self.stale_events += 1
+        return True
+
+    def stale_seconds(self, now: float) -> float:
+        """Total stale time including the current stale period."""
+        current = now - self.stale_since if self.stale_since is not None else 0.0
+        return round(self.total_stale_seconds + current, 1)
+
+    def as_dict(self, now: float) -> dict:
+        return {
+            "stale": self.is_stale,
+            "stale_events": self.stale_events,
+            "stale_seconds": self.stale_seconds(now),
+            "last_stale_duration": self.last_stale_duration,
+            "intervals": {status: round(interval, 2) for status, interval in self.intervals.items()},
+        }
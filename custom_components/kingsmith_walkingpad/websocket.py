@@ -0,0 +1,69 @@
+# websocket.py
+"""Websocket API streaming live telemetry frames to custom dashboards.
+
+``kingsmith_walkingpad/subscribe`` hooks straight into the coordinator's frame
+listeners, so a live display can run at packet rate without every sample going
+through the state machine and the recorder. Each event carries one compact
+frame: ``[speed_kmh, distance_m, elapsed_s, heart_rate]``.
+"""
+import logging
+import time
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+WS_TYPE_SUBSCRIBE = f"{DOMAIN}/subscribe"
+MAX_RATE = 20.0     # Hz — more than any pad notifies at
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SUBSCRIBE,
+        vol.Optional("entry_id"): str,
+        # Max frames per second; omitted = every packet
+        vol.Optional("rate"): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=MAX_RATE)),
+    }
+)
+@callback
+def websocket_subscribe(hass: HomeAssistant, connection, msg: dict) -> None:
+    """Stream telemetry frames from one pad (or the only configured one)."""
+    coordinators = hass.data.get(DOMAIN, {})
+    entry_id = msg.get("entry_id")
+    if entry_id is None and len(coordinators) == 1:
+        entry_id = next(iter(coordinators))
+    coordinator = coordinators.get(entry_id)
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "WalkingPad not found")
+        return
+
+    msg_id = msg["id"]
+    rate = msg.get("rate")
+    min_interval = 1 / rate if rate else 0.0
+    last_sent = 0.0
+
+    @callback
+    def _forward(frame: list) -> None:
+        nonlocal last_sent
+        # Downsample by dropping frames — the next one carries the newer totals anyway
+        if min_interval:
+            now = time.monotonic()
+            if now - last_sent < min_interval:
+                return
+            last_sent = now
+        connection.send_message(websocket_api.event_message(msg_id, {"f": frame}))
+
+    connection.subscriptions[msg_id] = coordinator.async_add_frame_listener(_forward)
+    connection.send_result(msg_id)
+    # Current state straight away, so the display doesn't wait for the next packet
+    _forward(coordinator.telemetry_frame())
@@ -0,0 +1,44 @@
+# scripts/_standalone.py
+"""Load the integration's pure modules without Home Assistant.
+
+The component directory is never put on sys.path — its statistics.py would
+shadow the stdlib module and every HA-only module would become importable at
+the top level. Instead walkingpad_protocol is loaded by file location as a
+package of that name, and the few other pure modules a tool or test needs
+(see PURE_MODULES) are loaded one by one under a ``kingsmith_walkingpad_``
+prefix.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+COMPONENT = Path(__file__).resolve().parent.parent / "custom_components" / "kingsmith_walkingpad"
+PURE_MODULES = ("session", "telemetry", "watchdog", "profiler", "link", "export_wire", "routing", "estimators")
+
+
+def _load(name: str, path: Path, package: bool = False):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        name, path, submodule_search_locations=[str(path.parent)] if package else None
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def load_protocol():
+    """``walkingpad_protocol``, importable afterwards as usual (submodules included)."""
+    return _load("walkingpad_protocol", COMPONENT / "walkingpad_protocol" / "__init__.py", package=True)
+
+
+def load_module(name: str):
+    """One of the component's pure, HA-free modules (see PURE_MODULES)."""
+    if name not in PURE_MODULES:
+        raise ValueError(f"{name} is not a pure module")
+    return _load(f"kingsmith_walkingpad_{name}", COMPONENT / f"{name}.py")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the walkingpad_protocol core.
+
+Runs without Home Assistant or bleak installed:
+
+    python scripts/bench_protocol.py [--number N]
+
+Each case first decodes its sample once and checks the result, so a broken
+decoder fails loudly instead of producing a fast-looking number.
+"""
+import argparse
+import timeit
+
+from _standalone import load_protocol
+
+load_protocol()
+
+import walkingpad_protocol as wp  # noqa: E402
+from walkingpad_protocol.ftms import treadmill_layout  # noqa: E402
+
+MC11 = wp.get_profile("WalkingPad MC11")
+MC21 = wp.get_profile("WalkingPad MC21")
+GENERIC = wp.get_profile("WalkingPad")
+
+# 2ACD with flags: total distance | expended energy | elapsed time
+FTMS_PACKET = bytes([
+    0x84, 0x04,             # flags
+    0x58, 0x02,             # speed 6.00 km/h
+    0xE8, 0x03, 0x00,       # distance 1000 m
+    0x2A, 0x00, 0x00, 0x00, 0x00,  # energy 42 kcal, per hour, per minute
+    0x10, 0x0E,             # elapsed 3600 s
+])
+# Fixed MC11 layout (17 bytes, flags that don't describe the packet)
+FIXED_PACKET = bytes([0xFF, 0xFF, 0x2C, 0x01, 0xF4, 0x01, 0x00, 0x15, 0, 0, 0, 0, 0x2C, 0x01, 0, 0, 0])
+STATUS_PACKET = bytes([0x01, 0x0D])
+CONTROL_RESPONSE = bytes([0x80, 0x02, 0x01])
+
+SPEED_TABLE = MC11.speed_commands(MC11.speed_min, MC11.speed_max, wp.SPEED_STEP)
+
+
+def _check() -> None:
+    assert wp.parse_treadmill_data(FTMS_PACKET) == (6.0, 1000, 42, 3600, None)
+    assert wp.parse_treadmill_data(FIXED_PACKET) is None
+    assert MC11.parse_fixed_layout(FIXED_PACKET) == (3.0, 500, 0x15, 300, None)
+    # Known models keep the fixed layout (single-byte energy) even for FTMS-shaped packets
+    assert MC11.parse_treadmill(FTMS_PACKET) == (6.0, 1000, 42, 3600, None)
+    assert MC21.parse_treadmill(FTMS_PACKET) == (6.0, 1000, 42, 3600, None)
+    assert GENERIC.parse_treadmill(FIXED_PACKET) == (3.0, 500, 0x15, 300, None)
+    assert MC11.decode_status(STATUS_PACKET) == ("playing", None)
+    assert wp.decode_control_response(CONTROL_RESPONSE) == (0x02, 0x01, None)
+    assert SPEED_TABLE[600] == wp.cmd_set_speed(6.0)
+
+
+def _status_stream() -> None:
+    decoder = wp.StatusDecoder(MC21)
+    feed = decoder.feed
+    for now in range(100):
+        feed(b"\x00\x0d", now)
+
+
+CASES = {
+    "parse_treadmill_data (FTMS flags)": lambda: wp.parse_treadmill_data(FTMS_PACKET),
+    "parse_treadmill_data + fixed fallback": lambda: (
+        wp.parse_treadmill_data(FIXED_PACKET) or MC11.parse_fixed_layout(FIXED_PACKET)
+    ),
+    "treadmill_layout (cached)": lambda: treadmill_layout(0x0484),
+    "decode_status": lambda: MC11.decode_status(STATUS_PACKET),
+    "StatusDecoder x100 duplicates": _status_stream,
+    "decode_control_response": lambda: wp.decode_control_response(CONTROL_RESPONSE),
+    "cmd_set_speed": lambda: wp.cmd_set_speed(6.0),
+    "speed table lookup": lambda: SPEED_TABLE[600],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000, help="calls per case")
+    args = parser.parse_args()
+
+    _check()
+    width = max(len(name) for name in CASES)
+    for name, func in CASES.items():
+        number = args.number // 100 if "x100" in name else args.number
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"{name:<{width}}  {seconds / number * 1e9:9.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Fuzz the notification decoders the way a flaky BLE proxy would.
+
+Runs without Home Assistant or bleak installed:
+
+    python scripts/fuzz_protocol.py [--frames N] [--seed S] [--max-us US]
+
+The long-run driver for the properties in tests/protocol_fuzz.py (the test
+suite runs a seeded, bounded pass of them in tests/test_fuzz.py). For every
+model profile it feeds random, truncated, bit-flipped and
+well-formed-but-odd frames for Treadmill Data, the profile's status
+characteristic and the Control Point through the coordinator's decode path
+and checks that nothing raises, that every invariant holds, and that the
+worst single frame decodes within ``--max-us`` microseconds (a frame over
+the bound is re-timed on a fresh pipeline, so one scheduler hiccup doesn't
+fail the run).
+
+It prints the malformed-frame counts the coordinator would report and
+exits 1 with the offending frame on the first violation.
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+
+from protocol_fuzz import FEATURE_SETS, FuzzFailure, Pipeline, frames, valid_frames  # noqa: E402
+
+import walkingpad_protocol as wp  # noqa: E402
+
+
+def _retime(profile: wp.ModelProfile, features: int | None, characteristic: str, frame: bytes) -> int:
+    """Best of a few runs of one frame on a fresh pipeline."""
+    best = None
+    for _ in range(5):
+        pipeline = Pipeline(profile, features)
+        started = time.perf_counter_ns()
+        pipeline.feed(characteristic, frame)
+        elapsed = time.perf_counter_ns() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _fuzz(profile: wp.ModelProfile, features: int | None, args, rng: random.Random) -> tuple[dict, dict]:
+    pipeline = Pipeline(profile, features)
+    worst = {}
+    bound_ns = args.max_us * 1000
+    for characteristic, seeds in valid_frames(profile).items():
+        slowest = 0
+        for frame in frames(rng, seeds, args.frames):
+            pipeline.now += rng.uniform(0.0, 2.0)
+            started = time.perf_counter_ns()
+            pipeline.feed(characteristic, frame)
+            elapsed = time.perf_counter_ns() - started
+            if elapsed > bound_ns:
+                # Could be the scheduler rather than the frame — a slow frame stays slow
+                elapsed = _retime(profile, features, characteristic, frame)
+            if elapsed > slowest:
+                slowest = elapsed
+        worst[characteristic] = slowest / 1000
+    return pipeline.malformed, worst
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20_000, help="frames per characteristic per profile")
+    parser.add_argument("--seed", type=int, default=None, help="random seed (default: random, printed)")
+    parser.add_argument("--max-us", type=float, default=500.0, help="worst-case time per frame (µs)")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(1 << 32)
+    rng = random.Random(seed)
+    print(f"seed {seed}")
+    failed = False
+    # GC pauses are not the decoders' cost — keep them out of the worst case
+    gc.disable()
+    try:
+        for profile in wp.PROFILES.values():
+            for features in FEATURE_SETS:
+                try:
+                    malformed, worst = _fuzz(profile, features, args, rng)
+                except FuzzFailure as exc:
+                    print(f"FAIL: {exc}")
+                    sys.exit(1)
+                label = f"{profile.model} (features {'all' if features is None else hex(features)})"
+                print(f"{label:<44}  malformed {malformed}")
+                for characteristic, micros in worst.items():
+                    over = micros > args.max_us
+                    failed |= over
+                    print(f"  {characteristic:<15} worst {micros:8.1f} µs{'  OVER BOUND' if over else ''}")
+    finally:
+        gc.enable()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""Soak test — run the integration against simulated pads and fail on growth.
+
+    pip install pytest-homeassistant-custom-component
+    python scripts/soak_walkingpad.py --pads 2 --cycles 2000
+
+Sets the integration up in an in-process Home Assistant (the same test
+instance custom component test suites use) with SimulatedPad standing in
+for the BLE stack, then loops session cycles on every pad: start → speed
+change → pause → finish, with link drops, zombie links, options changes and
+config entry reloads mixed in. Every ``--sample-every`` cycles it records
+RSS, live coordinators, coordinator / websocket / bus listeners, timers,
+tasks and per-packet handler latency; at the end it prints the tracemalloc
+allocations that grew most and exits 1 if anything kept growing.
+
+Statistics go to a real recorder backed by a SQLite file in the temporary
+config directory. The harness swaps the integration's WalkingPadCoordinator
+for SoakCoordinator while it runs; backoff delays and
+the watchdog interval are shortened through the coordinator's constructor
+and the stale timeout through the options, so a reconnect takes
+milliseconds, and the pads run their own clock ``--time-scale`` times
+faster than wall time. SoakCoordinator only overrides coordinator methods;
+the harness refuses to start if one of them no longer exists upstream.
+"""
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import weakref
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+from homeassistant import loader  # noqa: E402
+from homeassistant.components.recorder import get_instance  # noqa: E402
+from homeassistant.helpers import recorder as recorder_helper  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+import custom_components.kingsmith_walkingpad as integration  # noqa: E402
+from custom_components.kingsmith_walkingpad import coordinator as coordinator_module  # noqa: E402
+from custom_components.kingsmith_walkingpad.const import (  # noqa: E402
+    DOMAIN,
+    CONF_COALESCE_WINDOW,
+    CONF_FAST_SPEED_WRITES,
+    CONF_HEIGHT,
+    CONF_STALE_TIMEOUT,
+    CONF_STATUS_DEBOUNCE,
+    CONF_WATCH_HR_ENTITY,
+    CONF_WEIGHT_ENTITY,
+)
+from custom_components.kingsmith_walkingpad.walkingpad_protocol import PROFILES  # noqa: E402
+from custom_components.kingsmith_walkingpad.walkingpad_protocol.simulator import SimulatedPad  # noqa: E402
+
+WEIGHT_ENTITY = "sensor.soak_weight"
+HR_ENTITY = "sensor.soak_heart_rate"
+WAIT_TIMEOUT = 10.0  # s for any single state change before the soak gives up
+WATCHDOG_INTERVAL = 0.25
+BACKOFF_DELAYS = (0.05, 0.1, 0.2)
+
+# Options cycled through on every options change — each one exercises a different dispatch path
+OPTION_VARIANTS = (
+    {},
+    {CONF_COALESCE_WINDOW: 0},
+    {CONF_COALESCE_WINDOW: 100, CONF_FAST_SPEED_WRITES: True},
+)
+
+# Counters that must not end above their baseline (plus slack)
+GROWTH_SLACK = {
+    "coordinators": 0,
+    "listeners": 0,
+    "frame_listeners": 0,
+    "bus_listeners": 0,
+    "timers": 8,
+    "tasks": 4,
+}
+
+_COORDINATORS: "weakref.WeakSet[SoakCoordinator]" = weakref.WeakSet()
+_LATENCIES: list[float] = []
+
+
+class SoakError(Exception):
+    """A pad didn't reach the expected state in time."""
+
+
+class SimDevice:
+    """What _select_ble_device hands to async_establish_connection."""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.name = address
+
+
+class SoakCoordinator(coordinator_module.WalkingPadCoordinator):
+    """The real coordinator with the HA Bluetooth stack replaced and packet timing added."""
+
+    def __init__(self, hass, config, pad_options: dict):
+        super().__init__(
+            hass, config, watchdog_interval=WATCHDOG_INTERVAL, backoff_delays=BACKOFF_DELAYS
+        )
+        self.pad_options = pad_options  # SimulatedPad keyword arguments, from the command line
+        _COORDINATORS.add(self)
+
+    def _start_advertisement_tracking(self) -> None:
+        pass  # no HA Bluetooth integration — the simulated pads don't advertise
+
+    def _select_ble_device(self):
+        return SimDevice(self.mac), "soak"
+
+    async def async_establish_connection(self, ble_device):
+        pad = SimulatedPad(self.profile, disconnected_callback=self._on_disconnected, **self.pad_options)
+        await pad.connect()
+        return pad
+
+    def _notification_handler(self, sender, data):
+        started = time.perf_counter()
+        super()._notification_handler(sender, data)
+        _LATENCIES.append(time.perf_counter() - started)
+
+
+def _check_overrides() -> None:
+    """Refuse to run when SoakCoordinator overrides something the coordinator no longer has."""
+    base = coordinator_module.WalkingPadCoordinator
+    stale = [
+        name for name in vars(SoakCoordinator)
+        if not name.startswith("__") and not hasattr(base, name)
+    ]
+    if stale:
+        raise SystemExit(f"SoakCoordinator overrides names WalkingPadCoordinator no longer has: {stale}")
+
+
+def _use_soak_coordinator(args) -> None:
+    """Have the integration build SoakCoordinators for every entry (and every reload)."""
+    pad_options = {"rate": args.rate, "time_scale": args.time_scale}
+    integration.WalkingPadCoordinator = partial(SoakCoordinator, pad_options=pad_options)
+
+
+async def _setup_recorder(hass, config_dir: str) -> None:
+    recorder_helper.async_initialize_recorder(hass)
+    db_url = f"sqlite:///{config_dir}/soak.db"
+    if not await async_setup_component(hass, "recorder", {"recorder": {"db_url": db_url, "commit_interval": 0}}):
+        raise SystemExit("recorder setup failed")
+    await get_instance(hass).async_db_ready
+
+
+def _options(args, variant: int) -> dict:
+    return {
+        CONF_STATUS_DEBOUNCE: 0,
+        CONF_STALE_TIMEOUT: args.stale_timeout,
+        CONF_WATCH_HR_ENTITY: HR_ENTITY,
+        **OPTION_VARIANTS[variant % len(OPTION_VARIANTS)],
+    }
+
+
+async def _wait_for(predicate, what: str) -> None:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise SoakError(f"timed out waiting for {what}")
+        await asyncio.sleep(0.02)
+
+
+async def _reconnected(coordinator, old_client, what: str) -> None:
+    await _wait_for(
+        lambda: coordinator.is_connected and coordinator.client is not old_client, what
+    )
+
+
+async def _cycle(hass, entry, args, n: int) -> None:
+    """One session on one pad, with the fault or config change due this cycle."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    await _wait_for(lambda: coordinator.is_connected, f"{coordinator.mac} to connect")
+    await coordinator.send_start()
+    await _wait_for(lambda: coordinator.data.training_status == "playing", "playing")
+    await asyncio.sleep(args.play)
+    await coordinator.send_set_speed(random.uniform(coordinator.speed_min, coordinator.speed_max))
+
+    client = coordinator.client
+    if args.zombie_every and n % args.zombie_every == 0:
+        client.go_silent()
+        await _reconnected(coordinator, client, "zombie link recovery")
+    elif args.drop_every and n % args.drop_every == 0:
+        client.drop_link()
+        await _reconnected(coordinator, client, "reconnect after a drop")
+
+    await coordinator.send_pause()
+    await _wait_for(lambda: coordinator.data.training_status == "paused", "paused")
+    await coordinator.send_finish()
+    await _wait_for(lambda: coordinator.data.training_status == "idle", "idle")
+
+    if args.options_every and n % args.options_every == 0:
+        # What the options flow does: store the options, apply them to the live coordinator
+        options = _options(args, n // args.options_every)
+        hass.config_entries.async_update_entry(entry, options=options)
+        coordinator.load_options(options)
+    if args.reload_every and n % args.reload_every == 0:
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _rss_mb() -> float | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return None
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _sample(hass, cycle: int) -> dict:
+    gc.collect()
+    coordinators = list(_COORDINATORS)
+    latencies, _LATENCIES[:] = _LATENCIES[:], []
+    tasks = asyncio.all_tasks()
+    return {
+        "cycle": cycle,
+        "rss_mb": _rss_mb(),
+        "coordinators": len(coordinators),
+        "listeners": sum(len(c._listeners) for c in coordinators),
+        "frame_listeners": sum(len(c._frame_listeners) for c in coordinators),
+        "bus_listeners": sum(hass.bus.async_listeners().values()),
+        "timers": len(getattr(hass.loop, "_scheduled", ())),
+        "tasks": len(tasks),
+        "link_tasks": sum(1 for task in tasks if task.get_name() == "walkingpad link"),
+        "packets": len(latencies),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 3),
+    }
+
+
+def _failures(baseline: dict, last: dict, args) -> list[str]:
+    failures = [
+        f"{key} grew {baseline[key]} -> {last[key]}"
+        for key, slack in GROWTH_SLACK.items()
+        if last[key] > baseline[key] + slack
+    ]
+    if last["link_tasks"] > args.pads:
+        failures.append(f"{last['link_tasks']} link actors for {args.pads} pads")
+    if baseline["rss_mb"] is not None and last["rss_mb"] - baseline["rss_mb"] > args.max_rss_growth:
+        failures.append(f"RSS grew {baseline['rss_mb']:.1f} -> {last['rss_mb']:.1f} MB")
+    if last["p99_ms"] > max(baseline["p99_ms"] * args.latency_factor, 1.0):
+        failures.append(f"p99 packet latency {baseline['p99_ms']} -> {last['p99_ms']} ms")
+    return failures
+
+
+async def _soak(args) -> int:
+    profiles = [PROFILES[model] for model in args.models]
+    with tempfile.TemporaryDirectory() as config_dir:
+        # Newer pytest-homeassistant-custom-component releases call it config_dir
+        dir_arg = "config_dir" if "config_dir" in inspect.signature(async_test_home_assistant).parameters else "storage_dir"
+        async with async_test_home_assistant(**{dir_arg: config_dir}) as hass:
+            # Load custom_components/ from this checkout; the websocket API
+            # dependency isn't under test and counts as already set up
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            hass.config.components.add("websocket_api")
+            await _setup_recorder(hass, config_dir)
+            hass.states.async_set(WEIGHT_ENTITY, "80")
+            hass.states.async_set(HR_ENTITY, "110")
+
+            entries = []
+            for index in range(args.pads):
+                profile = profiles[index % len(profiles)]
+                mac = f"5A:0A:00:00:00:{index:02X}"
+                entry = MockConfigEntry(
+                    domain=DOMAIN,
+                    title=f"Soak pad {index}",
+                    unique_id=mac,
+                    data={
+                        "mac_address": mac,
+                        "device_name": f"Soak pad {index}",
+                        "model": profile.model,
+                        CONF_HEIGHT: 180,
+                        CONF_WEIGHT_ENTITY: WEIGHT_ENTITY,
+                    },
+                    options=_options(args, 0),
+                )
+                entry.add_to_hass(hass)
+                if not await hass.config_entries.async_setup(entry.entry_id):
+                    print(f"setup failed for {profile.model}", flush=True)
+                    return 1
+                entries.append(entry)
+            await hass.async_block_till_done()
+
+            samples = []
+            baseline = None
+            baseline_snapshot = None
+            started = time.monotonic()
+            for cycle in range(1, args.cycles + 1):
+                try:
+                    await asyncio.gather(*(_cycle(hass, entry, args, cycle) for entry in entries))
+                except SoakError as exc:
+                    print(f"cycle {cycle}: {exc}", flush=True)
+                    return 1
+                if cycle % args.sample_every and cycle != args.cycles:
+                    continue
+                sample = _sample(hass, cycle)
+                samples.append(sample)
+                print(json.dumps(sample), flush=True)
+                if baseline is None and cycle >= args.warmup:
+                    baseline = sample
+                    if tracemalloc.is_tracing():
+                        baseline_snapshot = tracemalloc.take_snapshot()
+
+            for entry in entries:
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+            # The test instance doesn't stop itself — without this the recorder thread keeps the process alive
+            await hass.async_stop(force=True)
+
+    last = samples[-1]
+    print(f"{args.cycles} cycles x {args.pads} pads in {time.monotonic() - started:.0f}s", flush=True)
+    if baseline_snapshot is not None:
+        print("top allocation growth since baseline:")
+        for stat in tracemalloc.take_snapshot().compare_to(baseline_snapshot, "lineno")[:args.top]:
+            print(f"  {stat}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report:
+            report.writelines(json.dumps(sample) + "\n" for sample in samples)
+    if baseline is None or baseline is last:
+        print("not enough cycles after warm-up to compare against a baseline")
+        return 0
+    failures = _failures(baseline, last, args)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pads", type=int, default=2, help="simulated pads / config entries")
+    parser.add_argument("--models", nargs="+", default=["WalkingPad MC11", "WalkingPad MC21"],
+                        choices=sorted(PROFILES), help="profiles, assigned to pads round-robin")
+    parser.add_argument("--cycles", type=int, default=1000, help="session cycles per pad")
+    parser.add_argument("--warmup", type=int, default=50, help="cycles before the baseline sample")
+    parser.add_argument("--sample-every", type=int, default=50, help="cycles between samples")
+    parser.add_argument("--rate", type=float, default=10.0, help="notifications per second per pad")
+    parser.add_argument("--time-scale", type=float, default=60.0, help="pad clock speed-up")
+    parser.add_argument("--play", type=float, default=0.3, help="seconds of walking per cycle")
+    parser.add_argument("--stale-timeout", type=float, default=1.0, help="zombie link timeout (s)")
+    parser.add_argument("--drop-every", type=int, default=7, help="drop the link every N cycles (0 = never)")
+    parser.add_argument("--zombie-every", type=int, default=11, help="go silent every N cycles (0 = never)")
+    parser.add_argument("--options-every", type=int, default=5, help="change options every N cycles")
+    parser.add_argument("--reload-every", type=int, default=25, help="reload the entries every N cycles")
+    parser.add_argument("--max-rss-growth", type=float, default=20.0, help="allowed RSS growth (MB)")
+    parser.add_argument("--latency-factor", type=float, default=3.0, help="allowed p99 latency growth")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip allocation tracking (faster)")
+    parser.add_argument("--top", type=int, default=10, help="allocation sites to print")
+    parser.add_argument("--report", help="write every sample to this JSON-lines file")
+    parser.add_argument("--verbose", action="store_true", help="keep the integration's warnings")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if not args.verbose:
+        # Every injected drop logs a warning — keep the samples readable
+        logging.getLogger("custom_components.kingsmith_walkingpad").setLevel(logging.ERROR)
+    if not args.no_tracemalloc:
+        tracemalloc.start(10)
+    _check_overrides()
+    _use_soak_coordinator(args)
+    sys.exit(asyncio.run(_soak(args)))
+
+
+if __name__ == "__main__":
+    main()
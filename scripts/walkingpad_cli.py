@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Drive and monitor a WalkingPad from the command line, without Home Assistant.
+
+    python scripts/walkingpad_cli.py scan
+    python scripts/walkingpad_cli.py monitor AA:BB:CC:DD:EE:FF --capture run.jsonl
+    python scripts/walkingpad_cli.py start AA:BB:CC:DD:EE:FF --model "WalkingPad MC21"
+    python scripts/walkingpad_cli.py speed AA:BB:CC:DD:EE:FF 4.5
+    python scripts/walkingpad_cli.py monitor sim --start --duration 10
+
+Built on walkingpad_protocol; bleak is only imported when talking to a real
+pad, so ``sim`` (the in-process simulated pad) works with nothing installed.
+Captures are JSON lines: {"t": seconds since start, "uuid": ..., "hex": ...}.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from _standalone import load_protocol
+
+load_protocol()
+
+import walkingpad_protocol as wp  # noqa: E402
+from walkingpad_protocol.simulator import SimulatedPad  # noqa: E402
+
+SIM_ADDRESS = "sim"
+
+
+class Session:
+    """One connection to a pad (real or simulated) plus decoding and capture."""
+
+    def __init__(self, args):
+        self.args = args
+        self.client = None
+        self.profile: wp.ModelProfile | None = None
+        self.decoder: wp.StatusDecoder | None = None
+        self.capture = open(args.capture, "a", encoding="utf-8") if args.capture else None
+        self.started = time.monotonic()
+
+    async def open(self) -> None:
+        args = self.args
+        if args.address == SIM_ADDRESS:
+            self.profile = wp.get_profile(args.model or "WalkingPad MC11")
+            self.client = SimulatedPad(self.profile, rate=args.sim_rate, time_scale=args.sim_time_scale)
+            await self.client.connect()
+        else:
+            from bleak import BleakClient, BleakScanner
+
+            device = await BleakScanner.find_device_by_address(args.address, timeout=args.timeout)
+            if device is None:
+                raise SystemExit(f"{args.address} not found")
+            self.profile = wp.get_profile(args.model) if args.model else wp.profile_for_ble_name(device.name)
+            self.client = BleakClient(device)
+            await self.client.connect(timeout=args.timeout)
+        self.decoder = wp.StatusDecoder(self.profile, debounce=0)
+        _print(f"connected to {args.address} as {self.profile.model}")
+
+        profile = self.profile
+        await self.client.start_notify(profile.data_uuid, self._on_data)
+        await self.client.start_notify(profile.status_uuid, self._on_status)
+        await self.client.start_notify(profile.control_uuid, self._on_control)
+        if profile.auth is not None:
+            await self.client.write_gatt_char(*profile.auth, response=True)
+
+    async def close(self) -> None:
+        if self.client is not None and self.client.is_connected:
+            await self.client.disconnect()
+        if self.capture is not None:
+            self.capture.close()
+
+    async def command(self, cmd: bytes, label: str) -> None:
+        profile = self.profile
+        sent = time.monotonic()
+        if profile.needs_control_request:
+            await self.client.write_gatt_char(profile.control_uuid, wp.CMD_CONTROL_REQUEST, response=True)
+        await self.client.write_gatt_char(profile.control_uuid, cmd, response=True)
+        _print(f"{label}: {cmd.hex(' ')} ({(time.monotonic() - sent) * 1000:.0f} ms)")
+
+    def _record(self, uuid: str, data) -> None:
+        if self.capture is not None:
+            self.capture.write(json.dumps({
+                "t": round(time.monotonic() - self.started, 3), "uuid": uuid, "hex": bytes(data).hex(),
+            }) + "\n")
+
+    def _on_data(self, sender, data) -> None:
+        self._record(self.profile.data_uuid, data)
+        parsed = self.profile.parse_treadmill(data)
+        if parsed is None:
+            _print(f"data    malformed {bytes(data).hex(' ')}")
+        else:
+            speed, distance, energy, elapsed, incline = parsed
+            _print(f"data    speed={speed} km/h  distance={distance} m  energy={energy} kcal  time={elapsed} s"
+                   + (f"  incline={incline}%" if incline is not None else ""))
+
+    def _on_status(self, sender, data) -> None:
+        self._record(self.profile.status_uuid, data)
+        transition = self.decoder.feed(data, time.monotonic())
+        if transition is not None:
+            _print(f"status  {transition.previous} -> {transition.status} ({transition.raw})")
+
+    def _on_control(self, sender, data) -> None:
+        self._record(self.profile.control_uuid, data)
+        _print(f"control {bytes(data).hex(' ')} -> {wp.decode_control_response(data)}")
+
+
+def _print(message: str) -> None:
+    print(message, flush=True)
+
+
+async def _scan(args) -> None:
+    from bleak import BleakScanner
+
+    prefixes = wp.supported_name_prefixes()
+    for device in await BleakScanner.discover(timeout=args.timeout):
+        if device.name and device.name.startswith(prefixes):
+            _print(f"{device.address}  {device.name}  ({wp.profile_for_ble_name(device.name).model})")
+
+
+async def _run(args) -> None:
+    if args.action == "scan":
+        await _scan(args)
+        return
+    session = Session(args)
+    await session.open()
+    profile = session.profile
+    try:
+        if args.action == "start" or (args.action == "monitor" and args.start):
+            await session.command(profile.start_cmd, "start")
+        elif args.action == "pause":
+            await session.command(profile.pause_cmd, "pause")
+        elif args.action == "finish":
+            await session.command(profile.finish_cmd, "finish")
+        elif args.action == "speed":
+            kmh = max(profile.speed_min, min(profile.speed_max, args.kmh))
+            await session.command(profile.encode_speed(kmh), f"speed {kmh}")
+        if args.action == "monitor":
+            await asyncio.sleep(args.duration if args.duration else float("inf"))
+        else:
+            await asyncio.sleep(args.linger)   # collect the responses
+    finally:
+        await session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timeout", type=float, default=10.0, help="scan / connect timeout (s)")
+    sub = parser.add_subparsers(dest="action", required=True)
+    sub.add_parser("scan", help="list nearby supported pads")
+    for action in ("monitor", "start", "pause", "finish", "speed"):
+        cmd = sub.add_parser(action)
+        cmd.add_argument("address", help=f"pad MAC address, or '{SIM_ADDRESS}' for the simulated pad")
+        if action == "speed":
+            cmd.add_argument("kmh", type=float)
+        cmd.add_argument("--model", choices=sorted(wp.PROFILES), help="profile (default: from the BLE name)")
+        cmd.add_argument("--capture", help="append raw frames to this JSON-lines file")
+        cmd.add_argument("--linger", type=float, default=1.0, help="seconds to wait for responses")
+        cmd.add_argument("--sim-rate", type=float, default=1.0, help="simulated notifications per second")
+        cmd.add_argument("--sim-time-scale", type=float, default=1.0, help="simulated pad clock speed-up")
+        if action == "monitor":
+            cmd.add_argument("--duration", type=float, help="stop after this many seconds")
+            cmd.add_argument("--start", action="store_true", help="send start before monitoring")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
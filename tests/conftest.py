@@ -0,0 +1,18 @@
+# tests/conftest.py
+"""Tests for the HA-free core: walkingpad_protocol and the pure helper modules.
+
+    pip install -r requirements_test.txt
+    python -m pytest tests
+
+Nothing here needs Home Assistant or bleak. The modules are loaded the way
+the scripts load them (scripts/_standalone.py), so the component directory
+never lands on sys.path.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from _standalone import load_protocol  # noqa: E402
+
+load_protocol()
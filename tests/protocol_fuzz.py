@@ -0,0 +1,166 @@
+# tests/protocol_fuzz.py
+"""Frame mutators and the coordinator's decode path for fuzzing, minus Home Assistant.
+
+Shared by tests/test_fuzz.py (seeded, bounded, runs with the suite) and
+scripts/fuzz_protocol.py (long random runs with a per-frame time bound).
+Every frame goes through the same path the coordinator uses (FTMS flags →
+fixed layout → telemetry → session counters, StatusDecoder,
+decode_control_response) and Pipeline checks after each one that decoded
+values, telemetry, session deltas and the status machine stay in range and
+consistent.
+"""
+import random
+
+from _standalone import load_module, load_protocol
+
+load_protocol()
+
+import walkingpad_protocol as wp  # noqa: E402
+from walkingpad_protocol.simulator import SimulatedPad  # noqa: E402
+
+SessionCounters = load_module("session").SessionCounters
+WalkingPadTelemetry = load_module("telemetry").WalkingPadTelemetry
+
+STATUSES = {"unknown", "playing", "paused", "idle", "countdown"}
+CONTROL_STATES = {None, "playing", "paused", "idle"}
+MAX_FRAME = 24
+# Unknown features (decode everything) and the features the simulated pads report
+FEATURE_SETS = (None, wp.ftms.FEATURE_TOTAL_DISTANCE | wp.ftms.FEATURE_ELAPSED_TIME)
+
+
+class FuzzFailure(Exception):
+    """A frame broke an invariant."""
+
+
+def valid_frames(profile: wp.ModelProfile) -> dict[str, list[bytes]]:
+    """Well-formed frames per characteristic, used as seeds for mutation."""
+    pad = SimulatedPad(profile)
+    pad.status, pad.speed, pad.distance, pad.energy, pad.elapsed = "playing", 6.0, 1234, 56, 789
+    status = [
+        bytes([key >> 8, key & 0xFF]) for key in profile.status_table if key >> 8 not in (0x04, 0x05)
+    ] + [b"\x04\x01", b"\x05\x32", b"\x03\x0e\x33", b"\x03\x0e\x31"]
+    return {
+        "treadmill_data": [
+            pad.treadmill_frame(),
+            bytes([0xFF, 0xFF, 0x2C, 0x01, 0xF4, 0x01, 0x00, 0x15, 0, 0, 0, 0, 0x2C, 0x01, 0, 0, 0]),
+            bytes([0xFF, 0xFF, 0x2C, 0x01, 0xF4, 0x01, 0x15, 0, 0, 0, 0, 0, 0x2C, 0x01]),
+        ],
+        "status": status,
+        "control_point": [
+            bytes([0x80, opcode, result]) + tail
+            for opcode in (0x00, 0x02, 0x07, 0x08)
+            for result in (0x01, 0x03)
+            for tail in (b"", b"\x01", b"\x02", b"\x58\x02")
+        ],
+    }
+
+
+def frames(rng: random.Random, seeds: list[bytes], count: int):
+    """Mutations of the seed frames mixed with pure noise."""
+    for _ in range(count):
+        roll = rng.random()
+        seed = rng.choice(seeds)
+        if roll < 0.25:
+            yield rng.randbytes(rng.randint(0, MAX_FRAME))
+        elif roll < 0.45:
+            yield seed[:rng.randint(0, len(seed))]
+        elif roll < 0.7:
+            frame = bytearray(seed)
+            for _ in range(rng.randint(1, 3)):
+                if frame:
+                    frame[rng.randrange(len(frame))] ^= 1 << rng.randrange(8)
+            yield bytes(frame)
+        elif roll < 0.85:
+            # Random FTMS flags with exactly the length they describe
+            flags = rng.getrandbits(16)
+            length = wp.ftms.treadmill_layout(flags)[5]
+            yield flags.to_bytes(2, "little") + rng.randbytes(length - 2)
+        else:
+            yield seed + rng.randbytes(rng.randint(1, 4))
+
+
+class Pipeline:
+    """The coordinator's per-characteristic decode path, minus Home Assistant."""
+
+    def __init__(self, profile: wp.ModelProfile, features: int | None):
+        self.profile = profile
+        self.features = features
+        self.telemetry = WalkingPadTelemetry()
+        self.counters = SessionCounters()
+        self.decoder = wp.StatusDecoder(profile, debounce=1.0)
+        self.malformed = {"treadmill_data": 0, "status": 0, "control_point": 0}
+        self.now = 0.0
+
+    def feed(self, characteristic: str, frame: bytes) -> None:
+        """Decode one frame; any exception becomes a FuzzFailure naming the frame."""
+        try:
+            getattr(self, characteristic)(frame)
+        except Exception as exc:
+            raise FuzzFailure(
+                f"{self.profile.model} {characteristic} {frame.hex(' ') or '<empty>'}: "
+                f"{type(exc).__name__}: {exc}"
+            ) from exc
+
+    def treadmill_data(self, data: bytes) -> None:
+        parsed = self.profile.parse_treadmill(data, self.features)
+        if parsed is None:
+            self.malformed["treadmill_data"] += 1
+            return
+        speed, distance, energy, elapsed, incline = parsed
+        check(speed is None or 0 <= speed <= 655.35, f"speed {speed}")
+        check(distance is None or 0 <= distance < 1 << 24, f"distance {distance}")
+        check(energy is None or 0 <= energy <= 0xFFFF, f"energy {energy}")
+        check(elapsed is None or 0 <= elapsed <= 0xFFFF, f"elapsed {elapsed}")
+        check(incline is None or -3276.8 <= incline <= 3276.7, f"incline {incline}")
+
+        telemetry = self.telemetry
+        version = telemetry.version
+        telemetry.apply_treadmill(
+            telemetry.speed if speed is None else speed,
+            telemetry.distance if distance is None else distance,
+            telemetry.energy if energy is None else energy,
+            telemetry.elapsed_time if elapsed is None else elapsed,
+            telemetry.incline if incline is None else incline,
+        )
+        check(telemetry.version in (version, version + 1), "telemetry version skipped")
+        check(max(telemetry.stamps) <= telemetry.version, "field stamped ahead of version")
+
+        d_distance, d_energy, d_elapsed, segment = self.counters.advance(
+            telemetry.distance, telemetry.energy, telemetry.elapsed_time, self.now
+        )
+        check(min(d_distance, d_energy, d_elapsed) >= 0, f"negative delta {(d_distance, d_energy, d_elapsed)}")
+        check(segment is None or segment.end >= segment.start, "gap segment ends before it starts")
+
+    def status(self, data: bytes) -> None:
+        decoder = self.decoder
+        malformed = decoder.malformed
+        transition = decoder.feed(data, self.now)
+        if decoder.malformed != malformed:
+            self.malformed["status"] += 1
+        if transition is None:
+            transition = decoder.confirm(self.now)
+        if transition is not None:
+            check(transition.status in STATUSES, f"transition to {transition.status}")
+            check(transition.duration is None or transition.duration >= 0, "negative status duration")
+            self.telemetry.apply_status(transition.status, transition.raw, transition.countdown)
+        check(decoder.status in STATUSES, f"decoder status {decoder.status}")
+        check(
+            decoder.pending is None or {decoder.status, decoder.pending[0]} == {"playing", "paused"},
+            f"pending {decoder.pending} from {decoder.status}",
+        )
+        check(self.telemetry.training_status == decoder.status, "telemetry and decoder disagree")
+
+    def control_point(self, data: bytes) -> None:
+        decoded = wp.decode_control_response(data)
+        if decoded is None:
+            self.malformed["control_point"] += 1
+            return
+        opcode, result, state = decoded
+        check(0 <= opcode <= 0xFF, f"opcode {opcode}")
+        check(result is None or 0 <= result <= 0xFF, f"result {result}")
+        check(state in CONTROL_STATES, f"control state {state}")
+
+
+def check(condition: bool, message: str) -> None:
+    if not condition:
+        raise FuzzFailure(message)
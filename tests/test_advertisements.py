@@ -0,0 +1,29 @@
+# tests/test_advertisements.py
+"""Replays tests/fixtures/advertisements.json through the passive-mode decode path."""
+import json
+from pathlib import Path
+
+import pytest
+
+import walkingpad_protocol as wp
+
+SESSIONS = json.loads((Path(__file__).parent / "fixtures" / "advertisements.json").read_text())["sessions"]
+
+
+@pytest.mark.parametrize("session", SESSIONS, ids=[session["name"] for session in SESSIONS])
+def test_replay(session):
+    available = None
+    for advertisement in session["advertisements"]:
+        service_data = {uuid: bytes.fromhex(value) for uuid, value in advertisement["service_data"].items()}
+        # Same fallback as the coordinator: no FTMS data keeps the last known state
+        decoded = wp.advertised_availability(service_data)
+        if decoded is not None:
+            available = decoded
+        assert available == advertisement["expected_available"], advertisement
+        assert wp.profile_for_ble_name(advertisement["local_name"]).model == session["expected_model"]
+
+
+def test_service_data_fields():
+    assert wp.parse_ftms_service_data(bytes([0x01, 0x01, 0x00])) == (True, 1)
+    assert wp.parse_ftms_service_data(bytes([0x00, 0x00, 0x01])) == (False, 0x100)
+    assert wp.parse_ftms_service_data(b"\x01\x01") is None
@@ -0,0 +1,21 @@
+# tests/test_control_point.py
+import pytest
+
+import walkingpad_protocol as wp
+
+
+@pytest.mark.parametrize("data, expected", [
+    (b"\x80\x07\x01", (0x07, 0x01, "playing")),
+    (b"\x80\x08\x01\x02", (0x08, 0x01, "paused")),
+    (b"\x80\x08\x01", (0x08, 0x01, "idle")),
+    (b"\x80\x08", (0x08, None, "paused")),
+    (b"\x80\x02\x01", (0x02, 0x01, None)),
+    (b"\x80\x00\x03", (0x00, 0x03, None)),
+])
+def test_decode_control_response(data, expected):
+    assert wp.decode_control_response(data) == expected
+
+
+@pytest.mark.parametrize("data", [b"", b"\x80", b"\x07\x01\x01"])
+def test_not_a_response(data):
+    assert wp.decode_control_response(data) is None
@@ -0,0 +1,74 @@
+import pytest
+
+from _standalone import load_module
+
+estimators = load_module("estimators")
+
+
+# kcal/min for 80 kg — ACSM: VO2 = 3.5 + h·v + g·v·grade (ml/kg/min, v in m/min), 5 kcal per litre O2
+@pytest.mark.parametrize("speed, grade, kcal", [
+    (5.0, 0, 4.7333),       # walking: 3.5 + 0.1 · 83.3
+    (5.0, 5, 7.7333),       # + 1.8 · 83.3 · 0.05
+    (1.0, 0, 2.0667),       # creeping belt still costs the resting VO2
+    (8.04, 0, 6.76),        # 134 m/min — still the walking equation
+    (10.0, 0, 14.7333),     # running: 3.5 + 0.2 · 166.7
+    (10.0, 2, 15.9333),     # + 0.9 · 166.7 · 0.02
+    (0.0, 0, 0.0),
+    (0.0, 10, 0.0),
+])
+def test_acsm_kcal_per_minute(speed, grade, kcal):
+    assert estimators.EnergyEstimator(80).kcal_per_minute(speed, grade) == pytest.approx(kcal, abs=1e-4)
+
+
+def test_energy_needs_weight():
+    estimator = estimators.EnergyEstimator()
+    assert estimator.kcal_per_minute(5.0) == 0.0
+    assert estimator.add(60, 5.0) == 0.0 and estimator.session_energy == 0.0
+
+
+def test_energy_integrates_per_packet():
+    estimator = estimators.EnergyEstimator(80)
+    for _ in range(60):
+        estimator.add(1, 5.0, 5)
+    assert estimator.session_energy == pytest.approx(7.7333, abs=1e-3)
+    assert estimator.add(0, 5.0) == 0.0 and estimator.rate == pytest.approx(4.7333, abs=1e-4)
+    assert estimator.add(10, 0.0) == 0.0
+    estimator.reset_session()
+    assert estimator.session_energy == 0.0
+
+
+# Step length for a 1.8 m walker: 0.415 · height · (v / 1.34 m/s)^0.42, v floored at 0.5 m/s
+@pytest.mark.parametrize("speed, length", [
+    (4.824, 0.747),                             # reference speed → 0.415 · height
+    (6.0, 0.747 * (6.0 / 3.6 / 1.34) ** 0.42),
+    (1.0, 0.747 * (0.5 / 1.34) ** 0.42),        # below 0.5 m/s the floor length
+    (0.0, 0.747 * (0.5 / 1.34) ** 0.42),
+])
+def test_step_length(speed, length):
+    assert estimators.StepEstimator(1.8).step_length(speed) == pytest.approx(length)
+
+
+def test_step_length_without_height():
+    assert estimators.StepEstimator().step_length(5.0) == estimators.STEP_LENGTH_METERS
+
+
+def test_steps_and_cadence():
+    steps = estimators.StepEstimator(1.8)
+    steps.add(74.7, 4.824, 74.7)
+    assert steps.session_steps == 100
+    assert steps.cadence == pytest.approx(4.824 / 3.6 / 0.747 * 60)
+    # Distance the pad counted before we joined is added at the current speed
+    steps.add(7.47, 4.824, 747.1)
+    assert steps.session_steps == 1000
+    steps.add(0, 0.0, 747.1)
+    assert steps.session_steps == 1000
+
+
+def test_calibration_is_clamped_and_weighted():
+    steps = estimators.StepEstimator(1.8)
+    assert not steps.calibrate(5000)                # too few steps yet
+    steps.add(747.0, 4.824, 747.0)
+    assert steps.calibrate(3000)                    # ratio 3.0 clamps to 1.6
+    assert steps.calibration == pytest.approx(1 + (1.6 - 1) * 0.3)
+    assert steps.session_steps == int(1000 * steps.calibration)
+    assert not steps.calibrate(None)
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import struct
+
+import pytest
+
+from _standalone import load_module
+
+wire = load_module("export_wire")
+
+SAMPLES = [[1700000000.5, 3.25, 120, 60, 110], [1700000001.5, 3.5, 121, 61, None]]
+CLIENT_ID = "kingsmith_walkingpad_5a0a00000000"
+TOPIC = "kingsmith_walkingpad/5a0a00000000/telemetry"
+
+
+def test_mqtt_connect_packet():
+    assert wire.mqtt_connect_packet("pad") == (
+        b"\x10\x0f" b"\x00\x04MQTT" b"\x04\x02\x00\x00" b"\x00\x03pad"
+    )
+
+
+@pytest.mark.parametrize("length, encoded", [(0, b"\x00"), (127, b"\x7f"), (128, b"\x80\x01"), (321, b"\xc1\x02")])
+def test_mqtt_remaining_length(length, encoded):
+    assert wire._mqtt_length(length) == encoded
+
+
+def test_binary_frame():
+    frame = wire.encode_binary("5A:0A", SAMPLES)
+    assert frame[:5] == b"WP\x01\x02\x00"
+    assert struct.unpack_from("<dHIIB", frame, 5) == (1700000000.5, 325, 120, 60, 110)
+    assert struct.unpack_from("<dHIIB", frame, 24)[-1] == 0
+    assert len(frame) == 5 + 2 * 19
+
+
+def test_queue_drops_oldest_when_full():
+    queue = wire.SampleQueue(3)
+    for n in range(5):
+        queue.append([n])
+    assert len(queue) == 3 and queue.dropped == 2
+    assert queue.pop_batch(2) == [[2], [3]]
+    assert queue.pop_batch(10) == [[4]] and not queue
+
+
+def _serve_broker(connack: bytes):
+    """Stand-in broker on localhost: answers CONNECT with ``connack`` and records every byte."""
+    received = bytearray()
+    done = asyncio.get_running_loop().create_future()
+
+    async def handle(reader, writer):
+        received.extend(await reader.readexactly(2))
+        received.extend(await reader.readexactly(received[1]))
+        writer.write(connack)
+        received.extend(await reader.read())
+        writer.close()
+        done.set_result(bytes(received))
+
+    return asyncio.start_server(handle, "127.0.0.1", 0), done
+
+
+def test_mqtt_publish_reaches_the_broker():
+    payload = wire.encode_json("5A:0A:00:00:00:00", SAMPLES)
+
+    async def run():
+        start, done = _serve_broker(b"\x20\x02\x00\x00")
+        server = await start
+        port = server.sockets[0].getsockname()[1]
+        client = wire.MqttBrokerClient("127.0.0.1", port, CLIENT_ID)
+        await client.publish(TOPIC, payload)
+        client.close()
+        received = await asyncio.wait_for(done, 5)
+        server.close()
+        return received
+
+    received = asyncio.run(run())
+    assert received == (
+        wire.mqtt_connect_packet(CLIENT_ID) + wire.mqtt_publish_packet(TOPIC, payload) + b"\xe0\x00"
+    )
+    publish = received[len(wire.mqtt_connect_packet(CLIENT_ID)):]
+    # Topic + frame is over 127 bytes — a two-byte remaining length
+    assert publish[1] & 0x80
+    body_length = (publish[1] & 0x7F) | publish[2] << 7
+    assert publish[0] == 0x30 and body_length == 2 + len(TOPIC) + len(payload)
+    assert publish[3:5 + len(TOPIC)] == b"\x00" + bytes([len(TOPIC)]) + TOPIC.encode()
+    assert json.loads(publish[5 + len(TOPIC):-2])["samples"] == SAMPLES
+
+
+def test_mqtt_refused_connection():
+    async def run():
+        start, _ = _serve_broker(b"\x20\x02\x00\x05")
+        server = await start
+        port = server.sockets[0].getsockname()[1]
+        client = wire.MqttBrokerClient("127.0.0.1", port, CLIENT_ID)
+        try:
+            with pytest.raises(ConnectionError, match="code 5"):
+                await client.publish(TOPIC, b"{}")
+        finally:
+            server.close()
+
+    asyncio.run(run())
+
+
+def test_udp_datagram():
+    frame = wire.encode_binary("5A:0A", SAMPLES)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        received = loop.create_future()
+
+        class Listener(asyncio.DatagramProtocol):
+            def datagram_received(self, data, addr):
+                received.set_result(data)
+
+        transport, _ = await loop.create_datagram_endpoint(Listener, local_addr=("127.0.0.1", 0))
+        sender = wire.UdpSender("127.0.0.1", transport.get_extra_info("sockname")[1])
+        try:
+            await sender.send(frame)
+            return await asyncio.wait_for(received, 5)
+        finally:
+            sender.close()
+            transport.close()
+
+    assert asyncio.run(run()) == frame
@@ -0,0 +1,67 @@
+# tests/test_ftms.py
+import pytest
+
+import walkingpad_protocol as wp
+from walkingpad_protocol import ftms
+
+# flags: total distance | expended energy | elapsed time
+FTMS_PACKET = bytes([
+    0x84, 0x04,
+    0x58, 0x02,                     # 6.00 km/h
+    0xE8, 0x03, 0x00,               # 1000 m
+    0x2A, 0x01, 0x00, 0x00, 0x00,   # 298 kcal, per hour, per minute
+    0x10, 0x0E,                     # 3600 s
+])
+
+
+def test_speed_range():
+    assert wp.parse_speed_range(bytes([0x32, 0, 0xE8, 0x03, 0x0A, 0])) == (0.5, 10.0, 0.1)
+
+
+def test_speed_range_zero_step_defaults():
+    assert wp.parse_speed_range(bytes([0x64, 0, 0xB0, 0x04, 0, 0]))[2] == 0.1
+
+
+@pytest.mark.parametrize("data", [b"\x01\x02", bytes([0xE8, 0x03, 0x32, 0, 0x0A, 0])])
+def test_speed_range_rejects(data):
+    with pytest.raises(ValueError):
+        wp.parse_speed_range(data)
+
+
+def test_machine_features():
+    assert wp.parse_machine_features(bytes([0x04, 0x12, 0, 0, 0, 0, 0, 0])) == 0x1204
+    with pytest.raises(ValueError):
+        wp.parse_machine_features(b"\x04")
+
+
+def test_treadmill_layout():
+    assert ftms.treadmill_layout(0x0484) == (2, 4, -1, 7, 12, 14)
+    # "More data" set — no instantaneous speed
+    assert ftms.treadmill_layout(0x0001)[0] == -1
+
+
+def test_treadmill_data_from_flags():
+    assert wp.parse_treadmill_data(FTMS_PACKET) == (6.0, 1000, 298, 3600, None)
+
+
+def test_treadmill_data_gated_by_features():
+    features = ftms.FEATURE_TOTAL_DISTANCE
+    assert wp.parse_treadmill_data(FTMS_PACKET, features) == (6.0, 1000, None, None, None)
+
+
+def test_treadmill_data_energy_not_available():
+    packet = bytearray(FTMS_PACKET)
+    packet[7:9] = b"\xff\xff"
+    assert wp.parse_treadmill_data(bytes(packet))[2] is None
+
+
+@pytest.mark.parametrize("data", [b"", b"\x84", FTMS_PACKET[:-1], FTMS_PACKET + b"\x00"])
+def test_treadmill_data_length_mismatch(data):
+    assert wp.parse_treadmill_data(data) is None
+
+
+def test_capabilities_round_trip():
+    caps = wp.MachineCapabilities(0.5, 6.0, 0.1, ftms.FEATURE_ELAPSED_TIME)
+    assert wp.MachineCapabilities.from_dict(caps.as_dict()) == caps
+    assert caps.supports(ftms.FEATURE_ELAPSED_TIME)
+    assert not caps.supports(ftms.FEATURE_INCLINATION)
@@ -0,0 +1,33 @@
+# Seeded, bounded run of the fuzz properties — scripts/fuzz_protocol.py does the long runs
+import random
+
+import pytest
+
+import walkingpad_protocol as wp
+from protocol_fuzz import FEATURE_SETS, Pipeline, frames, valid_frames
+
+FRAMES = 1500   # per characteristic per profile and feature set
+SEED = 20240611
+
+
+@pytest.mark.parametrize("features", FEATURE_SETS, ids=["all-features", "sim-features"])
+@pytest.mark.parametrize("model", sorted(wp.PROFILES))
+def test_decoders_hold_their_invariants(model, features):
+    profile = wp.PROFILES[model]
+    rng = random.Random(f"{SEED}-{model}-{features}")
+    pipeline = Pipeline(profile, features)
+    for characteristic, seeds in valid_frames(profile).items():
+        for frame in frames(rng, seeds, FRAMES):
+            pipeline.now += rng.uniform(0.0, 2.0)
+            pipeline.feed(characteristic, frame)
+    # Noise has to be caught as malformed somewhere, not decoded as data
+    assert pipeline.malformed["treadmill_data"] and pipeline.malformed["control_point"]
+
+
+def test_seeds_decode_cleanly():
+    for profile in wp.PROFILES.values():
+        pipeline = Pipeline(profile, None)
+        for characteristic, seeds in valid_frames(profile).items():
+            for frame in seeds:
+                pipeline.feed(characteristic, frame)
+        assert pipeline.malformed["treadmill_data"] == 0
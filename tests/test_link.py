@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from _standalone import load_module
+
+link = load_module("link")
+
+
+class FakeHass:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+
+    def async_create_background_task(self, coro, name):
+        return self.loop.create_task(coro, name=name)
+
+
+class FakeClient:
+    def __init__(self):
+        self.is_connected = True
+        self.writes = []
+        self.hang = False
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    async def write_gatt_char(self, uuid, data, response=True):
+        if self.hang:
+            await asyncio.Event().wait()
+        self.writes.append((uuid, data, response))
+
+
+class Opener:
+    """Connect pipeline handing out a new FakeClient per attempt, or raising ``fail``."""
+
+    def __init__(self):
+        self.clients = []
+        self.fail: BaseException | None = None
+
+    async def __call__(self, set_state):
+        await asyncio.sleep(0)
+        if self.fail is not None:
+            raise self.fail
+        client = FakeClient()
+        self.clients.append(client)
+        set_state(link.SUBSCRIBING, client)
+
+
+def _run(scenario, backoff_delays=(60,)):
+    async def run():
+        opener = Opener()
+        states = []
+        pad_link = link.WalkingPadLink(FakeHass(), opener, states.append, backoff_delays)
+        try:
+            return await scenario(pad_link, opener, states)
+        finally:
+            await pad_link.stop()
+
+    return asyncio.run(run())
+
+
+def test_connect_and_write():
+    async def scenario(pad_link, opener, states):
+        await pad_link.connect()
+        await pad_link.write("2ad9", b"\x07")
+        assert states == [link.CONNECTING, link.SUBSCRIBING, link.READY]
+        assert opener.clients[0].writes == [("2ad9", b"\x07", True)]
+        assert pad_link.connects == 1
+
+    _run(scenario)
+
+
+def test_cancelled_connect_keeps_the_actor_alive():
+    async def scenario(pad_link, opener, states):
+        opener.fail = asyncio.CancelledError()
+        with pytest.raises(link.LinkNotReady):
+            await pad_link.connect()
+        assert pad_link.state == link.BACKOFF and pad_link.connect_failures == 1
+        opener.fail = None
+        await pad_link.connect()
+        assert pad_link.is_ready and pad_link.failures == 0
+
+    _run(scenario)
+
+
+def test_lost_from_a_released_client_is_ignored():
+    async def scenario(pad_link, opener, states):
+        await pad_link.connect()
+        await pad_link.reconnect()
+        old, current = opener.clients
+        pad_link.notify_lost(old)
+        await pad_link.write("2ad9", b"\x08")
+        assert pad_link.is_ready and pad_link.client is current and pad_link.lost == 0
+        pad_link.notify_lost(current)
+        with pytest.raises(link.LinkNotReady):
+            await pad_link.write("2ad9", b"\x08")
+        assert pad_link.lost == 1 and pad_link.state == link.BACKOFF
+
+    _run(scenario)
+
+
+def test_requests_queued_behind_stop_fail():
+    async def scenario(pad_link, opener, states):
+        await pad_link.connect()
+        stop = asyncio.ensure_future(pad_link.stop())
+        queued = [asyncio.ensure_future(pad_link.write("2ad9", b"\x07")), asyncio.ensure_future(pad_link.connect())]
+        await stop
+        for result in await asyncio.gather(*queued, return_exceptions=True):
+            assert isinstance(result, link.LinkNotReady) and str(result) == "link stopped"
+        assert pad_link._task.done() and pad_link.state == link.DISCONNECTED and not opener.clients[0].is_connected
+
+    _run(scenario)
+
+
+def test_backoff_delay_clamps_to_the_last_step():
+    async def scenario(pad_link, opener, states):
+        opener.fail = OSError("out of range")
+        loop = asyncio.get_running_loop()
+        delays = []
+        for _ in range(4):
+            with pytest.raises(OSError):
+                await pad_link.connect()
+            delays.append(round(pad_link._retry_handle.when() - loop.time()))
+        assert delays == [20, 30, 30, 30]
+        assert pad_link.failures == 4
+
+    _run(scenario, backoff_delays=(10, 20, 30))
+
+
+def test_hung_write_drops_the_link_and_frees_the_inbox(monkeypatch):
+    monkeypatch.setattr(link, "WRITE_TIMEOUT", 0.05)
+
+    async def scenario(pad_link, opener, states):
+        await pad_link.connect()
+        opener.clients[0].hang = True
+        with pytest.raises(TimeoutError):
+            await pad_link.write("2ad9", b"\x07")
+        assert pad_link.write_timeouts == 1 and pad_link.state == link.BACKOFF
+        assert not opener.clients[0].is_connected
+        # The actor is free for the next request
+        await pad_link.connect()
+        assert pad_link.is_ready and pad_link.client is opener.clients[1]
+
+    _run(scenario)
@@ -0,0 +1,58 @@
+from _standalone import load_module
+
+profiler = load_module("profiler")
+
+
+class Pad:
+    def __init__(self, attached):
+        self.profiler = attached
+        self.frames = 0
+
+    @profiler.profiled
+    def _notification_handler(self, sender, data):
+        self.frames += 1
+        return sum(data)
+
+
+def test_profiles_packets(tmp_path):
+    attached = profiler.CallbackProfiler()
+    pad = Pad(attached)
+    for _ in range(3):
+        assert pad._notification_handler(None, b"\x01\x02") == 3
+    summary = attached.write(str(tmp_path / "profile"), 5)
+    assert summary["packets"] == 3 and summary["top"]
+    assert all((tmp_path / name).exists() for name in ("profile.pstats", "profile.txt"))
+
+
+def test_empty_window_reports_no_samples(tmp_path):
+    summary = profiler.CallbackProfiler().write(str(tmp_path / "profile"), 5)
+    assert summary["packets"] == 0 and summary["top"] == [] and summary["files"] == []
+    assert summary["error"] == "no samples"
+    assert not list(tmp_path.iterdir())
+
+
+class BusyProfile:
+    """cProfile on Python 3.12+ when another profiler is already active."""
+
+    def __init__(self):
+        self.enables = 0
+
+    def enable(self):
+        self.enables += 1
+        raise ValueError("Another profiling tool is already active")
+
+    def create_stats(self):
+        self.stats = {}
+
+
+def test_active_profiler_disables_the_window(tmp_path, caplog):
+    attached = profiler.CallbackProfiler()
+    attached.profile = BusyProfile()
+    pad = Pad(attached)
+    for _ in range(3):
+        pad._notification_handler(None, b"\x01")
+    assert pad.frames == 3
+    assert attached.profile.enables == 1
+    assert len([r for r in caplog.records if "Profiling disabled" in r.message]) == 1
+    summary = attached.write(str(tmp_path / "profile"), 5)
+    assert summary["packets"] == 3 and summary["error"].startswith("Another profiling tool")
@@ -0,0 +1,75 @@
+# tests/test_profiles.py
+import pytest
+
+import walkingpad_protocol as wp
+
+MC11 = wp.get_profile("WalkingPad MC11")
+MC21 = wp.get_profile("WalkingPad MC21")
+GENERIC = wp.get_profile("WalkingPad")
+
+FTMS_PACKET = bytes([0x84, 0x04, 0x58, 0x02, 0xE8, 0x03, 0x00, 0x2A, 0x01, 0, 0, 0, 0x10, 0x0E])
+MC11_PACKET = bytes([0xFF, 0xFF, 0x2C, 0x01, 0xF4, 0x01, 0x00, 0x15, 0, 0, 0, 0, 0x2C, 0x01, 0, 0, 0])
+
+
+@pytest.mark.parametrize("name, model", [
+    ("KS-AP-1234", "WalkingPad MC11"),
+    ("KS-MC21-01", "WalkingPad MC21"),
+    ("KS-C2", "WalkingPad C2"),
+    ("KS-XYZ", "WalkingPad"),
+    (None, "WalkingPad"),
+])
+def test_profile_for_ble_name(name, model):
+    assert wp.profile_for_ble_name(name).model == model
+
+
+def test_unknown_model_falls_back():
+    assert wp.get_profile("nope") is GENERIC
+    assert wp.get_profile(" WalkingPad MC21 ") is MC21
+
+
+@pytest.mark.parametrize("data, expected", [
+    (b"\x01\x0d", ("playing", None)),
+    (b"\x01\x0f", ("stopping/paused", None)),
+    (b"\x02\x01", ("idle", None)),
+    (b"\x04\x7f", ("playing", None)),
+    (b"\x05\x32", (None, None)),
+    (b"\x03\x0e\x32", ("countdown 2", 2)),
+    (b"\x03\x0e\x40", ("mode unknown (40)", None)),
+    (b"\x03\x0e", ("unknown", None)),
+    (b"\x09\x09", ("unknown", None)),
+    (b"\x01", ("unknown", None)),
+])
+def test_decode_status(data, expected):
+    assert MC11.decode_status(data) == expected
+
+
+def test_known_models_keep_the_fixed_layout():
+    # Single-byte energy at b[7] — what existing installs' statistics are built on
+    assert MC11.parse_treadmill(FTMS_PACKET) == (6.0, 1000, 0x2A, 3600, None)
+    assert MC21.parse_treadmill(FTMS_PACKET) == (6.0, 1000, 0x2A, 3600, None)
+    assert MC11.parse_treadmill(MC11_PACKET) == (3.0, 500, 0x15, 300, None)
+
+
+def test_generic_profile_decodes_ftms_flags():
+    assert GENERIC.parse_treadmill(FTMS_PACKET) == (6.0, 1000, 298, 3600, None)
+    # Flags that don't describe the packet → fixed layout
+    assert GENERIC.parse_treadmill(MC11_PACKET) == (3.0, 500, 0x15, 300, None)
+    assert GENERIC.parse_treadmill(b"\x00" * 5) is None
+
+
+def test_profiles_are_hashable_values():
+    assert hash(MC11) == hash(wp.get_profile("WalkingPad MC11"))
+    assert len({MC11, MC21, GENERIC}) == 3
+    with pytest.raises(TypeError):
+        MC11.status_table[0] = "playing"
+
+
+def test_speed_commands_shared_and_encoded():
+    table = MC11.speed_commands(1.0, 6.0, 0.1)
+    assert table is MC11.speed_commands(1.0, 6.0, 0.1)
+    assert table[600] == wp.cmd_set_speed(6.0) == b"\x02\x58\x02"
+    assert min(table) == 100 and max(table) == 600 and len(table) == 51
+
+
+def test_supported_name_prefixes():
+    assert {"KS-AP", "KS-MC21", "KS-"} <= set(wp.supported_name_prefixes())
@@ -0,0 +1,56 @@
+import asyncio
+
+from _standalone import load_module
+
+routing = load_module("routing")
+
+
+def test_ranks_by_rssi():
+    router = routing.ConnectionRouter()
+    assert router.rank([("hci0", -80), ("proxy-a", -60), ("proxy-b", None)]) == ["proxy-a", "hci0", "proxy-b"]
+    assert router.sources["proxy-a"].rssi == -60
+
+
+def test_connect_history_nudges_the_ranking():
+    router = routing.ConnectionRouter()
+    router.record_attempt("hci0")
+    router.record_success("hci0", 1.2)
+    # 100 % success is worth SUCCESS_BONUS_DB over a slightly stronger unknown source
+    assert router.rank([("proxy-a", -65), ("hci0", -70)]) == ["hci0", "proxy-a"]
+
+
+def test_failing_source_goes_last_until_it_succeeds():
+    router = routing.ConnectionRouter()
+    for _ in range(routing.FAILOVER_AFTER):
+        router.record_attempt("proxy-a")
+        router.record_failure("proxy-a", timeout=True)
+    assert router.rank([("proxy-a", -40), ("hci0", -90)]) == ["hci0", "proxy-a"]
+    router.record_attempt("hci0")
+    assert router.failovers == 1 and router.current_source == "hci0"
+    router.record_attempt("proxy-a")
+    router.record_success("proxy-a", 0.8)
+    assert router.rank([("proxy-a", -40), ("hci0", -90)]) == ["proxy-a", "hci0"]
+    stats = router.as_dict()["sources"]["proxy-a"]
+    assert (stats["attempts"], stats["timeouts"], stats["consecutive_failures"]) == (3, 2, 0)
+
+
+def test_limiter_caps_concurrency_per_adapter():
+    pads = [("proxy-a", n) for n in range(5)] + [("proxy-b", n) for n in range(2)] + [(None, 0), (None, 1)]
+
+    async def run():
+        limiter = routing.AdapterLimiter(2)
+        active: dict = {}
+        peak: dict = {}
+
+        async def send(adapter):
+            async with limiter.slot(adapter):
+                active[adapter] = active.get(adapter, 0) + 1
+                peak[adapter] = max(peak.get(adapter, 0), active[adapter])
+                await asyncio.sleep(0.01)
+                active[adapter] -= 1
+
+        await asyncio.gather(*(send(adapter) for adapter, _ in pads))
+        assert limiter.slot(None) is limiter.slot(routing.DEFAULT_SOURCE)
+        return peak
+
+    assert asyncio.run(run()) == {"proxy-a": 2, "proxy-b": 2, None: 2}
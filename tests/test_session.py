@@ -0,0 +1,65 @@
+# tests/test_session.py
+from _standalone import load_module
+
+session = load_module("session")
+
+
+def _counters(distance=1000, energy=50, elapsed=600, now=0.0):
+    counters = session.SessionCounters()
+    counters.advance(distance, energy, elapsed, now)
+    return counters
+
+
+def test_first_packet_has_no_delta():
+    assert session.SessionCounters().advance(1000, 50, 600, 0.0) == (0.0, 0.0, 0.0, None)
+
+
+def test_deltas():
+    assert _counters().advance(1010, 51, 601, 1.0) == (10, 1, 1, None)
+
+
+def test_single_byte_energy_wrap():
+    assert _counters(energy=250).advance(1010, 4, 601, 1.0)[1] == 10
+
+
+def test_gap_segment():
+    d_distance, _, d_elapsed, segment = _counters().advance(1600, 80, 1200, 900.0)
+    assert (d_distance, d_elapsed) == (600, 600)
+    assert (segment.start, segment.end, segment.new_session) == (300.0, 900.0, False)
+    assert segment.average_speed == 3.6
+
+
+def test_new_session_during_gap():
+    counters = _counters()
+    segment = counters.advance(200, 10, 120, 900.0)[3]
+    assert counters.restarted and segment.new_session and segment.distance == 200
+
+
+def test_restore_round_trip():
+    counters = _counters()
+    restored = session.SessionCounters()
+    restored.restore(counters.as_dict())
+    assert restored.as_dict() == counters.as_dict()
+
+
+def test_reconnect_gap_carries_energy():
+    # Link dropped at 600 s / 50 kcal, came back at 1200 s / 95 kcal
+    d_distance, d_energy, d_elapsed, segment = _counters().advance(1900, 95, 1200, 900.0)
+    assert d_energy == segment.energy == 45
+    assert (d_distance, d_elapsed) == (segment.distance, segment.elapsed)
+
+
+def test_jump_faster_than_wall_clock_is_new_session():
+    # Down for 60 s but the totals grew by 20 minutes — another session ran meanwhile
+    counters = _counters()
+    d_distance, _, d_elapsed, segment = counters.advance(3000, 150, 1800, 60.0)
+    assert counters.restarted and segment.new_session
+    assert (d_distance, d_elapsed) == (3000, 1800)
+
+
+def test_jump_faster_than_top_speed_is_new_session():
+    counters = session.SessionCounters(max_speed=6.0)
+    counters.advance(1000, 50, 600, 0.0)
+    # 500 m in 60 s is 30 km/h
+    assert counters.advance(1500, 60, 660, 60.0)[0] == 1500
+    assert counters.restarted
@@ -0,0 +1,39 @@
+# tests/test_simulator.py
+import asyncio
+
+import pytest
+
+import walkingpad_protocol as wp
+from walkingpad_protocol.constants import UUID_CONTROL_POINT, UUID_TREADMILL_DATA
+from walkingpad_protocol.simulator import SimulatedPad
+
+
+@pytest.mark.parametrize("model", ["WalkingPad MC11", "WalkingPad MC21"])
+def test_session_decodes_through_the_profile(model):
+    profile = wp.get_profile(model)
+
+    async def run():
+        pad = SimulatedPad(profile, rate=50, time_scale=60)
+        decoder = wp.StatusDecoder(profile)
+        statuses, frames, responses = [], [], []
+
+        def on_status(_, data):
+            transition = decoder.feed(data, 0)
+            if transition is not None:
+                statuses.append(transition.status)
+
+        await pad.connect()
+        await pad.start_notify(profile.status_uuid, on_status)
+        await pad.start_notify(UUID_CONTROL_POINT, lambda _, data: responses.append(wp.decode_control_response(data)))
+        await pad.start_notify(UUID_TREADMILL_DATA, lambda _, data: frames.append(profile.parse_treadmill(data)))
+        await pad.write_gatt_char(UUID_CONTROL_POINT, profile.start_cmd)
+        await asyncio.sleep(0.1)
+        await pad.write_gatt_char(UUID_CONTROL_POINT, profile.pause_cmd)
+        await pad.disconnect()
+        return statuses, frames, responses
+
+    statuses, frames, responses = asyncio.run(run())
+    assert statuses == ["playing", "paused"]
+    assert responses[0][2] == "playing"
+    speed, distance, _, elapsed, _ = frames[-1]
+    assert speed == 2.0 and distance > 0 and elapsed > 0
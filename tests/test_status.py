@@ -0,0 +1,67 @@
+# tests/test_status.py
+import walkingpad_protocol as wp
+
+MC11 = wp.get_profile("WalkingPad MC11")
+PLAYING, PAUSED, IDLE = b"\x01\x0d", b"\x01\x0f", b"\x01\x01"
+
+
+def test_debounce_is_opt_in():
+    decoder = wp.StatusDecoder(MC11)
+    assert decoder.debounce == 0
+    assert decoder.feed(PLAYING, 0).status == "playing"
+    assert decoder.feed(PAUSED, 0.1).status == "paused"
+    assert decoder.feed(PLAYING, 0.2).status == "playing"
+
+
+def test_transitions_carry_duration():
+    decoder = wp.StatusDecoder(MC11)
+    first = decoder.feed(IDLE, 10.0)
+    assert (first.previous, first.status, first.duration) == ("unknown", "idle", None)
+    second = decoder.feed(PLAYING, 25.0)
+    assert (second.previous, second.status, second.duration) == ("idle", "playing", 15.0)
+    assert decoder.time_in_status == {"idle": 15.0}
+
+
+def test_duplicates_and_ignored():
+    decoder = wp.StatusDecoder(MC11)
+    decoder.feed(PLAYING, 0)
+    assert decoder.feed(PLAYING, 1) is None
+    assert decoder.feed(b"\x05\x10", 2) is None
+    assert (decoder.duplicates, decoder.ignored, decoder.transitions) == (1, 1, 1)
+
+
+def test_unknown_status_is_reported_and_counted():
+    decoder = wp.StatusDecoder(MC11)
+    decoder.feed(PLAYING, 0)
+    transition = decoder.feed(b"\x09\x09", 1)
+    assert (transition.status, transition.raw) == ("unknown", "unknown")
+    assert decoder.malformed == 1
+    # A different raw description is still reported
+    assert decoder.feed(b"\x03\x0e\x40", 2).raw == "mode unknown (40)"
+
+
+def test_countdown():
+    decoder = wp.StatusDecoder(MC11)
+    assert decoder.feed(b"\x03\x0e\x33", 0).countdown == 3
+    assert decoder.feed(b"\x03\x0e\x32", 1).countdown == 2
+
+
+def test_debounce_suppresses_flaps():
+    decoder = wp.StatusDecoder(MC11, debounce=1.0)
+    decoder.feed(PLAYING, 0)
+    assert decoder.feed(PAUSED, 1.0) is None
+    assert decoder.pending_deadline == 2.0
+    assert decoder.feed(PLAYING, 1.5) is None
+    assert decoder.pending is None and decoder.flaps_suppressed == 1
+    assert decoder.status == "playing"
+
+
+def test_debounce_commits_after_window():
+    decoder = wp.StatusDecoder(MC11, debounce=1.0)
+    decoder.feed(PLAYING, 0)
+    decoder.feed(PAUSED, 1.0)
+    assert decoder.confirm(1.5) is None
+    transition = decoder.confirm(2.0)
+    assert (transition.status, transition.at) == ("paused", 1.0)
+    # idle is never debounced
+    assert decoder.feed(IDLE, 2.1).status == "idle"
@@ -0,0 +1,23 @@
+from _standalone import load_module
+
+telemetry = load_module("telemetry")
+
+
+def test_changed_since_tracks_each_field():
+    data = telemetry.WalkingPadTelemetry()
+    data.apply_treadmill(3.0, 100, 5, 60, 0.0)
+    rendered = data.version
+    assert not data.apply_treadmill(3.0, 100, 5, 60, 0.0)
+    data.apply_treadmill(3.0, 110, 5, 61, 0.0)
+    assert data.changed_since(telemetry.DISTANCE, rendered)
+    assert not data.changed_since(telemetry.SPEED, rendered)
+
+
+def test_body_model_change_is_stamped():
+    data = telemetry.WalkingPadTelemetry()
+    data.apply_estimated_energy(12.5)
+    rendered = data.version
+    assert not data.changed_since(telemetry.BODY_MODEL, rendered)
+    data.mark_changed(telemetry.BODY_MODEL)
+    assert data.changed_since(telemetry.BODY_MODEL, rendered)
+    assert not data.changed_since(telemetry.ESTIMATED_ENERGY, rendered)
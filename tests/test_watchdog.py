@@ -0,0 +1,45 @@
+# tests/test_watchdog.py
+from _standalone import load_module
+
+watchdog = load_module("watchdog")
+
+
+def test_learns_interval_and_turns_stale():
+    dog = watchdog.LivenessWatchdog()
+    for now in range(5):
+        dog.note_packet("playing", float(now))
+    assert dog.timeout("playing") == watchdog.STALE_MIN_TIMEOUT
+    assert not dog.check("playing", 10.0)
+    assert dog.check("playing", 14.0)
+    assert dog.note_packet("playing", 20.0) == 16.0
+    assert dog.stale_events == 1
+
+
+def test_quiet_status_is_never_judged():
+    dog = watchdog.LivenessWatchdog()
+    dog.note_packet("idle", 0.0)
+    assert dog.timeout("idle") is None
+    assert not dog.check("idle", 3600.0)
+
+
+def test_status_change_does_not_feed_the_gap():
+    dog = watchdog.LivenessWatchdog()
+    dog.note_packet("idle", 0.0)
+    dog.note_packet("playing", 600.0)
+    dog.note_packet("playing", 601.0)
+    assert dog.intervals == {"playing": 1.0}
+
+
+def test_silent_reconnect_is_judged_again():
+    dog = watchdog.LivenessWatchdog()
+    dog.note_packet("playing", 0.0)
+    assert dog.check("playing", 10.0)
+    assert not dog.check("playing", 11.0)
+    # Reconnected, but the new link is a zombie too
+    dog.reset(12.0)
+    assert dog.is_stale
+    assert not dog.check("playing", 21.0)
+    assert dog.check("playing", 22.0)
+    assert dog.stale_events == 2 and dog.stale_since == 0.0
+    assert dog.note_packet("playing", 25.0) == 25.0
+    assert not dog.is_stale